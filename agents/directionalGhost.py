@@ -17,7 +17,6 @@ import random
 import util
 from agents.ghostAgents import GhostAgent
 from game import Actions, Agent, Directions
-from util import manhattanDistance
 
 
 class DirectionalGhost(GhostAgent):
@@ -42,7 +41,7 @@ class DirectionalGhost(GhostAgent):
         pacmanPosition = state.getPacmanPosition()
 
         # Select best actions given the state
-        distancesToPacman = [manhattanDistance( pos, pacmanPosition ) for pos in newPositions]
+        distancesToPacman = state.getMazeDistances().mazeDistances( pacmanPosition, newPositions )
         if isScared:
             bestScore = max( distancesToPacman )
             bestProb = self.prob_scaredFlee
@@ -1,18 +1,27 @@
 import logging
 import random
 
+import search
 import util
+from clusterGraph import ClusterProblem
 from game import Actions, Agent, Directions
+from incrementalSearch import INFINITY, dstar_initialise, dstar_move_start, dstar_remove_goal, dstar_search
 from logs.search_logger import log_function
 from pacman import GameState
 from util import manhattanDistance 
 
+# The order collectFood prefers its first move in when several start a
+# shortest path to the nearest food.
+FOOD_MOVE_ORDER = (Directions.NORTH, Directions.EAST, Directions.SOUTH, Directions.WEST)
+
 
 def scoreEvaluationFunction(currentGameState, Q2_Agent):
     pacmanPos = currentGameState.getPacmanPosition()
     foodList = currentGameState.getFood().asList()
     ghostStates = currentGameState.getGhostStates()
     capsules = currentGameState.getCapsules()
+    # Manhattan rather than the exact distances of getMazeDistances(): with
+    # those the agent won fewer games on five of the Q2 layouts.
 
     score = currentGameState.getScore()
 
@@ -42,11 +51,16 @@ def scoreEvaluationFunction(currentGameState, Q2_Agent):
     return score
 
 class Q2_Agent(Agent):
-    def __init__(self, evalFn='scoreEvaluationFunction', depth='2'):
+    def __init__(self, evalFn='scoreEvaluationFunction', depth='2', foodPlanner='dstar'):
         self.index = 0
         self.evaluationFunction = util.lookup(evalFn, globals())
         self.depth = int(depth)
         self.last_positions = []
+        # 'dstar' replans incrementally; 'hpa' searches the layout's cluster
+        # abstraction, which pays off on very large mazes.
+        if foodPlanner not in ('dstar', 'hpa'): raise ValueError('foodPlanner must be dstar or hpa')
+        self.food_planner_type = foodPlanner
+        self.food_planner = None
 
     @log_function
     def getAction(self, gameState: GameState):
@@ -154,50 +168,55 @@ class Q2_Agent(Agent):
         return best_action
 
     def collectFood(self, gameState: GameState):
-        def bfs(start, food_positions):
-            queue = [(start, [])]
-            visited = set()
-
-            while queue:
-                (x, y), path = queue.pop(0)
-                if (x, y) in food_positions:
-                    return path
-
-                if (x, y) not in visited:
-                    visited.add((x, y))
-                    for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0)]:  # up, right, down, left
-                        next_x, next_y = x + dx, y + dy
-                        if not gameState.hasWall(next_x, next_y):
-                            next_pos = (next_x, next_y)
-                            next_path = path + [next_pos]
-                            queue.append((next_pos, next_path))
-
-            return None  # If no path to food is found
-
+        # D* Lite keeps its search between ticks: moving one step and eating
+        # a dot only repairs the part of the search that changed.
         pacman_pos = gameState.getPacmanPosition()
-        food_list = gameState.getFood().asList()
+        food = set(gameState.getFood().asList())
 
-        if not food_list:
+        if not food:
             return Directions.STOP
 
-        path_to_nearest_food = bfs(pacman_pos, set(food_list))
+        graph = gameState.getMazeGraph()
+        if self.food_planner_type == 'hpa':
+            return self.collectFoodHierarchical(gameState, graph, pacman_pos, food)
+        planner = self.food_planner
+        if planner is None or planner.graph is not graph or not food <= planner.goals:
+            # First call, or a new game: start a fresh search.
+            planner = self.food_planner = dstar_initialise(graph, pacman_pos, food, manhattanDistance)
+            planner.graph = graph
+        else:
+            dstar_move_start(graph, planner, pacman_pos)
+            for eaten in planner.goals - food:
+                dstar_remove_goal(graph, planner, eaten)
+
+        path_to_nearest_food = dstar_search(graph, planner)
 
         if not path_to_nearest_food:
             return random.choice(gameState.getLegalActions(0))
 
-        next_pos = path_to_nearest_food[0]
-        dx, dy = next_pos[0] - pacman_pos[0], next_pos[1] - pacman_pos[1]
-
-        if dx == 1:
-            return Directions.EAST
-        elif dx == -1:
-            return Directions.WEST
-        elif dy == 1:
-            return Directions.NORTH
-        elif dy == -1:
-            return Directions.SOUTH
-        else:
-            return Directions.STOP
+        # Among the first steps of the shortest paths, take the one the
+        # breadth-first search this replaced would have: the first of up,
+        # right, down, left.
+        x, y = pacman_pos
+        for action in FOOD_MOVE_ORDER:
+            dx, dy = Actions.directionToVector(action)
+            if planner.g.get((x + int(dx), y + int(dy)), INFINITY) == len(path_to_nearest_food) - 1:
+                return action
+        return path_to_nearest_food[0]
+
+    def collectFoodHierarchical(self, gameState: GameState, graph, pacman_pos, food):
+        abstract = ClusterProblem(graph.getClusterGraph(), graph.getCellId(pacman_pos), [graph.getCellId(dot) for dot in food])
+        searchData = search.search_initialise(abstract)
+        terminate = False
+        while not terminate:
+            terminate, actions = search.search_loop_body(abstract, searchData)
+
+        path_to_nearest_food = abstract.expandActions(actions)
+
+        if not path_to_nearest_food:
+            return random.choice(gameState.getLegalActions(0))
+
+        return path_to_nearest_food[0]
 
     def alpha_beta_search(self, gameState: GameState):
         alpha = float('-inf')
@@ -223,10 +242,21 @@ class Q2_Agent(Agent):
 
             alpha = max(alpha, best_score)
 
+        if not action_scores:
+            # Every move leads back to a recent position: weigh them all
+            # rather than return no action, which forfeits the game.
+            for action in legal_actions:
+                score = self.alpha_beta(gameState.generateSuccessor(0, action), depth=1, agentIndex=1,
+                                        alpha=float('-inf'), beta=float('inf'))
+                action_scores.append((score, action))
+            best_score = max(score for score, _ in action_scores)
+
         # Add tie-breaking by random choice among equally good actions
         best_actions = [action for score, action in action_scores if score == best_score]
         if len(best_actions) > 1:
             best_action = random.choice(best_actions)
+        else:
+            best_action = best_actions[0]
 
         return best_action
 
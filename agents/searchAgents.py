@@ -33,14 +33,32 @@ description for details.
 
 Good luck and happy searching!
 """
+import contextlib
 import glob
+import io
 import logging
+import sys
 import time
 
 import util
 from game import Actions, Agent, Directions
 from logs.search_logger import log_function
 from pacman import GameState, GameStateData
+from pathCache import PathCache
+
+
+class TeeOutput(io.TextIOBase):
+    "A text stream that writes through to stream and also into copy."
+    def __init__(self, stream, copy):
+        self.stream = stream
+        self.copy = copy
+
+    def write(self, text):
+        self.copy.write(text)
+        return self.stream.write(text)
+
+    def flush(self):
+        self.stream.flush()
 
 
 class SearchAgent(Agent):
@@ -56,20 +74,32 @@ class SearchAgent(Agent):
       depthFirstSearch or dfs
       breadthFirstSearch or bfs
 
+    Any other -a options are passed on to fn as keyword arguments (strings),
+    e.g. -a fn=sma_solver,prob=q1a_problem,nodes=5000
+
+    With -a pathCache=1, paths are remembered on disk (see pathCache.py) and
+    replayed when the same layout is solved again with unchanged code.
+    Paths of solvers whose answer depends on timing are never stored:
+    anytime solvers that report solutions through problem.onSolution, and
+    solvers marked with a timingDependent attribute.
 
     Note: You should NOT change any code in SearchAgent
     """
 
-    def __init__(self, fn='depthFirstSearch', prob='PositionSearchProblem', heuristic='nullHeuristic'):
+    def __init__(self, fn='depthFirstSearch', prob='PositionSearchProblem', heuristic='nullHeuristic', pathCache='0', **options):
         # Warning: some advanced Python magic is employed below to find the right functions and problems
 
         GameStateData.verbose = False
         function = util.import_by_name('./solvers', fn)
         problem = util.import_by_name('./problems', prob)
 
-        self.searchFunction = lambda x: function(x)
+        self.searchFunction = lambda x: function(x, **options)
         self.searchType =  lambda x: problem(x)
         self.actionIndex: int = 0
+        self.startupDeadline = None
+        self.pathCache = PathCache() if pathCache not in ('0', 'False', 'false') else None
+        self.cacheParts = (problem, function, options)
+        self.timingDependent = getattr(function, 'timingDependent', False)
 
         print('[SearchAgent] using search function ' + function.__name__)
         print('[SearchAgent] using problem type ' + problem.__name__)
@@ -85,12 +115,55 @@ class SearchAgent(Agent):
         """
         if self.searchFunction == None: raise Exception("No search function provided for SearchAgent")
         starttime = time.time()
-        problem = self.searchType(state) # Makes a new search problem.
         self.actionIndex = 0  # Reset action index.
-        self.actions  = self.searchFunction(problem) # Find a path.
+        self.actions = []
+        self.reportedSolution = False
+        cacheKey = None
+        if self.pathCache is not None and not self.timingDependent:
+            budget = None if self.startupDeadline is None else round(self.startupDeadline - starttime)
+            cacheKey = self.pathCache.keyFor(state, *self.cacheParts, budget)
+            entry = self.pathCache.get(cacheKey)
+            if entry is not None:
+                print('[SearchAgent] path cache hit')
+                print(entry['output'], end='')
+                self.actions = entry['actions']
+                print('Path found with total cost of %d in %.10f seconds' % (entry['cost'], time.time() - starttime))
+                return
+
+        problem = self.searchType(state) # Makes a new search problem.
+        # Anytime solvers read the deadline and report every path they improve on.
+        problem.deadline = self.startupDeadline
+        problem.onSolution = self.recordSolution
+        # When caching, the solver's output is also copied aside so that a
+        # cache hit can replay it; it still reaches the console as it is printed.
+        output = io.StringIO()
+        complete = False
+        try:
+            if cacheKey is None:
+                self.actions  = self.searchFunction(problem) # Find a path.
+            else:
+                with contextlib.redirect_stdout(TeeOutput(sys.stdout, output)):
+                    self.actions  = self.searchFunction(problem) # Find a path.
+            complete = True
+        except util.TimeoutFunctionException:
+            if not self.actions: raise
+            print('[SearchAgent] out of time, using the best path found so far')
+        # A path cut short by the deadline, or from an anytime search, depends
+        # on timing rather than only on the inputs in the key.
+        if complete and cacheKey is not None and not self.reportedSolution:
+            self.pathCache.put(cacheKey, self.pathCache.makeEntry(self.actions, output.getvalue(), time.time() - starttime))
         totalCost = len(self.actions)
         print('Path found with total cost of %d in %.10f seconds' % (totalCost, time.time() - starttime))
 
+    def setStartupDeadline(self, deadline):
+        "Game.run calls this with the time.time() by which registerInitialState must return."
+        self.startupDeadline = deadline
+
+    def recordSolution(self, actions, *info):
+        "Keeps the latest path an anytime solver has found, in case it runs out of time."
+        self.actions = list(actions)
+        self.reportedSolution = True
+
     def getAction(self, state: GameState):
         """
         Returns the next action in the path chosen earlier (in
@@ -0,0 +1,257 @@
+"""
+Microbenchmarks for the search infrastructure.
+
+Runs the q1 solvers on the big layouts and reports wall-clock timings, so
+changes to the data structures in util.py can be compared before and after,
+and how many cells each problem prunes as food-free dead ends.  On the open
+layouts it also counts the nodes A* expands and generates under each
+tie-breaking rule, with and without the canonical move ordering.
+
+    python benchmark.py
+    python benchmark.py -l q1a_bigMaze,q1c_bigSearch -r 5 -o q1a_openMaze
+"""
+
+import sys
+import time
+from typing import Callable, List, Tuple
+
+import util
+from layout import getLayout
+from pacman import GameState
+
+DEFAULT_LAYOUTS = ['q1a_bigMaze', 'q1a_bigMaze2', 'q1a_openMaze', 'q1b_bigCorners', 'q1c_bigSearch']
+# Layouts with wide rooms, where ties on f abound.
+OPEN_LAYOUTS = ['q1a_openMaze', 'q1a_contoursMaze', 'q1c_boxSearch']
+
+# The solvers' queues are swapped out while recording, so keep a handle on them.
+IndexedPriorityQueue = util.PriorityQueue
+BucketQueue = util.BucketQueue
+
+
+class LinearScanPriorityQueue(IndexedPriorityQueue):
+    """
+    The previous util.PriorityQueue.update: a linear walk over the heap and a
+    full heapify on every decrease-key.  Kept only as a benchmark reference.
+    """
+    def __init__(self):
+        import heapq
+        self.heapq = heapq
+        self.heap = []
+        self.count = 0
+
+    def push(self, item, priority):
+        self.heapq.heappush(self.heap, (priority, self.count, item))
+        self.count += 1
+
+    def pop(self):
+        (_, _, item) = self.heapq.heappop(self.heap)
+        return item
+
+    def update(self, item, priority):
+        for index, (p, c, i) in enumerate(self.heap):
+            if i == item:
+                if p <= priority:
+                    break
+                del self.heap[index]
+                self.heap.append((priority, c, item))
+                self.heapq.heapify(self.heap)
+                break
+        else:
+            self.push(item, priority)
+
+
+class RecordingQueue(IndexedPriorityQueue):
+    """
+    A priority queue that records every operation made on it, so the exact
+    workload of a real search can be replayed against other implementations.
+    """
+    trace: List[Tuple] = []
+
+    def __init__(self, *args, **kwargs):
+        RecordingQueue.trace.append(('new',))
+        IndexedPriorityQueue.__init__(self)
+
+    def push(self, item, priority):
+        RecordingQueue.trace.append(('push', item, priority))
+        IndexedPriorityQueue.push(self, item, priority)
+
+    def pop(self):
+        RecordingQueue.trace.append(('pop',))
+        return IndexedPriorityQueue.pop(self)
+
+    def update(self, item, priority):
+        RecordingQueue.trace.append(('update', item, priority))
+        IndexedPriorityQueue.update(self, item, priority)
+
+
+def loadProblem(layoutName: str, question: str):
+    layout = getLayout(layoutName)
+    if layout is None: raise Exception("The layout file cannot be found: " + layoutName)
+    state = GameState()
+    state.initialize(layout, 0)
+    problem = util.import_by_name('./problems', question + '_problem')
+    solver = util.import_by_name('./solvers', question + '_solver')
+    return problem, solver, state
+
+
+def timeIt(function: Callable, repeats: int) -> float:
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def recordTrace(problem, solver, state) -> List[Tuple]:
+    RecordingQueue.trace = []
+    util.PriorityQueue = util.BucketQueue = RecordingQueue
+    try:
+        util.mutePrint()
+        solver(problem(state))
+    finally:
+        util.unmutePrint()
+        util.PriorityQueue = IndexedPriorityQueue
+        util.BucketQueue = BucketQueue
+    return RecordingQueue.trace
+
+
+def replayTrace(queueClass, trace: List[Tuple]):
+    queue = None
+    for operation in trace:
+        kind = operation[0]
+        if kind == 'pop':
+            queue.pop()
+        elif kind == 'push':
+            queue.push(operation[1], operation[2])
+        elif kind == 'update':
+            queue.update(operation[1], operation[2])
+        else:
+            queue = queueClass()
+
+
+def benchmarkPriorityQueues(layouts: List[str], repeats: int):
+    print("Priority queue replay (best of %d)" % repeats)
+    print("%-20s %8s %12s %12s %12s" % ('layout', 'ops', 'linear (s)', 'indexed (s)', 'bucket (s)'))
+    for layoutName in layouts:
+        question = layoutName.split('_')[0]
+        problem, solver, state = loadProblem(layoutName, question)
+        trace = recordTrace(problem, solver, state)
+        linear = timeIt(lambda: replayTrace(LinearScanPriorityQueue, trace), repeats)
+        indexed = timeIt(lambda: replayTrace(IndexedPriorityQueue, trace), repeats)
+        # A bucket queue only holds non-negative integer priorities.
+        if all(isinstance(operation[2], int) for operation in trace if len(operation) == 3):
+            bucket = "%12.5f" % timeIt(lambda: replayTrace(BucketQueue, trace), repeats)
+        else:
+            bucket = "%12s" % 'n/a'
+        print("%-20s %8d %12.5f %12.5f %s" % (layoutName, len(trace), linear, indexed, bucket))
+
+
+def benchmarkSolvers(layouts: List[str], repeats: int):
+    print("Solver wall-clock (best of %d)" % repeats)
+    print("%-20s %12s" % ('layout', 'time (s)'))
+    for layoutName in layouts:
+        question = layoutName.split('_')[0]
+        problem, solver, state = loadProblem(layoutName, question)
+        util.mutePrint()
+        try:
+            elapsed = timeIt(lambda: solver(problem(state)), repeats)
+        finally:
+            util.unmutePrint()
+        print("%-20s %12.5f" % (layoutName, elapsed))
+
+
+def reportPruning(layouts: List[str]):
+    "How many cells the q1 problems skip as food-free regions behind an articulation point."
+    print("Dead-end pruning")
+    print("%-20s %8s %8s %12s" % ('layout', 'cells', 'pruned', 'articulation'))
+    for layoutName in layouts:
+        question = layoutName.split('_')[0]
+        problem, solver, state = loadProblem(layoutName, question)
+        graph = state.getMazeGraph()
+        pruned = getattr(problem(state), 'prunedCells', 0)
+        print("%-20s %8d %8d %12d" % (layoutName, graph.numCells(), pruned, len(graph.getBlockCutTree().articulation)))
+
+
+def countGenerated(searchData):
+    "Wraps the frontier of searchData to count the nodes queued or requeued; returns the live count."
+    generated = [0]
+    update = searchData.frontier.update
+    def countingUpdate(item, priority):
+        generated[0] += 1
+        update(item, priority)
+    searchData.frontier.update = countingUpdate
+    return generated
+
+
+def benchmarkTieBreaking(openLayouts: List[str]):
+    """
+    A* with a consistent heuristic (Manhattan distance to the nearest food
+    for q1a, the q1c solver's MSTHeuristic for q1c) under each tie-breaking
+    rule, with and without the problem's canonical move ordering.
+    """
+    import search
+    print("A* tie-breaking on open layouts: expanded / generated")
+    rules = [('fifo', False), ('lifo', False), ('highg', False), ('fifo', True), ('highg', True)]
+    print("%-20s" % 'layout' + "".join("%18s" % (rule + ('+canonical' if canonical else '')) for rule, canonical in rules))
+    for layoutName in openLayouts:
+        question = layoutName.split('_')[0]
+        problemClass, solver, state = loadProblem(layoutName, question)
+        problem = problemClass(state)
+        if question == 'q1a':
+            food = state.getFood().asList()
+            options = dict(start=state.getPacmanPosition(), goalTest=lambda position: state.hasFood(*position),
+                           heuristic=lambda position, problem: min(util.manhattanDistance(position, dot) for dot in food))
+        else:
+            from solvers.q1c_solver import MSTHeuristic
+            rows = state.getMazeDistances().getRows([problem.graph.getCellId(food) for food in problem.food])
+            options = dict(heuristic=MSTHeuristic(problem, rows))
+        cells = []
+        for rule, canonical in rules:
+            searchData = search.search_initialise(problem, tieBreak=rule,
+                                                  canonical=problem.isCanonicalMove if canonical else None, **options)
+            generated = countGenerated(searchData)
+            terminate = False
+            while not terminate:
+                terminate, _ = search.search_loop_body(problem, searchData)
+            cells.append("%18s" % ("%d / %d" % (searchData.expansions, generated[0])))
+        print("%-20s" % layoutName + "".join(cells))
+
+
+def readCommand(argv):
+    """
+    Processes the command used to run the benchmarks from the command line.
+    """
+    from optparse import OptionParser
+    usageStr = """
+    USAGE:      python benchmark.py <options>
+    """
+    parser = OptionParser(usageStr)
+
+    parser.add_option('-l', '--layouts', dest='layouts', default=','.join(DEFAULT_LAYOUTS),
+                      help='Comma separated layout names to benchmark')
+    parser.add_option('-r', '--repeats', dest='repeats', type='int', default=3,
+                      help='Number of repetitions; the best time is reported')
+    parser.add_option('-o', '--open', dest='openLayouts', default=','.join(OPEN_LAYOUTS),
+                      help='Comma separated open layouts to compare tie-breaking rules on')
+
+    options, otherjunk = parser.parse_args(argv)
+    if len(otherjunk) != 0:
+        raise Exception('Command line input not understood: ' + str(otherjunk))
+
+    args = dict()
+    args['layouts'] = options.layouts.split(',')
+    args['repeats'] = options.repeats
+    args['openLayouts'] = options.openLayouts.split(',')
+    return args
+
+
+if __name__ == "__main__":
+    args = readCommand(sys.argv[1:])
+    benchmarkPriorityQueues(args['layouts'], args['repeats'])
+    print("")
+    benchmarkSolvers(args['layouts'], args['repeats'])
+    print("")
+    reportPruning(args['layouts'])
+    print("")
+    benchmarkTieBreaking(args['openLayouts'])
@@ -0,0 +1,135 @@
+"""
+Articulation points, biconnected components and goal-free regions of a maze.
+
+A cell is an articulation point when removing it disconnects the maze; the
+biconnected components (blocks) are the maximal pieces without one.  Blocks
+and articulation points form a tree, the block-cut tree.  Dead-end trees are
+the simplest case: every corridor cell of a tree-shaped pocket is an
+articulation point and every step between two of them is a block of its own.
+
+Given a start cell and the goal cells, root the tree at the start.  Any
+subtree that holds no goal hangs off the rest of the maze by a single
+articulation point, so a walk that enters it has to come back out through
+that same cell; dropping the detour leaves a cheaper walk that still reaches
+every goal.  No optimal path enters such a region, and relevantCells() lets
+the problems' getSuccessors skip all of it without losing optimality.  Cells
+walled off from the start are dropped too.
+
+Get the tree of a layout through MazeGraph.getBlockCutTree(), which builds it
+once per layout; it costs one linear pass over the maze.
+"""
+
+
+class BlockCutTree:
+    """
+    blocks: the cell ids of each biconnected component; a cell with no open
+      neighbour is a block by itself
+    articulation: the articulation point cell ids
+    cellNodes: cell id -> tree node; node b < len(blocks) is block b, node
+      len(blocks) + i is articulation[i]
+    treeEdges: node -> the adjacent tree nodes
+    """
+    def __init__(self, graph):
+        self.graph = graph
+        self.blocks = findBlocks(graph.getAdjacency())
+        numCells = graph.numCells()
+        blockCount = [0] * numCells
+        for block in self.blocks:
+            for cell in block:
+                blockCount[cell] += 1
+        self.articulation = [cell for cell in range(numCells) if blockCount[cell] > 1]
+        self.cellNodes = [-1] * numCells
+        self.treeEdges = [[] for _ in range(len(self.blocks) + len(self.articulation))]
+        for i, cell in enumerate(self.articulation):
+            self.cellNodes[cell] = len(self.blocks) + i
+        for b, block in enumerate(self.blocks):
+            for cell in block:
+                node = self.cellNodes[cell]
+                if node >= len(self.blocks):
+                    self.treeEdges[b].append(node)
+                    self.treeEdges[node].append(b)
+                else:
+                    self.cellNodes[cell] = b
+
+    def relevantCells(self, start, goals):
+        """
+        A bytearray over cell ids, 1 for the cells an optimal walk from the
+        cell start through every reachable cell in goals may use and 0 for
+        the goal-free regions it never enters.
+        """
+        nodes = len(self.treeEdges)
+        terminal = bytearray(nodes)
+        for goal in goals:
+            terminal[self.cellNodes[goal]] = 1
+        root = self.cellNodes[start]
+        terminal[root] = 1
+        # Depth-first order from the start, then fold "holds a goal" up to the root.
+        parent = [-1] * nodes
+        parent[root] = root
+        order = [root]
+        for node in order:
+            for neighbor in self.treeEdges[node]:
+                if parent[neighbor] == -1:
+                    parent[neighbor] = node
+                    order.append(neighbor)
+        for node in reversed(order):
+            if terminal[node] and node != root:
+                terminal[parent[node]] = 1
+
+        relevant = bytearray(self.graph.numCells())
+        blockCount = len(self.blocks)
+        for node in order:
+            if not terminal[node]:
+                continue
+            if node < blockCount:
+                for cell in self.blocks[node]:
+                    relevant[cell] = 1
+            else:
+                relevant[self.articulation[node - blockCount]] = 1
+        return relevant
+
+
+def findBlocks(adjacency):
+    "The biconnected components of the graph, by an iterative Hopcroft-Tarjan search."
+    numCells = len(adjacency)
+    discovered = [-1] * numCells
+    low = [0] * numCells
+    blocks = []
+    clock = 0
+    for root in range(numCells):
+        if discovered[root] != -1:
+            continue
+        discovered[root] = low[root] = clock
+        clock += 1
+        if not adjacency[root]:
+            blocks.append([root])
+            continue
+        cells = [root]
+        stack = [(root, -1, iter(adjacency[root]))]
+        while stack:
+            cell, parent, neighbors = stack[-1]
+            for neighbor in neighbors:
+                if discovered[neighbor] == -1:
+                    discovered[neighbor] = low[neighbor] = clock
+                    clock += 1
+                    cells.append(neighbor)
+                    stack.append((neighbor, cell, iter(adjacency[neighbor])))
+                    break
+                if neighbor != parent and discovered[neighbor] < low[cell]:
+                    low[cell] = discovered[neighbor]
+            else:
+                stack.pop()
+                if parent == -1:
+                    continue
+                if low[cell] < low[parent]:
+                    low[parent] = low[cell]
+                if low[cell] >= discovered[parent]:
+                    # parent separates the subtree of cell: pop that subtree as one block.
+                    block = [parent]
+                    while True:
+                        top = cells.pop()
+                        block.append(top)
+                        if top == cell:
+                            break
+                    blocks.append(block)
+    return blocks
@@ -0,0 +1,465 @@
+"""
+Memory-bounded alternatives to the best-first engine in search.py.
+
+A* keeps every state it has seen, which does not fit for very large mazes.
+The searches here trade time, or optimality, for a fixed memory budget and
+follow the same contract as search_initialise / search_loop_body: every call
+to a loop body does one unit of work and returns (terminate, actions).
+
+IDA*: iterative deepening on f = g + h.  Memory is the current path plus a
+transposition cache of at most cacheSize states, which prunes the
+re-expansion of states already reached more cheaply in the same iteration.
+
+SMA*: simplified memory-bounded A*.  At most maxNodes search nodes are kept;
+when memory is full the worst leaf is forgotten and its f-value is backed up
+into its parent, which regenerates it if that branch becomes promising again.
+
+Both are optimal for an admissible heuristic (SMA* as long as maxNodes
+leaves room for the shallowest optimal path and the successors along it).
+
+Beam search: breadth-first by depth, keeping only the width nodes of lowest
+f in each depth layer.  Memory is width times the path length, and the path
+it finds is good rather than optimal.  When a layer comes out empty because
+nodes were cut, it can start over twice as wide.
+
+All three record peakNodes, the most nodes they ever held at once.
+"""
+
+import heapq
+
+from search import nullHeuristic
+
+
+class IDAData:
+    """
+    The state of an IDA* search.  stack holds one frame per node on the
+    current path: [state, g, successors, next successor index, action].
+    """
+    def __init__(self, start, heuristic, cacheSize, goalTest, problem):
+        self.start = start
+        self.heuristic = heuristic
+        self.cacheSize = cacheSize
+        self.goalTest = goalTest
+        self.bound = None
+        self.nextBound = heuristic(start, problem)
+        self.stack = []
+        self.onPath = set()
+        self.cache = {}
+        self.goalState = None
+        self.actions = []
+        self.iterations = 0
+        self.expansions = 0
+        self.peakNodes = 0
+
+
+def ida_initialise(problem, start=None, heuristic=nullHeuristic, cacheSize=100000, goalTest=None):
+    """
+    Starts an IDA* search of problem from start (problem.getStartState() by default).
+
+    heuristic: admissible function (state, problem) -> estimated cost to the goal
+    cacheSize: the most states the transposition cache may hold; 0 disables it
+    goalTest: function state -> bool, problem.isGoalState by default
+    """
+    if start is None: start = problem.getStartState()
+    if goalTest is None: goalTest = problem.isGoalState
+    return IDAData(start, heuristic, cacheSize, goalTest, problem)
+
+
+def ida_loop_body(problem, idaData: IDAData):
+    """
+    Descends into the next successor of the deepest node on the path that
+    fits under the current bound, or backtracks one level.  An exhausted
+    iteration restarts from the start with the smallest f that overflowed.
+    """
+    stack = idaData.stack
+    if not stack:
+        if idaData.nextBound == float('inf'):
+            return (True, [])
+        if idaData.goalTest(idaData.start):
+            idaData.goalState = idaData.start
+            return (True, [])
+        idaData.bound, idaData.nextBound = idaData.nextBound, float('inf')
+        idaData.iterations += 1
+        idaData.cache.clear()
+        idaData.onPath.add(idaData.start)
+        stack.append([idaData.start, 0, problem.getSuccessors(idaData.start), 0, None])
+        idaData.expansions += 1
+        return (False, [])
+
+    frame = stack[-1]
+    g, successors = frame[1], frame[2]
+    bound = idaData.bound
+    cache = idaData.cache
+    onPath = idaData.onPath
+    heuristic = idaData.heuristic
+    while frame[3] < len(successors):
+        successor, action, stepCost = successors[frame[3]]
+        frame[3] += 1
+        newCost = g + stepCost
+        f = newCost + heuristic(successor, problem)
+        if f > bound:
+            if f < idaData.nextBound: idaData.nextBound = f
+            continue
+        if successor in onPath:
+            continue
+        # Within one iteration a state reached again at no lower cost has
+        # nothing left to find under the same bound.
+        cached = cache.get(successor)
+        if cached is not None and cached <= newCost:
+            continue
+        if cached is not None or len(cache) < idaData.cacheSize:
+            cache[successor] = newCost
+        if idaData.goalTest(successor):
+            idaData.goalState = successor
+            idaData.actions = [step[4] for step in stack[1:]] + [action]
+            return (True, idaData.actions)
+        onPath.add(successor)
+        stack.append([successor, newCost, problem.getSuccessors(successor), 0, action])
+        idaData.expansions += 1
+        nodes = len(stack) + len(cache)
+        if nodes > idaData.peakNodes: idaData.peakNodes = nodes
+        return (False, [])
+
+    stack.pop()
+    onPath.discard(frame[0])
+    return (False, [])
+
+
+class SMANode:
+    __slots__ = ('state', 'parent', 'action', 'g', 'f', 'depth', 'children', 'forgotten', 'version')
+
+    def __init__(self, state, parent, action, g, f, depth):
+        self.state = state
+        self.parent = parent
+        self.action = action
+        self.g = g
+        self.f = f
+        self.depth = depth
+        self.children = None
+        self.forgotten = float('inf')
+        self.version = 0
+
+
+class SMAData:
+    """
+    The state of an SMA* search.  The nodes in memory form a tree rooted at
+    the start; its leaves are the open nodes.  best and worst are heaps over
+    the leaves (lowest f and deepest first, highest f and shallowest first)
+    whose entries go stale when a node's version changes.  cheapest maps a
+    state to its lowest-g node in memory, so that paths which reach a state
+    no more cheaply than one already held are not kept twice.
+    """
+    def __init__(self, start, heuristic, maxNodes, goalTest, problem):
+        self.heuristic = heuristic
+        self.maxNodes = maxNodes
+        self.goalTest = goalTest
+        self.best = []
+        self.worst = []
+        self.count = 0
+        self.nodes = 1
+        self.peakNodes = 1
+        self.cheapest = {}
+        self.goalState = None
+        self.actions = []
+        self.expansions = 0
+        self.root = SMANode(start, None, None, 0, heuristic(start, problem), 0)
+        self.cheapest[start] = self.root
+        sma_open(self, self.root)
+
+
+def sma_initialise(problem, start=None, heuristic=nullHeuristic, maxNodes=100000, goalTest=None):
+    """
+    Starts an SMA* search of problem from start (problem.getStartState() by default).
+
+    heuristic: admissible function (state, problem) -> estimated cost to the goal
+    maxNodes: the most search nodes held in memory at once
+    goalTest: function state -> bool, problem.isGoalState by default
+    """
+    if start is None: start = problem.getStartState()
+    if goalTest is None: goalTest = problem.isGoalState
+    return SMAData(start, heuristic, maxNodes, goalTest, problem)
+
+
+def sma_open(smaData: SMAData, node: SMANode):
+    """
+    (Re)queues node after its f or its children changed.  A leaf is open at
+    its f; an inner node with forgotten children is open at the best f among
+    them, so that it regenerates them once they look promising again.  Only
+    leaves go on the worst heap.
+    """
+    node.version += 1
+    smaData.count += 1
+    if len(smaData.best) > 2 * smaData.nodes + 64:
+        # Stale entries would let the heaps outgrow the memory bound.
+        smaData.best = [entry for entry in smaData.best if entry[3] == entry[4].version]
+        smaData.worst = [entry for entry in smaData.worst if entry[3] == entry[4].version]
+        heapq.heapify(smaData.best)
+        heapq.heapify(smaData.worst)
+    if node.children is None:
+        heapq.heappush(smaData.best, (node.f, -node.depth, smaData.count, node.version, node))
+        heapq.heappush(smaData.worst, (-node.f, node.depth, smaData.count, node.version, node))
+    elif node.forgotten < float('inf'):
+        heapq.heappush(smaData.best, (node.forgotten, -node.depth, smaData.count, node.version, node))
+
+
+def sma_pop(heap):
+    "The live node at the top of heap, removed from it, or None once heap is empty."
+    while heap:
+        entry = heapq.heappop(heap)
+        if entry[3] == entry[4].version:
+            return entry[4]
+    return None
+
+
+def sma_loop_body(problem, smaData: SMAData):
+    """
+    Expands the open node of lowest f (or regenerates the forgotten children
+    of an inner node), backs the new f-values up the tree and forgets the
+    worst leaves until memory fits again.
+    """
+    node = sma_pop(smaData.best)
+    leaf = node is not None and node.children is None
+    if node is None or (node.f if leaf else node.forgotten) == float('inf'):
+        return (True, [])
+    if leaf and smaData.goalTest(node.state):
+        smaData.goalState = node.state
+        actions = []
+        while node.parent is not None:
+            actions.append(node.action)
+            node = node.parent
+        actions.reverse()
+        smaData.actions = actions
+        return (True, actions)
+
+    smaData.expansions += 1
+    heuristic = smaData.heuristic
+    # Every child regenerated here is at least as bad as the forgotten
+    # best, or as the node itself for a fresh leaf (pathmax).
+    bound = node.f if leaf else node.forgotten
+    onPath = set()
+    ancestor = node
+    while ancestor is not None:
+        onPath.add(ancestor.state)
+        ancestor = ancestor.parent
+    present = set() if leaf else {(child.state, child.action) for child in node.children}
+    cheapest = smaData.cheapest
+    depth = node.depth + 1
+    children = []
+    for successor, action, stepCost in problem.getSuccessors(node.state):
+        if successor in onPath or (successor, action) in present:
+            continue
+        g = node.g + stepCost
+        other = cheapest.get(successor)
+        if other is not None and other.g <= g:
+            continue
+        f = max(bound, g + heuristic(successor, problem))
+        child = SMANode(successor, node, action, g, f, depth)
+        cheapest[successor] = child
+        children.append(child)
+    node.forgotten = float('inf')
+    if leaf and not children:
+        # A dead end: keep it as an unreachable leaf until memory needs it.
+        node.f = float('inf')
+        sma_open(smaData, node)
+        sma_backup(node.parent)
+        return (False, [])
+
+    node.children = (node.children or []) + children
+    node.version += 1
+    for child in children:
+        sma_open(smaData, child)
+    smaData.nodes += len(children)
+    sma_backup(node)
+    while smaData.nodes > smaData.maxNodes:
+        if not sma_forget(smaData):
+            break
+    if smaData.nodes > smaData.peakNodes: smaData.peakNodes = smaData.nodes
+
+    if children and all(child.parent is None for child in children) and \
+       (node.f if node.children is None else node.forgotten) == bound:
+        # Every child was forgotten again at once and nothing improved:
+        # memory cannot hold them next to the rest of the tree, so trying
+        # again would go round in circles.
+        if node.children is None:
+            node.f = float('inf')
+        else:
+            node.forgotten = float('inf')
+        sma_open(smaData, node)
+        sma_backup(node if node.children else node.parent)
+    return (False, [])
+
+
+def sma_backup(node: SMANode):
+    "Updates f along the path to the root to the best f among each node's children."
+    while node is not None and node.children:
+        f = min(min(child.f for child in node.children), node.forgotten)
+        if f == node.f:
+            break
+        node.f = f
+        node = node.parent
+
+
+def sma_forget(smaData: SMAData):
+    "Drops the worst leaf, remembering its f in its parent.  False if nothing can go."
+    leaf = sma_pop(smaData.worst)
+    if leaf is None:
+        return False
+    if leaf.parent is None:
+        # The root alone is never forgotten; keep it open.
+        sma_open(smaData, leaf)
+        return False
+    parent = leaf.parent
+    parent.children.remove(leaf)
+    if leaf.f < parent.forgotten: parent.forgotten = leaf.f
+    leaf.version += 1
+    leaf.parent = None
+    if smaData.cheapest.get(leaf.state) is leaf:
+        del smaData.cheapest[leaf.state]
+    smaData.nodes -= 1
+    if not parent.children:
+        parent.children = None
+        parent.f = parent.forgotten
+        parent.forgotten = float('inf')
+    else:
+        sma_backup(parent)
+    sma_open(smaData, parent)
+    return True
+
+
+class BeamData:
+    """
+    The state of a beam search.
+
+    layers: the nodes kept at each depth, each a list of
+      (f, -g, state, index of the parent in the layer above, action) sorted
+      best first; the last layer is being expanded, from index next on
+    candidates: heap of the best width successors of the last layer so far,
+      with the worst on top as (-f, g, count, state, parent index, action)
+    best: state -> the lowest g of any kept node holding it
+    queued: state -> the lowest g of a candidate holding it
+    pruned: whether any successor has been cut from a full layer
+    """
+    def __init__(self, start, heuristic, width, widen, goalTest, problem):
+        self.start = start
+        self.heuristic = heuristic
+        self.width = width
+        self.widen = widen
+        self.goalTest = goalTest
+        self.goalState = None
+        self.actions = []
+        self.expansions = 0
+        self.restarts = 0
+        self.peakNodes = 0
+        beam_restart(self, problem)
+
+
+def beam_initialise(problem, start=None, heuristic=nullHeuristic, width=100, widen=True, goalTest=None):
+    """
+    Starts a beam search of problem from start (problem.getStartState() by default).
+
+    heuristic: function (state, problem) -> estimated cost to the goal; it
+      ranks the nodes of a layer and need not be admissible
+    width: the most nodes kept per depth layer, at least 1
+    widen: whether to start over with twice the width when the search runs
+      dry after cutting nodes; without it such a search fails
+    goalTest: function state -> bool, problem.isGoalState by default
+    """
+    if width < 1: raise ValueError('Beam width must be at least 1, got %s' % width)
+    if start is None: start = problem.getStartState()
+    if goalTest is None: goalTest = problem.isGoalState
+    return BeamData(start, heuristic, width, widen, goalTest, problem)
+
+
+def beam_restart(beamData: BeamData, problem):
+    "Starts the search over from the start, at the current width."
+    beamData.layers = [[(beamData.heuristic(beamData.start, problem), 0, beamData.start, -1, None)]]
+    beamData.next = 0
+    beamData.candidates = []
+    beamData.count = 0
+    beamData.best = {beamData.start: 0}
+    beamData.queued = {}
+    beamData.nodes = 1
+    beamData.pruned = False
+
+
+def beam_loop_body(problem, beamData: BeamData):
+    """
+    Expands the next node of the deepest layer, or turns the candidates into
+    the next layer once it is done.  Returns (True, actions) when a goal is
+    expanded, and (True, []) with goalState None when no goal can be found.
+    """
+    layer = beamData.layers[-1]
+    if beamData.next == len(layer):
+        return beam_next_layer(problem, beamData)
+
+    index = beamData.next
+    beamData.next += 1
+    _, g, state, _, _ = layer[index]
+    g = -g
+    if beamData.goalTest(state):
+        beamData.goalState = state
+        beamData.actions = beam_path(beamData, len(beamData.layers) - 1, index)
+        return (True, beamData.actions)
+
+    beamData.expansions += 1
+    candidates = beamData.candidates
+    best = beamData.best
+    queued = beamData.queued
+    heuristic = beamData.heuristic
+    width = beamData.width
+    for successor, action, stepCost in problem.getSuccessors(state):
+        newCost = g + stepCost
+        if best.get(successor, float('inf')) <= newCost or queued.get(successor, float('inf')) <= newCost:
+            continue
+        beamData.count += 1
+        entry = (-(newCost + heuristic(successor, problem)), newCost, beamData.count, successor, index, action)
+        beamData.pruned = beamData.pruned or len(candidates) == width
+        if len(candidates) < width:
+            heapq.heappush(candidates, entry)
+        elif entry > candidates[0]:
+            # Better than the worst candidate, which makes room.
+            worst = heapq.heapreplace(candidates, entry)
+            if queued.get(worst[3]) == worst[1]:
+                del queued[worst[3]]
+        else:
+            continue
+        queued[successor] = newCost
+    beamData.peakNodes = max(beamData.peakNodes, beamData.nodes + len(candidates))
+    return (False, beamData.actions)
+
+
+def beam_next_layer(problem, beamData: BeamData):
+    "Makes the candidates the next layer, or widens or gives up if there are none."
+    if not beamData.candidates:
+        if beamData.widen and beamData.pruned:
+            beamData.width *= 2
+            beamData.restarts += 1
+            beam_restart(beamData, problem)
+            return (False, beamData.actions)
+        return (True, [])
+    layer = []
+    best = beamData.best
+    # Best first; a state queued twice keeps its first, cheapest, copy.
+    for negativeF, g, _, state, parent, action in sorted(beamData.candidates, reverse=True):
+        if g < best.get(state, float('inf')):
+            best[state] = g
+            layer.append((-negativeF, -g, state, parent, action))
+    beamData.layers.append(layer)
+    beamData.nodes += len(layer)
+    beamData.candidates = []
+    beamData.queued = {}
+    beamData.next = 0
+    return (False, beamData.actions)
+
+
+def beam_path(beamData: BeamData, depth, index):
+    "The actions leading from the start to node index of layer depth."
+    layers = beamData.layers
+    actions = []
+    while depth > 0:
+        _, _, _, parent, action = layers[depth][index]
+        actions.append(action)
+        index = parent
+        depth -= 1
+    actions.reverse()
+    return actions
@@ -0,0 +1,198 @@
+"""
+Hierarchical pathfinding (HPA*) over a mazeGraph.MazeGraph.
+
+The maze is cut into square clusters of clusterSize x clusterSize cells.
+Every open cell with a neighbour in another cluster is an entrance.  The
+abstract graph links each entrance to the entrances it touches across a
+cluster border (cost 1) and to every entrance of its own cluster it can
+reach without leaving the cluster (cost: that distance, precomputed once).
+Because every border crossing is kept, the cheapest abstract path is as
+short as the cheapest path in the maze.
+
+ClusterProblem adds the start and goals of one query by searching only
+their own clusters, and is searched like any other problem.  expandActions
+then refines the abstract path back into single moves, computing (and
+memoizing) the in-cluster paths of the abstract edges it actually uses.
+
+Build the graph through MazeGraph.getClusterGraph(), which caches it with
+the layout.
+"""
+
+import collections
+from array import array
+
+from mazeGraph import ACTIONS
+
+GOAL = -1  # The abstract node every goal is connected to.
+GOAL_SEARCH_CACHE_SIZE = 4096
+
+
+class ClusterGraph:
+    """
+    The abstract graph of a MazeGraph.
+
+    cellCluster: cell id -> cluster id
+    clusterCells, entrances: cluster id -> its cells, its entrance cells
+    edges: entrance -> list of (entrance, cost) abstract edges
+    """
+    def __init__(self, graph, clusterSize=10):
+        self.graph = graph
+        self.clusterSize = clusterSize
+        clustersHigh = (graph.height + clusterSize - 1) // clusterSize
+        numCells = graph.numCells()
+        self.cellCluster = array('i', [(graph.cellX[cell] // clusterSize) * clustersHigh + graph.cellY[cell] // clusterSize
+                                       for cell in range(numCells)])
+        self.clusterCells = {}
+        for cell in range(numCells):
+            self.clusterCells.setdefault(self.cellCluster[cell], []).append(cell)
+
+        adjacency = graph.getAdjacency()
+        cellCluster = self.cellCluster
+        self.entrances = {}
+        self.edges = {}
+        for cell in range(numCells):
+            crossings = [(neighbor, 1) for neighbor in adjacency[cell] if cellCluster[neighbor] != cellCluster[cell]]
+            if crossings:
+                self.entrances.setdefault(cellCluster[cell], []).append(cell)
+                self.edges[cell] = crossings
+        for entrances in self.entrances.values():
+            for entrance in entrances:
+                distance, _ = self.clusterSearch([entrance])
+                self.edges[entrance].extend((other, distance[other]) for other in entrances
+                                            if other != entrance and other in distance)
+        self.paths = {}
+        self.goalSearches = {}
+
+    def numEntrances(self):
+        return len(self.edges)
+
+    def clusterSearch(self, sources):
+        """
+        Breadth-first search from sources that never leaves their cluster.
+        Returns (distance, parent): cell -> moves from the nearest source,
+        and cell -> the neighbour one move closer to it.
+        """
+        cellCluster = self.cellCluster
+        cluster = cellCluster[sources[0]]
+        adjacency = self.graph.getAdjacency()
+        distance = {source: 0 for source in sources}
+        parent = {}
+        queue = collections.deque(sources)
+        while queue:
+            cell = queue.popleft()
+            for neighbor in adjacency[cell]:
+                if neighbor not in distance and cellCluster[neighbor] == cluster:
+                    distance[neighbor] = distance[cell] + 1
+                    parent[neighbor] = cell
+                    queue.append(neighbor)
+        return distance, parent
+
+    def goalSearch(self, cluster, goals):
+        "clusterSearch from the goals in one cluster, memoized while those goals stay the same."
+        key = (cluster, frozenset(goals))
+        search = self.goalSearches.get(key)
+        if search is None:
+            if len(self.goalSearches) >= GOAL_SEARCH_CACHE_SIZE:
+                self.goalSearches.clear()
+            search = self.goalSearches[key] = self.clusterSearch(list(goals))
+        return search
+
+    def step(self, cell, neighbor):
+        "The action that moves from cell to the adjacent cell neighbor."
+        graph = self.graph
+        for edge in range(graph.offsets[cell], graph.offsets[cell + 1]):
+            if graph.targets[edge] == neighbor:
+                return ACTIONS[graph.edgeActions[edge]]
+
+    def walk(self, cell, parent):
+        "The cells from cell to the source of a clusterSearch, following parent."
+        cells = [cell]
+        while cell in parent:
+            cell = parent[cell]
+            cells.append(cell)
+        return cells
+
+    def stepsAlong(self, cells):
+        return [self.step(cells[i], cells[i + 1]) for i in range(len(cells) - 1)]
+
+    def refine(self, entrance, other):
+        "The moves of the abstract edge from entrance to other."
+        path = self.paths.get((entrance, other))
+        if path is None:
+            if self.cellCluster[entrance] != self.cellCluster[other]:
+                path = [self.step(entrance, other)]
+            else:
+                _, parent = self.clusterSearch([entrance])
+                path = self.stepsAlong(self.walk(other, parent)[::-1])
+            self.paths[(entrance, other)] = path
+        return path
+
+
+class ClusterProblem:
+    """
+    A point-to-point or nearest-goal search problem over a ClusterGraph.
+
+    States are entrance cell ids, the start cell and GOAL, which every goal
+    leads to.  Each action is a token naming an abstract edge; expandActions
+    refines a solution into the per-step Directions list.
+    """
+    def __init__(self, clusters, start, goals):
+        self.clusters = clusters
+        self.start = start
+        self.goals = set(goals)
+        self.integerCosts = True
+        cellCluster = clusters.cellCluster
+        startCluster = cellCluster[start]
+
+        distance, self.startParent = clusters.clusterSearch([start])
+        self.startEdges = [(entrance, ('start', entrance), distance[entrance])
+                           for entrance in clusters.entrances.get(startCluster, ()) if entrance in distance]
+        nearby = [(distance[goal], goal) for goal in self.goals if goal in distance]
+        if nearby:
+            cost, goal = min(nearby)
+            self.startEdges.append((GOAL, ('start', goal), cost))
+
+        # Every entrance of a cluster holding goals leads to its nearest one.
+        goalsByCluster = {}
+        for goal in self.goals:
+            goalsByCluster.setdefault(cellCluster[goal], []).append(goal)
+        self.goalParents = {}
+        self.goalEdges = {}
+        for cluster, clusterGoals in goalsByCluster.items():
+            distance, parent = clusters.goalSearch(cluster, clusterGoals)
+            self.goalParents[cluster] = parent
+            for entrance in clusters.entrances.get(cluster, ()):
+                if entrance in distance:
+                    self.goalEdges[entrance] = distance[entrance]
+
+    def getStartState(self):
+        return self.start
+
+    def isGoalState(self, state):
+        return state == GOAL or state in self.goals
+
+    def getSuccessors(self, state):
+        if state == GOAL:
+            return []
+        successors = []
+        if state == self.start:
+            successors.extend(self.startEdges)
+        edges = self.clusters.edges.get(state)
+        if edges is not None:
+            successors.extend((other, ('edge', state, other), cost) for other, cost in edges)
+            if state in self.goalEdges:
+                successors.append((GOAL, ('goal', state), self.goalEdges[state]))
+        return successors
+
+    def expandActions(self, actions):
+        clusters = self.clusters
+        steps = []
+        for token in actions:
+            if token[0] == 'edge':
+                steps.extend(clusters.refine(token[1], token[2]))
+            elif token[0] == 'start':
+                steps.extend(clusters.stepsAlong(clusters.walk(token[1], self.startParent)[::-1]))
+            else:
+                entrance = token[1]
+                steps.extend(clusters.stepsAlong(clusters.walk(entrance, self.goalParents[clusters.cellCluster[entrance]])))
+        return steps
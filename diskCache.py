@@ -0,0 +1,89 @@
+"""
+A small persistent, content-addressed key-value store.
+
+Each value is pickled into its own file, named by the SHA-256 digest of its
+key, under one directory.  Reading a value marks it as recently used; once
+the files add up to more than maxBytes, the least recently used ones are
+deleted.  Writes go through a temporary file and an atomic rename, so
+concurrent runs never see half-written values.
+
+    cache = DiskCache('.cache/example')
+    key = contentKey('layout text', (1, 1), 'solver source')
+    if cache.get(key) is None:
+        cache.put(key, expensiveComputation())
+"""
+
+import hashlib
+import os
+import pickle
+import tempfile
+
+
+def contentKey(*parts):
+    "A hex digest identifying parts, which must have a deterministic repr()."
+    return hashlib.sha256(repr(parts).encode('utf-8')).hexdigest()
+
+
+class DiskCache:
+    def __init__(self, directory, maxBytes=64 * 2**20):
+        self.directory = directory
+        self.maxBytes = maxBytes
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + '.pkl')
+
+    def get(self, key, default=None):
+        "The value stored under key, or default if there is none or it cannot be read."
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as file:
+                value = pickle.load(file)
+            os.utime(path)
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+            return default
+        return value
+
+    def put(self, key, value):
+        "Stores value under key, then evicts old values if the cache is over its size."
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            handle, temporary = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+            with os.fdopen(handle, 'wb') as file:
+                pickle.dump(value, file, pickle.HIGHEST_PROTOCOL)
+            os.replace(temporary, self._path(key))
+        except OSError:
+            # A cache that cannot be written just stays cold.
+            return
+        self.evict()
+
+    def evict(self):
+        "Deletes least recently used values until the cache fits in maxBytes."
+        entries = []
+        total = 0
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return
+        for name in names:
+            if not name.endswith('.pkl'):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.directory, name))
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, name))
+            total += stat.st_size
+        entries.sort()
+        for _, size, name in entries:
+            if total <= self.maxBytes:
+                break
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                pass
+            total -= size
+
+    def clear(self):
+        for name in os.listdir(self.directory) if os.path.isdir(self.directory) else ():
+            if name.endswith('.pkl'):
+                os.remove(os.path.join(self.directory, name))
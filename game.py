@@ -604,7 +604,11 @@ class Game:
                 self.mute(i)
                 if self.catchExceptions:
                     try:
-                        timed_func = TimeoutFunction(agent.registerInitialState, self.rules.getMaxStartupTime(i))
+                        startupTime = self.rules.getMaxStartupTime(i)
+                        # Anytime agents can use the whole budget and still return in time.
+                        if "setStartupDeadline" in dir(agent):
+                            agent.setStartupDeadline(time.time() + startupTime)
+                        timed_func = TimeoutFunction(agent.registerInitialState, startupTime)
                         try:
                             start_time = time.time()
                             timed_func(self.state.deepCopy())
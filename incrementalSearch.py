@@ -0,0 +1,172 @@
+"""
+Incremental replanning with D* Lite (Koenig and Likhachev, 2002).
+
+search.py answers every query from scratch.  D* Lite searches backwards from
+the goals and keeps its distance estimates between queries: when the start
+moves, a goal is added or removed, or the moves out of some states change,
+only the part of the search those changes invalidate is redone.  It serves
+agents that replan from a new position every move, and solvers that visit
+goals one after another.
+
+Every state has g, its current cost-to-goal estimate, and rhs, the one-step
+lookahead min over successors s' of stepCost(s, s') + g(s').  A state whose
+g and rhs differ is queued on its key, and dstar_loop_body settles one such
+state per call, with the same (terminate, actions) contract as
+search_loop_body.
+
+Moves must be reversible at the same cost, as they are in a maze: the
+predecessors of a state are read from problem.getSuccessors.
+"""
+
+import util
+
+INFINITY = float('inf')
+
+
+class DStarData:
+    """
+    The state of a D* Lite search.
+
+    g, rhs: state -> cost-to-goal estimates, infinite when missing
+    km: the sum of the heuristic drops between consecutive starts, which
+      keeps old keys valid lower bounds as the start moves
+    goalState: the goal the last planned path ends at, None if there is none
+    """
+    def __init__(self, start, goals, distanceEstimate):
+        self.start = start
+        self.last = start
+        self.goals = set(goals)
+        self.distanceEstimate = distanceEstimate
+        self.g = {}
+        self.rhs = {}
+        self.km = 0
+        self.queue = util.PriorityQueue()
+        self.goalState = None
+        self.actions = []
+        self.expansions = 0
+        for goal in self.goals:
+            self.rhs[goal] = 0
+            self.queue.push(goal, dstar_key(self, goal))
+
+
+def dstar_initialise(problem, start, goals, distanceEstimate=None):
+    """
+    Starts a D* Lite search for the cheapest path from start to the nearest
+    of goals.
+
+    distanceEstimate: function (a, b) -> admissible, consistent estimate of
+      the cost between two states; zero by default
+    """
+    if distanceEstimate is None: distanceEstimate = lambda a, b: 0
+    return DStarData(start, goals, distanceEstimate)
+
+
+def dstar_key(dstarData: DStarData, state):
+    best = min(dstarData.g.get(state, INFINITY), dstarData.rhs.get(state, INFINITY))
+    return (best + dstarData.distanceEstimate(dstarData.start, state) + dstarData.km, best)
+
+
+def dstar_update_state(problem, dstarData: DStarData, state):
+    "Recomputes rhs(state) and (re)queues state if it is inconsistent."
+    g = dstarData.g
+    if state not in dstarData.goals:
+        best = INFINITY
+        for successor, _, stepCost in problem.getSuccessors(state):
+            cost = stepCost + g.get(successor, INFINITY)
+            if cost < best: best = cost
+        dstarData.rhs[state] = best
+    queue = dstarData.queue
+    if state in queue:
+        queue.remove(state)
+    if g.get(state, INFINITY) != dstarData.rhs.get(state, INFINITY):
+        queue.push(state, dstar_key(dstarData, state))
+
+
+def dstar_loop_body(problem, dstarData: DStarData):
+    """
+    Settles the inconsistent state of lowest key.  Returns (True, actions)
+    once the start is consistent and no queued state can improve it, with
+    goalState None and no actions if no goal can be reached.
+    """
+    queue = dstarData.queue
+    start = dstarData.start
+    g, rhs = dstarData.g, dstarData.rhs
+    startG = g.get(start, INFINITY)
+    if queue.isEmpty() or (queue.peekPriority() >= dstar_key(dstarData, start) and rhs.get(start, INFINITY) == startG):
+        return dstar_path(problem, dstarData)
+
+    oldKey = queue.peekPriority()
+    state = queue.pop()
+    newKey = dstar_key(dstarData, state)
+    if oldKey < newKey:
+        # Queued before the start last moved: its key has grown since.
+        queue.push(state, newKey)
+        return (False, dstarData.actions)
+    dstarData.expansions += 1
+    neighbors = [successor for successor, _, _ in problem.getSuccessors(state)]
+    if g.get(state, INFINITY) > rhs.get(state, INFINITY):
+        g[state] = rhs[state]
+    else:
+        g[state] = INFINITY
+        neighbors.append(state)
+    for neighbor in neighbors:
+        dstar_update_state(problem, dstarData, neighbor)
+    return (False, dstarData.actions)
+
+
+def dstar_path(problem, dstarData: DStarData):
+    "Follows the cheapest successors from the start down to a goal."
+    g = dstarData.g
+    state = dstarData.start
+    dstarData.actions = []
+    dstarData.goalState = None
+    if dstarData.rhs.get(state, INFINITY) == INFINITY:
+        return (True, [])
+    while state not in dstarData.goals:
+        best, bestMove = INFINITY, None
+        for successor, action, stepCost in problem.getSuccessors(state):
+            cost = stepCost + g.get(successor, INFINITY)
+            if cost < best:
+                best, bestMove = cost, (successor, action)
+        state = bestMove[0]
+        dstarData.actions.append(bestMove[1])
+    dstarData.goalState = state
+    return (True, dstarData.actions)
+
+
+def dstar_move_start(problem, dstarData: DStarData, start):
+    "Replans from start, e.g. after the agent has walked part of the last path."
+    dstarData.km += dstarData.distanceEstimate(dstarData.last, start)
+    dstarData.last = start
+    dstarData.start = start
+
+
+def dstar_remove_goal(problem, dstarData: DStarData, goal):
+    if goal in dstarData.goals:
+        dstarData.goals.discard(goal)
+        dstar_update_state(problem, dstarData, goal)
+
+
+def dstar_add_goal(problem, dstarData: DStarData, goal):
+    if goal not in dstarData.goals:
+        dstarData.goals.add(goal)
+        dstarData.rhs[goal] = 0
+        dstar_update_state(problem, dstarData, goal)
+
+
+def dstar_update_states(problem, dstarData: DStarData, states):
+    """
+    Repairs the search after the moves out of states changed, e.g. a wall
+    appeared or disappeared next to them.  List every state whose successors
+    are now different.
+    """
+    for state in states:
+        dstar_update_state(problem, dstarData, state)
+
+
+def dstar_search(problem, dstarData: DStarData):
+    "Runs dstar_loop_body until the path from the current start is known and returns it."
+    terminate = False
+    while not terminate:
+        terminate, actions = dstar_loop_body(problem, dstarData)
+    return actions
@@ -0,0 +1,102 @@
+"""
+Landmark (ALT) distance estimates for a layout.
+
+A few landmark cells are chosen by farthest-point selection: each new
+landmark is the cell farthest from all the landmarks chosen so far.  For
+every landmark L the exact BFS distance row d(L, .) is kept, two bytes per
+cell, and by the triangle inequality
+
+    d(a, b) >= |d(L, b) - d(L, a)|
+
+for every L, so the largest such difference is an admissible and consistent
+estimate of the maze distance.  Where walls force long detours it is far
+better informed than Manhattan distance, at k rows instead of the whole
+all-pairs table.
+
+Get the landmarks of a game through GameState.getLandmarks(), which caches
+them with the layout in memory and under .cache/landmarks on disk.
+"""
+
+import os
+from array import array
+
+from diskCache import DiskCache, contentKey
+from mazeDistances import UNREACHABLE
+
+LANDMARK_COUNT = 8
+CACHE_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'landmarks')
+# Bump when the selection or the stored format changes, to retire old entries.
+CACHE_VERSION = 1
+
+
+class Landmarks:
+    """
+    cells: the landmark cell ids
+    rows: the uint16 distances from each landmark to every cell id
+    """
+    def __init__(self, cells, rows):
+        self.cells = cells
+        self.rows = rows
+
+    @classmethod
+    def select(cls, distances, count=LANDMARK_COUNT):
+        "Chooses count landmarks by farthest-point selection over a MazeDistances oracle."
+        numCells = distances.graph.numCells()
+        count = min(count, numCells)
+        if count == 0:
+            return cls([], [])
+        # Seed with the cell farthest from cell 0, a rough end of the maze.
+        seed = distances.getRow(0)
+        first = max(range(numCells), key=lambda cell: seed[cell] if seed[cell] != UNREACHABLE else -1)
+        cells, rows = [first], [distances.getRow(first)]
+        nearest = array('H', rows[0])
+        while len(cells) < count:
+            # Unreachable cells count as infinitely far, so every component gets a landmark.
+            cell = max(range(numCells), key=nearest.__getitem__)
+            if nearest[cell] == 0:
+                break
+            row = distances.getRow(cell)
+            cells.append(cell)
+            rows.append(row)
+            for other in range(numCells):
+                if row[other] < nearest[other]:
+                    nearest[other] = row[other]
+        return cls(cells, rows)
+
+    def estimate(self, a, b):
+        "A lower bound on the maze distance between cell ids a and b."
+        best = 0
+        for row in self.rows:
+            distanceA, distanceB = row[a], row[b]
+            if distanceA == UNREACHABLE or distanceB == UNREACHABLE:
+                continue
+            difference = distanceA - distanceB if distanceA > distanceB else distanceB - distanceA
+            if difference > best:
+                best = difference
+        return best
+
+    def estimateToNearest(self, cell, goals):
+        "A lower bound on the maze distance from cell to the nearest of goals."
+        return min((self.estimate(cell, goal) for goal in goals), default=0)
+
+
+def loadLandmarks(layoutText, distances, count=LANDMARK_COUNT):
+    """
+    The landmarks of a layout, read from the disk cache or selected and
+    stored there.  Rows read from disk also fill in the oracle's rows.
+    """
+    cache = DiskCache(CACHE_DIRECTORY)
+    key = contentKey('landmarks', CACHE_VERSION, layoutText, count)
+    stored = cache.get(key)
+    if stored is not None:
+        rows = []
+        for cell, data in zip(stored['cells'], stored['rows']):
+            row = array('H')
+            row.frombytes(data)
+            if distances.rows[cell] is None:
+                distances.rows[cell] = row
+            rows.append(distances.rows[cell])
+        return Landmarks(list(stored['cells']), rows)
+    landmarks = Landmarks.select(distances, count)
+    cache.put(key, {'cells': landmarks.cells, 'rows': [row.tobytes() for row in landmarks.rows]})
+    return landmarks
@@ -17,9 +17,17 @@ import random
 from functools import reduce
 
 from game import Grid
+from landmarks import LANDMARK_COUNT, loadLandmarks
+from mazeDistances import MazeDistances
+from mazeGraph import MazeGraph
+from patternDatabase import GROUP_SIZE, loadPatternDatabase
 from util import manhattanDistance
 
 VISIBILITY_MATRIX_CACHE = {}
+MAZE_GRAPH_CACHE = {}
+MAZE_DISTANCES_CACHE = {}
+LANDMARKS_CACHE = {}
+PATTERN_DATABASE_CACHE = {}
 
 class Layout:
     """
@@ -63,6 +71,50 @@ class Layout:
         else:
             self.visibility = VISIBILITY_MATRIX_CACHE[reduce(str.__add__, self.layoutText)]
 
+    def getMazeGraph(self):
+        """
+        The walls compiled into a mazeGraph.MazeGraph.  Layouts are deep-copied
+        with every game state, so graphs are cached by layout text.
+        """
+        if not hasattr(self, 'mazeGraph'):
+            key = "\n".join(self.layoutText)
+            if key not in MAZE_GRAPH_CACHE:
+                MAZE_GRAPH_CACHE[key] = MazeGraph(self.walls)
+            self.mazeGraph = MAZE_GRAPH_CACHE[key]
+        return self.mazeGraph
+
+    def getMazeDistances(self):
+        """
+        The mazeDistances.MazeDistances oracle for this layout, cached by
+        layout text so every game state of a game shares its rows.
+        """
+        if not hasattr(self, 'mazeDistances'):
+            key = "\n".join(self.layoutText)
+            if key not in MAZE_DISTANCES_CACHE:
+                MAZE_DISTANCES_CACHE[key] = MazeDistances(self.getMazeGraph())
+            self.mazeDistances = MAZE_DISTANCES_CACHE[key]
+        return self.mazeDistances
+
+    def getLandmarks(self, count=LANDMARK_COUNT):
+        """
+        The landmarks.Landmarks of this layout, cached by layout text in
+        memory and on disk.
+        """
+        key = ("\n".join(self.layoutText), count)
+        if key not in LANDMARKS_CACHE:
+            LANDMARKS_CACHE[key] = loadLandmarks(key[0], self.getMazeDistances(), count)
+        return LANDMARKS_CACHE[key]
+
+    def getPatternDatabase(self, goalCells, groupSize=GROUP_SIZE):
+        """
+        The patternDatabase.PatternDatabase for visiting goalCells, cached by
+        layout text in memory and on disk.
+        """
+        key = ("\n".join(self.layoutText), tuple(goalCells), groupSize)
+        if key not in PATTERN_DATABASE_CACHE:
+            PATTERN_DATABASE_CACHE[key] = loadPatternDatabase(key[0], self.getMazeDistances(), goalCells, groupSize)
+        return PATTERN_DATABASE_CACHE[key]
+
     def isWall(self, pos):
         x, col = pos
         return self.walls[x][col]
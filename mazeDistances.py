@@ -0,0 +1,121 @@
+"""
+Exact maze distances between the open cells of a layout.
+
+MazeDistances is an all-pairs distance oracle over a mazeGraph.MazeGraph.
+Row r of the matrix holds the breadth-first distance from cell r to every
+cell as a uint16 array.  Rows are computed on first use (or in bulk with
+getRows and computeAll), so a handful of queries costs a handful of BFS
+passes while a long game amortizes to O(1) lookups.  On open layouts, bulk
+rows come from the vectorized sweeps of wavefront.py when NumPy is present.
+
+Get the oracle for a game through GameState.getMazeDistances(), which caches
+it per layout.
+"""
+
+from array import array
+
+import wavefront
+from util import manhattanDistance
+
+UNREACHABLE = 0xFFFF
+# getRows sweeps with NumPy when at least this fraction of the cells are open
+# on all four sides; in winding corridors a Python BFS is faster.
+WAVEFRONT_OPEN_FRACTION = 0.5
+
+
+class MazeDistances:
+    """
+    mazeDistance(a, b) and mazeDistances(source, targets) take (x, y)
+    positions.  Positions that are not on an open grid cell, such as a
+    scared ghost halfway between two cells, fall back to Manhattan distance.
+    Unreachable pairs are float('inf').
+    """
+    def __init__(self, graph):
+        self.graph = graph
+        self.rows = [None] * graph.numCells()
+
+    def getCell(self, pos):
+        "The cell id of pos, or -1 if pos is not an open grid cell."
+        x, y = pos
+        ix, iy = int(x), int(y)
+        if ix != x or iy != y:
+            return -1
+        return self.graph.getCellId((ix, iy))
+
+    def getRow(self, cell):
+        "The uint16 distances from cell to every cell id, computed on first use."
+        row = self.rows[cell]
+        if row is None:
+            row = self.rows[cell] = self._breadthFirst(cell)
+        return row
+
+    def getRows(self, cells):
+        "The rows of every cell in cells, computing the missing ones together."
+        missing = [cell for cell in dict.fromkeys(cells) if self.rows[cell] is None]
+        if len(missing) > 1 and wavefront.numpy is not None and self._isOpen():
+            numpy = wavefront.numpy
+            graph = self.graph
+            walls = numpy.frombuffer(graph.cellIndex, dtype=numpy.int32).reshape(graph.width, graph.height) == -1
+            fields = wavefront.wavefronts(walls, [graph.getPosition(cell) for cell in missing])
+            cellX = numpy.frombuffer(graph.cellX, dtype=numpy.int32)
+            cellY = numpy.frombuffer(graph.cellY, dtype=numpy.int32)
+            # Casting to uint16 turns wavefront.UNREACHABLE (-1) into UNREACHABLE.
+            for cell, field in zip(missing, fields):
+                row = array('H')
+                row.frombytes(field[cellX, cellY].astype(numpy.uint16).tobytes())
+                self.rows[cell] = row
+        return [self.getRow(cell) for cell in cells]
+
+    def computeAll(self):
+        "Fills in every row, i.e. runs a BFS from every open cell."
+        self.getRows(range(len(self.rows)))
+        return self
+
+    def _isOpen(self):
+        graph = self.graph
+        openCells = sum(1 for cell in range(graph.numCells()) if graph.getDegree(cell) == 4)
+        return openCells >= WAVEFRONT_OPEN_FRACTION * graph.numCells()
+
+    def mazeDistance(self, a, b):
+        cellA, cellB = self.getCell(a), self.getCell(b)
+        if cellA == -1 or cellB == -1:
+            return manhattanDistance(a, b)
+        # Distances are symmetric, so prefer a row that already exists.
+        if self.rows[cellA] is None and self.rows[cellB] is not None:
+            cellA, cellB = cellB, cellA
+        distance = self.getRow(cellA)[cellB]
+        return float('inf') if distance == UNREACHABLE else distance
+
+    def mazeDistances(self, source, targets):
+        "The distances from source to each of targets, answered from a single row."
+        cell = self.getCell(source)
+        if cell == -1:
+            return [manhattanDistance(source, target) for target in targets]
+        row = self.getRow(cell)
+        distances = []
+        for target in targets:
+            targetCell = self.getCell(target)
+            if targetCell == -1:
+                distances.append(manhattanDistance(source, target))
+            elif row[targetCell] == UNREACHABLE:
+                distances.append(float('inf'))
+            else:
+                distances.append(row[targetCell])
+        return distances
+
+    def _breadthFirst(self, source):
+        adjacency = self.graph.getAdjacency()
+        row = array('H', [UNREACHABLE]) * len(adjacency)
+        row[source] = 0
+        frontier = [source]
+        distance = 0
+        while frontier:
+            distance += 1
+            nextFrontier = []
+            for cell in frontier:
+                for neighbor in adjacency[cell]:
+                    if row[neighbor] == UNREACHABLE:
+                        row[neighbor] = distance
+                        nextFrontier.append(neighbor)
+            frontier = nextFrontier
+        return row
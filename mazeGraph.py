@@ -0,0 +1,285 @@
+"""
+Compiles the walls of a layout.Layout into a compact adjacency graph.
+
+Every open cell gets an integer id.  Neighbours are stored in CSR form: the
+edges leaving cell c are offsets[c] .. offsets[c + 1] - 1, edge e leads to
+cell targets[e] and is taken with action ACTIONS[edgeActions[e]].  All the
+tables are array.array buffers, so they can also be wrapped without copying
+by numpy.frombuffer.
+
+Compile a graph through Layout.getMazeGraph(), which caches it per layout.
+MazeGraph.getCorridorGraph() further contracts every corridor of degree-2
+cells into one weighted edge between junctions; CorridorProblem searches that
+smaller graph and expands the answer back into single steps.
+MazeGraph.getClusterGraph() builds the clustered abstraction of
+clusterGraph.py for hierarchical (HPA*) search of very large mazes, and
+MazeGraph.getSearchWorkspace() the search.SearchWorkspace that searches over
+cell ids on the layout share.  MazeGraph.getBlockCutTree() finds the
+articulation points of blockCutTree.py, which lets problems skip regions of
+the maze that hold no goal.
+"""
+
+from array import array
+
+from game import Directions
+
+# Edge order matches the order the q1 problems have always listed successors in.
+ACTIONS = (Directions.WEST, Directions.EAST, Directions.NORTH, Directions.SOUTH)
+VECTORS = ((-1, 0), (1, 0), (0, 1), (0, -1))
+
+
+class MazeGraph:
+    """
+    The open cells of a layout and the moves between them.
+
+    cellX, cellY: cell id -> coordinates
+    cellIndex: x * height + y -> cell id, or -1 for a wall
+    offsets, targets, edgeActions: CSR adjacency, see the module docstring
+    """
+    def __init__(self, walls):
+        self.width = walls.width
+        self.height = walls.height
+        self.cellX = array('i')
+        self.cellY = array('i')
+        self.cellIndex = array('i', [-1]) * (self.width * self.height)
+        self.offsets = array('i', [0])
+        self.targets = array('i')
+        self.edgeActions = array('b')
+
+        height = self.height
+        for x in range(self.width):
+            column = walls[x]
+            for y in range(height):
+                if not column[y]:
+                    self.cellIndex[x * height + y] = len(self.cellX)
+                    self.cellX.append(x)
+                    self.cellY.append(y)
+
+        for cell in range(len(self.cellX)):
+            x, y = self.cellX[cell], self.cellY[cell]
+            for direction, (dx, dy) in enumerate(VECTORS):
+                neighbor = self.getCellId((x + dx, y + dy))
+                if neighbor != -1:
+                    self.targets.append(neighbor)
+                    self.edgeActions.append(direction)
+            self.offsets.append(len(self.targets))
+
+        # Successor triples for position-based search problems, built once so
+        # that getSuccessors is a single table lookup.
+        self.positionSuccessors = []
+        for cell in range(len(self.cellX)):
+            self.positionSuccessors.append([(self.getPosition(self.targets[edge]), ACTIONS[self.edgeActions[edge]], 1)
+                                            for edge in range(self.offsets[cell], self.offsets[cell + 1])])
+        self.adjacency = None
+        self.corridorGraph = None
+        self.clusterGraphs = {}
+        self.searchWorkspace = None
+        self.blockCutTree = None
+
+    def numCells(self):
+        return len(self.cellX)
+
+    def getCellId(self, pos):
+        "The id of the open cell at pos, or -1 if pos is a wall or off the board."
+        x, y = pos
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return self.cellIndex[x * self.height + y]
+        return -1
+
+    def getPosition(self, cell):
+        return (self.cellX[cell], self.cellY[cell])
+
+    def getNeighbors(self, cell):
+        "The ids of the cells one move away from cell."
+        return self.targets[self.offsets[cell]:self.offsets[cell + 1]]
+
+    def getAdjacency(self):
+        """
+        The neighbour ids of every cell as a list of lists, for pure-Python
+        graph traversals where list iteration beats slicing the CSR arrays.
+        """
+        if self.adjacency is None:
+            self.adjacency = [list(self.getNeighbors(cell)) for cell in range(self.numCells())]
+        return self.adjacency
+
+    def getCorridorGraph(self):
+        "The maze with its corridors contracted into a CorridorGraph, built on first use."
+        if self.corridorGraph is None:
+            self.corridorGraph = CorridorGraph(self)
+        return self.corridorGraph
+
+    def getClusterGraph(self, clusterSize=10):
+        "The maze cut into clusterSize-wide clusters as a clusterGraph.ClusterGraph, built on first use."
+        if clusterSize not in self.clusterGraphs:
+            from clusterGraph import ClusterGraph
+            self.clusterGraphs[clusterSize] = ClusterGraph(self, clusterSize)
+        return self.clusterGraphs[clusterSize]
+
+    def getSearchWorkspace(self):
+        "The search.SearchWorkspace sized for this maze, built on first use."
+        if self.searchWorkspace is None:
+            from search import SearchWorkspace
+            self.searchWorkspace = SearchWorkspace(self.numCells())
+        return self.searchWorkspace
+
+    def getBlockCutTree(self):
+        "The articulation points and blocks of the maze as a blockCutTree.BlockCutTree, built on first use."
+        if self.blockCutTree is None:
+            from blockCutTree import BlockCutTree
+            self.blockCutTree = BlockCutTree(self)
+        return self.blockCutTree
+
+    def isCanonicalMove(self, cell, arrival, action):
+        """
+        Whether a shortest path that entered cell with the move arrival (None
+        at the start) may leave it with action, under the canonical ordering
+        "horizontal moves before vertical ones".
+
+        After a vertical move a path keeps going the same way, and only turns
+        east or west where a wall beside the cell it came from rules out
+        having made that horizontal move first.  Swapping the two moves of
+        any other turn gives a path as short, so every cell keeps at least
+        one shortest path, and the many shortest paths across an open room
+        collapse into one.
+        """
+        if arrival != Directions.NORTH and arrival != Directions.SOUTH:
+            return True
+        if action == arrival:
+            return True
+        if action != Directions.EAST and action != Directions.WEST:
+            return False
+        dx = 1 if action == Directions.EAST else -1
+        dy = 1 if arrival == Directions.NORTH else -1
+        return self.getCellId((self.cellX[cell] + dx, self.cellY[cell] - dy)) == -1
+
+    def getDegree(self, cell):
+        return self.offsets[cell + 1] - self.offsets[cell]
+
+    def getCellSuccessors(self, cell):
+        "(neighbor id, action, 1) for every move out of cell."
+        targets = self.targets
+        edgeActions = self.edgeActions
+        return [(targets[edge], ACTIONS[edgeActions[edge]], 1) for edge in range(self.offsets[cell], self.offsets[cell + 1])]
+
+    def getSuccessors(self, pos):
+        """
+        ((x, y), action, 1) for every move out of the open cell pos.  The list
+        is shared between calls and must not be modified.
+        """
+        return self.positionSuccessors[self.cellIndex[pos[0] * self.height + pos[1]]]
+
+
+class CorridorGraph:
+    """
+    A MazeGraph with every corridor (chain of degree-2 cells) contracted
+    into a single weighted edge between its two end cells.
+
+    Junctions, dead ends and any cell listed in keep are the nodes of the
+    contracted graph.  Edge e leaves its junction, walks through the
+    interior cells edgeCells[e] with the moves edgeActions[e] and ends at
+    junction edgeTarget[e]; its cost is len(edgeActions[e]).  Every corridor
+    is stored once in each direction.  cellEdges maps an interior cell to
+    the (edge, offset) pairs whose edgeCells[edge][offset] it is.
+
+    Build it through MazeGraph.getCorridorGraph(), which caches it.
+    """
+    def __init__(self, graph, keep=()):
+        self.graph = graph
+        numCells = graph.numCells()
+        adjacency = graph.getAdjacency()
+        self.isJunction = bytearray(numCells)
+        for cell in range(numCells):
+            if len(adjacency[cell]) != 2:
+                self.isJunction[cell] = 1
+        for cell in keep:
+            self.isJunction[cell] = 1
+
+        self.outEdges = {}
+        self.edgeTarget = []
+        self.edgeCells = []
+        self.edgeActions = []
+        self.cellEdges = {}
+
+        for cell in range(numCells):
+            if self.isJunction[cell]:
+                self._walkFrom(cell)
+        # A loop made only of degree-2 cells has no junction to start from:
+        # promote one of its cells and walk the loop from there.
+        for cell in range(numCells):
+            if not self.isJunction[cell] and cell not in self.cellEdges:
+                self.isJunction[cell] = 1
+                self._walkFrom(cell)
+
+    def _walkFrom(self, junction):
+        graph = self.graph
+        edges = self.outEdges.setdefault(junction, [])
+        for first in range(graph.offsets[junction], graph.offsets[junction + 1]):
+            previous, current = junction, graph.targets[first]
+            cells, actions = [], [ACTIONS[graph.edgeActions[first]]]
+            while not self.isJunction[current]:
+                cells.append(current)
+                for edge in range(graph.offsets[current], graph.offsets[current + 1]):
+                    if graph.targets[edge] != previous:
+                        break
+                previous, current = current, graph.targets[edge]
+                actions.append(ACTIONS[graph.edgeActions[edge]])
+            edge = len(self.edgeTarget)
+            edges.append(edge)
+            self.edgeTarget.append(current)
+            self.edgeCells.append(tuple(cells))
+            self.edgeActions.append(tuple(actions))
+            for offset, cell in enumerate(cells):
+                self.cellEdges.setdefault(cell, []).append((edge, offset))
+
+    def numJunctions(self):
+        return len(self.outEdges)
+
+
+class CorridorProblem:
+    """
+    A point-to-point or nearest-goal search problem over a CorridorGraph.
+
+    States are cell ids.  A start or goal cell that lies inside a corridor is
+    spliced into that corridor at query time, so the cached contraction is
+    shared by every query on the layout.  Each successor's action is the
+    tuple of moves along the corridor; expandActions flattens a solution
+    back into the per-step Directions list.
+    """
+    def __init__(self, corridors, start, goals):
+        self.corridors = corridors
+        self.start = start
+        self.goals = set(goals)
+        self.integerCosts = True
+        # Goals inside corridors, listed per edge in walking order.
+        self.edgeGoals = {}
+        for goal in self.goals:
+            for edge, offset in corridors.cellEdges.get(goal, ()):
+                self.edgeGoals.setdefault(edge, []).append((offset, goal))
+        for goalsOnEdge in self.edgeGoals.values():
+            goalsOnEdge.sort()
+
+    def getStartState(self):
+        return self.start
+
+    def isGoalState(self, state):
+        return state in self.goals
+
+    def getSuccessors(self, state):
+        corridors = self.corridors
+        edgeGoals = self.edgeGoals
+        successors = []
+        if state in corridors.outEdges:
+            walks = [(edge, -1) for edge in corridors.outEdges[state]]
+        else:
+            walks = corridors.cellEdges[state]
+        for edge, offset in walks:
+            actions = corridors.edgeActions[edge]
+            for goalOffset, goal in edgeGoals.get(edge, ()):
+                if goalOffset > offset:
+                    successors.append((goal, actions[offset + 1:goalOffset + 1], goalOffset - offset))
+                    break
+            successors.append((corridors.edgeTarget[edge], actions[offset + 1:], len(actions) - offset - 1))
+        return successors
+
+    def expandActions(self, actions):
+        return [step for corridor in actions for step in corridor]
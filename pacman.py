@@ -201,6 +201,37 @@ class GameState:
         """
         return self.data.layout.walls
 
+    def getMazeGraph(self):
+        """
+        Returns the walls compiled into a mazeGraph.MazeGraph: integer cell ids
+        and CSR adjacency arrays, cached per layout.
+        """
+        return self.data.layout.getMazeGraph()
+
+    def getMazeDistances(self):
+        """
+        Returns the layout's mazeDistances.MazeDistances oracle.  Use
+        getMazeDistances().mazeDistance(a, b) for the true length of the
+        shortest path between two positions, in place of manhattanDistance.
+        """
+        return self.data.layout.getMazeDistances()
+
+    def getLandmarks(self):
+        """
+        Returns the layout's landmarks.Landmarks: exact distances from a few
+        landmark cells, whose estimate(a, b) is an admissible lower bound on
+        the maze distance between two cell ids.
+        """
+        return self.data.layout.getLandmarks()
+
+    def getPatternDatabase(self, goalCells):
+        """
+        Returns the layout's patternDatabase.PatternDatabase for visiting the
+        cell ids goalCells, whose estimate(cell, remaining) bounds the cost of
+        visiting the goals whose bits are set in remaining.
+        """
+        return self.data.layout.getPatternDatabase(goalCells)
+
     def hasFood(self, x, y):
         return self.data.food[x][y]
 
@@ -0,0 +1,392 @@
+"""
+Hash-distributed A* (HDA*, Kishimoto, Fukunaga and Botea 2009) over
+worker processes.
+
+Every state is owned by worker hash(state) % workers, or by the hash of a
+part of it (see hda_owner).  Each worker keeps the open list, best costs
+and parent links of the states it owns, expands its own best node, and
+sends every successor owned by another worker to that worker's inbox,
+batched per destination.  Workers report goals they
+expand to the coordinator, which keeps the cheapest as the incumbent and
+broadcasts its cost as a bound; nodes whose f reaches the bound are never
+expanded.
+
+The search is over, with an optimal incumbent, once every worker is idle
+(nothing below the bound left to expand) and no batch of successors is in
+flight.  Workers count the batches they send and receive; the coordinator
+only trusts a quiet, balanced set of counts after a second wave of probes
+returns exactly the same counts, so a batch that was in transit during the
+first wave cannot be missed.
+
+Workers are forked, so the problem and heuristic are inherited rather than
+pickled and any problem of the q1 solvers plugs in unchanged; only states
+and actions travel between processes and must be picklable.  hash() of
+ints and tuples of ints agrees across the workers, as it must.
+
+Workers may order their open lists by g + weight * h for weight > 1, which
+finds a first incumbent much sooner; the bound still prunes by the
+admissible f = g + h, so a search that runs to the end is optimal all the
+same.  Given a deadline, workers stop expanding at it and the search ends
+with the best incumbent so far.
+
+hda_initialise starts the workers and hda_loop_body handles one message
+from them per call, returning (terminate, actions) like search_loop_body.
+Call hda_close when done, also after an exception, to stop the workers.
+
+Forking needs a POSIX system.  Where multiprocessing has no fork start
+method (Windows), hda_initialise falls back to one sequential A* in the
+calling process, which hda_loop_body then runs a node per call.
+"""
+
+import heapq
+import multiprocessing
+import queue
+import time
+
+from search import nullHeuristic, search_initialise, search_loop_body
+
+# Successors are sent on in batches of up to this many states, and a busy
+# worker flushes its batches and reads its inbox every this many expansions.
+BATCH_SIZE = 64
+
+
+class HDAData:
+    """
+    The coordinator's view of an HDA* search.
+
+    statuses: worker -> (idle, batches sent, batches received) as last reported
+    probe: the id of the probe wave in flight, replies its answers so far,
+      snapshot the counts it must confirm
+    sequential: the SearchData of the in-process A* run instead of the
+      workers when fork is unavailable, else None
+    complete: whether the search ran to the end, proving the incumbent
+      optimal (for weight 1) or that there is no path, rather than stopping
+      at the deadline
+    """
+    def __init__(self, start, workers, weight=1, deadline=None):
+        self.start = start
+        self.workers = workers
+        self.weight = weight
+        self.deadline = deadline
+        self.complete = False
+        self.processes = []
+        self.inboxes = []
+        self.outbox = None
+        self.statuses = {}
+        self.probe = 0
+        self.replies = None
+        self.snapshot = None
+        self.incumbent = float('inf')
+        self.goalState = None
+        self.actions = []
+        self.expansions = 0
+        self.workerExpansions = []
+        self.sequential = None
+        self.partition = None
+
+
+def hda_initialise(problem, start=None, heuristic=nullHeuristic, workers=4, goalTest=None, weight=1, deadline=None,
+                   partition=None):
+    """
+    Forks workers processes and starts an HDA* search of problem from start
+    (problem.getStartState() by default), or a sequential A* where fork is
+    unavailable.
+
+    heuristic: admissible function (state, problem) -> estimated cost to the goal
+    goalTest: function state -> bool, problem.isGoalState by default
+    weight: workers expand by g + weight * h.  Above 1 the first goals come
+      much sooner; the search goes on, pruning by the admissible g + h
+      against the incumbent and reopening nodes reached more cheaply, until
+      it has proven the incumbent optimal or runs out of time.
+    deadline: a time.time() at which the workers stop expanding and the
+      search ends with the best incumbent so far, if any
+    partition: function state -> the part of the state that decides its
+      owner, the whole state by default; see hda_owner
+    """
+    if start is None: start = problem.getStartState()
+    if goalTest is None: goalTest = problem.isGoalState
+    hdaData = HDAData(start, workers, weight, deadline)
+    hdaData.partition = partition
+    try:
+        context = multiprocessing.get_context('fork')
+    except ValueError:
+        hdaData.sequential = search_initialise(problem, start, heuristic, weight, goalTest=goalTest)
+        return hdaData
+    hdaData.inboxes = [context.Queue() for _ in range(workers)]
+    hdaData.outbox = context.Queue()
+    for index in range(workers):
+        process = context.Process(target=hda_worker, daemon=True,
+                                  args=(index, problem, start, heuristic, goalTest, weight, deadline, partition,
+                                        hdaData.inboxes, hdaData.outbox))
+        process.start()
+        hdaData.processes.append(process)
+    return hdaData
+
+
+def hda_loop_body(problem, hdaData: HDAData):
+    """
+    Handles one message from the workers.  Returns (True, actions) once the
+    incumbent is proven optimal, and (True, []) with goalState None if the
+    problem has no solution.  At the deadline it returns the incumbent, or
+    [] with goalState None if there is none yet; complete then stays False.
+    """
+    if hdaData.sequential is not None:
+        return hda_sequential_loop_body(problem, hdaData)
+    try:
+        timeout = None if hdaData.deadline is None else max(0.0, hdaData.deadline - time.time())
+        message = hdaData.outbox.get(timeout=timeout)
+    except queue.Empty:
+        # Out of time: take any goals already reported, then collect the best.
+        while True:
+            try:
+                message = hdaData.outbox.get_nowait()
+            except queue.Empty:
+                return hda_finish(hdaData)
+            if message[0] == 'goal':
+                hda_goal(hdaData, message)
+    kind = message[0]
+    if kind == 'goal':
+        hda_goal(hdaData, message)
+    elif kind == 'status':
+        _, index, idle, sent, received = message
+        hdaData.statuses[index] = (idle, sent, received)
+        # Looks finished: confirm with a probe wave.
+        hda_start_probe(hdaData)
+    elif kind == 'probe':
+        _, index, probe, idle, sent, received = message
+        if probe == hdaData.probe and hdaData.replies is not None:
+            hdaData.replies[index] = (idle, sent, received)
+            if len(hdaData.replies) == hdaData.workers:
+                replies, hdaData.replies = hdaData.replies, None
+                if hda_quiet(hdaData, replies) and replies == hdaData.snapshot:
+                    hdaData.complete = hdaData.deadline is None or time.time() < hdaData.deadline
+                    return hda_finish(hdaData)
+                # Something moved in between; the statuses may be quiet again already.
+                hda_start_probe(hdaData)
+    return (False, hdaData.actions)
+
+
+def hda_owner(partition, state, workers):
+    """
+    The worker that owns state.  Hashing only part of the state, such as the
+    food left, keeps most moves with the worker that made them, so a path
+    changes hands only where that part changes instead of at nearly every
+    step (abstract hashing, Jinnai and Fukunaga 2016).
+    """
+    return hash(state if partition is None else partition(state)) % workers
+
+
+def hda_goal(hdaData: HDAData, message):
+    "Keeps a reported goal if it beats the incumbent, and sends its cost to the workers as the bound."
+    _, cost, state = message
+    if cost < hdaData.incumbent:
+        hdaData.incumbent = cost
+        hdaData.goalState = state
+        for inbox in hdaData.inboxes:
+            inbox.put(('bound', cost))
+
+
+def hda_sequential_loop_body(problem, hdaData: HDAData):
+    "Expands one node of the in-process A* that stands in for the workers without fork."
+    searchData = hdaData.sequential
+    if hdaData.deadline is not None and time.time() >= hdaData.deadline:
+        terminate, actions = True, []
+    else:
+        terminate, actions = search_loop_body(problem, searchData)
+        hdaData.complete = terminate
+    if terminate:
+        hdaData.goalState = searchData.goalState
+        hdaData.actions = actions
+        hdaData.expansions = searchData.expansions
+        hdaData.workerExpansions = [searchData.expansions]
+    return (terminate, actions)
+
+
+def hda_start_probe(hdaData: HDAData):
+    "Sends a probe wave if the last statuses look finished and none is in flight."
+    if hdaData.replies is None and hda_quiet(hdaData, hdaData.statuses):
+        hdaData.probe += 1
+        hdaData.replies = {}
+        hdaData.snapshot = dict(hdaData.statuses)
+        for inbox in hdaData.inboxes:
+            inbox.put(('probe', hdaData.probe))
+
+
+def hda_quiet(hdaData: HDAData, statuses):
+    "Whether statuses has every worker idle and every batch sent also received."
+    if len(statuses) < hdaData.workers or not all(idle for idle, _, _ in statuses.values()):
+        return False
+    return sum(sent for _, sent, _ in statuses.values()) == sum(received for _, _, received in statuses.values())
+
+
+def hda_finish(hdaData: HDAData):
+    "Collects the path to the incumbent from the workers that own its states."
+    if hdaData.goalState is not None:
+        state = hdaData.goalState
+        segments = []
+        while state is not None:
+            hdaData.inboxes[hda_owner(hdaData.partition, state, hdaData.workers)].put(('trace', state))
+            message = hdaData.outbox.get()
+            while message[0] != 'trace':
+                message = hdaData.outbox.get()
+            _, actions, state = message
+            segments.append(actions)
+        hdaData.actions = [action for segment in reversed(segments) for action in segment]
+    for inbox in hdaData.inboxes:
+        inbox.put(('stop',))
+    hdaData.workerExpansions = [0] * hdaData.workers
+    for _ in range(hdaData.workers):
+        message = hdaData.outbox.get()
+        while message[0] != 'stopped':
+            message = hdaData.outbox.get()
+        hdaData.workerExpansions[message[1]] = message[2]
+    hdaData.expansions = sum(hdaData.workerExpansions)
+    hda_close(hdaData)
+    return (True, hdaData.actions)
+
+
+def hda_close(hdaData: HDAData):
+    for process in hdaData.processes:
+        if process.is_alive():
+            process.terminate()
+        process.join()
+    hdaData.processes = []
+
+
+def hda_search(problem, start=None, **options):
+    """
+    Runs hda_loop_body to completion and returns the finished HDAData.
+    Keyword options are those of hda_initialise.
+    """
+    hdaData = hda_initialise(problem, start, **options)
+    try:
+        terminate = False
+        while not terminate:
+            terminate, _ = hda_loop_body(problem, hdaData)
+    finally:
+        hda_close(hdaData)
+    return hdaData
+
+
+def hda_worker(index, problem, start, heuristic, goalTest, weight, deadline, partition, inboxes, outbox):
+    "The main loop of worker index, which owns the states s with hda_owner(partition, s, workers) == index."
+    workers = len(inboxes)
+    inbox = inboxes[index]
+    frontier = []
+    best = {}
+    parent = {}
+    bound = float('inf')
+    sent = received = expansions = 0
+    count = 0
+    batches = [[] for _ in range(workers)]
+    reported = False
+    expired = False
+    # The inbox is drained when idle, and otherwise only every BATCH_SIZE
+    # expansions, when this worker's own batches go out: a lock per expansion
+    # would cost more than the slightly stale bound and states it saves.
+    poll = True
+
+    def insert(state, g, parentState, action):
+        nonlocal count
+        if g < best.get(state, float('inf')):
+            best[state] = g
+            parent[state] = (parentState, action)
+            count += 1
+            # Among equal priority, deeper nodes first: they reach a goal, and with it a bound, sooner.
+            h = heuristic(state, problem)
+            heapq.heappush(frontier, (g + weight * h, -g, count, state, g + h))
+
+    def idle():
+        "Whether nothing below the bound is left to expand, or time is up."
+        if expired:
+            return True
+        if weight == 1:
+            # Ordered by f, so the top node decides.
+            return not frontier or frontier[0][0] >= bound
+        while frontier and frontier[0][4] >= bound:
+            heapq.heappop(frontier)
+        return not frontier
+
+    def flush():
+        nonlocal sent
+        for owner, batch in enumerate(batches):
+            if batch:
+                inboxes[owner].put(('states', batch))
+                batches[owner] = []
+                sent += 1
+
+    if hda_owner(partition, start, workers) == index:
+        insert(start, 0, None, None)
+
+    while True:
+        if idle():
+            flush()
+            if not reported:
+                outbox.put(('status', index, True, sent, received))
+                reported = True
+            message = inbox.get()
+        elif poll:
+            try:
+                message = inbox.get_nowait()
+            except queue.Empty:
+                message = None
+                poll = False
+        else:
+            message = None
+
+        if message is not None:
+            kind = message[0]
+            if kind == 'states':
+                received += 1
+                reported = False
+                for state, g, parentState, action in message[1]:
+                    insert(state, g, parentState, action)
+            elif kind == 'bound':
+                bound = min(bound, message[1])
+            elif kind == 'probe':
+                flush()
+                outbox.put(('probe', index, message[1], idle(), sent, received))
+            elif kind == 'trace':
+                # Follow parent links for as long as this worker owns the states.
+                state = message[1]
+                actions = []
+                while True:
+                    parentState, action = parent[state]
+                    if parentState is None:
+                        state = None
+                        break
+                    actions.append(action)
+                    state = parentState
+                    if hda_owner(partition, state, workers) != index:
+                        break
+                actions.reverse()
+                outbox.put(('trace', actions, state))
+            elif kind == 'stop':
+                outbox.put(('stopped', index, expansions))
+                return
+            continue
+
+        _, g, _, state, f = heapq.heappop(frontier)
+        g = -g
+        if g > best[state] or f >= bound:
+            continue
+        if goalTest(state):
+            bound = min(bound, g)
+            outbox.put(('goal', g, state))
+            continue
+        expansions += 1
+        for successor, action, stepCost in problem.getSuccessors(state):
+            owner = hash(successor if partition is None else partition(successor)) % workers
+            if owner == index:
+                insert(successor, g + stepCost, state, action)
+            else:
+                batch = batches[owner]
+                batch.append((successor, g + stepCost, state, action))
+                if len(batch) >= BATCH_SIZE:
+                    inboxes[owner].put(('states', batch))
+                    batches[owner] = []
+                    sent += 1
+        if expansions % BATCH_SIZE == 0:
+            flush()
+            poll = True
+            expired = deadline is not None and time.time() >= deadline
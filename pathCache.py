@@ -0,0 +1,75 @@
+"""
+Remembers the paths SearchAgent finds, so unchanged mazes are never solved
+twice.
+
+An entry is keyed by everything that determines the path: the layout text,
+Pacman's start, the food, the problem class, the search function and its -a
+options, the startup time budget (anytime solvers find better paths with
+more time) and a digest of the source of the solver, the problem and every
+module of this repository they have imported.  Editing any of that code
+therefore misses the cache instead of replaying a stale path.
+
+Entries keep the actions, their cost, the node expansions the solver
+reported and everything it printed, so a hit reproduces the output of the
+original run.  The store is a diskCache.DiskCache under .cache/paths.
+
+SearchAgent only uses the cache when run with -a pathCache=1, and never for
+solvers whose path depends on timing rather than on the key alone.
+"""
+
+import hashlib
+import os
+import re
+import sys
+
+from diskCache import DiskCache, contentKey
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIRECTORY = os.path.join(ROOT, '.cache', 'paths')
+MAX_BYTES = 32 * 2**20
+
+EXPANSIONS_PATTERN = re.compile(r'Number of node expansions: (\d+)')
+
+
+def sourceDigest(*functions):
+    """
+    A digest of the files defining functions plus every module imported from
+    this repository, i.e. of all the code a search could have run.
+    """
+    files = {function.__code__.co_filename for function in functions}
+    for module in list(sys.modules.values()):
+        filename = getattr(module, '__file__', None)
+        if filename and os.path.abspath(filename).startswith(ROOT + os.sep):
+            files.add(filename)
+    digest = hashlib.sha256()
+    for filename in sorted(os.path.abspath(name) for name in files):
+        digest.update(os.path.relpath(filename, ROOT).encode('utf-8'))
+        try:
+            with open(filename, 'rb') as file:
+                digest.update(file.read())
+        except OSError:
+            pass
+    return digest.hexdigest()
+
+
+class PathCache(DiskCache):
+    def __init__(self, directory=CACHE_DIRECTORY, maxBytes=MAX_BYTES):
+        DiskCache.__init__(self, directory, maxBytes)
+        self.digests = {}
+
+    def keyFor(self, state, problemClass, searchFunction, options, budget):
+        "The key of the path searchFunction finds for problemClass(state)."
+        functions = (searchFunction, problemClass.__init__)
+        if functions not in self.digests:
+            self.digests[functions] = sourceDigest(*functions)
+        return contentKey('\n'.join(state.data.layout.layoutText), state.getPacmanPosition(),
+                          sorted(state.getFood().asList()), problemClass.__name__, searchFunction.__name__,
+                          sorted(options.items()), budget, self.digests[functions])
+
+    def makeEntry(self, actions, output, seconds):
+        match = EXPANSIONS_PATTERN.search(output)
+        return {'actions': list(actions),
+                'cost': len(actions),
+                'expansions': int(match.group(1)) if match else None,
+                'output': output,
+                'seconds': seconds}
@@ -0,0 +1,99 @@
+"""
+Answers many shortest-path queries on one layout at once.
+
+    from layout import getLayout
+    from pathQueries import batchPaths
+    results = batchPaths(getLayout('q1a_bigMaze'), [((35, 1), (1, 35)), ((35, 1), (1, 1))])
+    for actions, cost in results: ...
+
+Queries are grouped by start.  Every group is answered from one
+breadth-first distance row of the layout's MazeDistances oracle (all moves
+cost 1, so this is the Dijkstra tree of the start): each path is read off
+by walking from the goal down the row back to the start.  The rows and the
+maze graph are the ones cached with the layout, so repeated batches on the
+same layout do no preprocessing at all.
+
+With processes > 1 the groups are shared out over a multiprocessing pool;
+each worker compiles the layout once and answers whole groups.
+"""
+
+import multiprocessing
+
+from game import Directions
+from layout import Layout
+from mazeDistances import UNREACHABLE
+from mazeGraph import ACTIONS
+
+# Groups handed to a worker at a time.
+CHUNK_SIZE = 8
+
+
+def batchPaths(layout: Layout, pairs, processes=None):
+    """
+    Returns one (actions, cost) per (start, goal) pair of positions, in the
+    order given.  actions is None and cost float('inf') when the goal
+    cannot be reached; a start or goal on a wall raises ValueError.
+
+    processes: worker processes to spread the groups over; None or 1 answers
+      them in this process
+    """
+    pairs = list(pairs)
+    graph = layout.getMazeGraph()
+    groups = {}
+    for index, (start, goal) in enumerate(pairs):
+        for position in (start, goal):
+            if graph.getCellId(position) == -1:
+                raise ValueError('%s is not an open cell of the layout' % (position,))
+        groups.setdefault(start, []).append((index, goal))
+
+    work = [(start, [goal for _, goal in queries]) for start, queries in groups.items()]
+    if processes is not None and processes > 1 and len(work) > 1:
+        with multiprocessing.Pool(processes, initializer=_initialiseWorker, initargs=(layout.layoutText,)) as pool:
+            answers = pool.map(_answerGroup, work, CHUNK_SIZE)
+    else:
+        answers = [answerGroup(layout, start, goals) for start, goals in work]
+
+    results = [None] * len(pairs)
+    for queries, groupAnswers in zip(groups.values(), answers):
+        for (index, _), answer in zip(queries, groupAnswers):
+            results[index] = answer
+    return results
+
+
+def answerGroup(layout: Layout, start, goals):
+    "(actions, cost) from start to each of goals, all read off one distance row."
+    graph = layout.getMazeGraph()
+    row = layout.getMazeDistances().getRow(graph.getCellId(start))
+    offsets, targets, edgeActions = graph.offsets, graph.targets, graph.edgeActions
+    answers = []
+    for goal in goals:
+        cell = graph.getCellId(goal)
+        distance = row[cell]
+        if distance == UNREACHABLE:
+            answers.append((None, float('inf')))
+            continue
+        # Walk back to the start through neighbours one move closer to it.
+        reversedActions = []
+        while distance > 0:
+            for edge in range(offsets[cell], offsets[cell + 1]):
+                if row[targets[edge]] == distance - 1:
+                    break
+            reversedActions.append(Directions.REVERSE[ACTIONS[edgeActions[edge]]])
+            cell = targets[edge]
+            distance -= 1
+        reversedActions.reverse()
+        answers.append((reversedActions, len(reversedActions)))
+    return answers
+
+
+_workerLayout = None
+
+
+def _initialiseWorker(layoutText):
+    global _workerLayout
+    _workerLayout = Layout(layoutText)
+
+
+def _answerGroup(group):
+    start, goals = group
+    return answerGroup(_workerLayout, start, goals)
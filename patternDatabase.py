@@ -0,0 +1,100 @@
+"""
+Pattern databases for problems that visit a set of goal cells in any order.
+
+The goals are split into groups of at most groupSize.  For each group the
+subproblem "visit exactly these goals of the group, starting from this
+cell" is solved exactly for every cell and every subset of the group, and
+the costs are kept as one uint16 table per group:
+
+    table[subset * numCells + cell] = min over goals i in subset of
+        d(cell, goal i) + the shortest walk from goal i through the rest of subset
+
+Visiting all the goals visits every group's goals, so each table lookup is
+an admissible heuristic, the max over groups is one too, and with a single
+group it is the exact remaining cost.  Lookups are O(1) per group.
+
+Get a database through GameState.getPatternDatabase(), which caches it with
+the layout in memory and under .cache/patterns on disk, so only the first
+solve of a layout pays for the tables.
+"""
+
+import os
+from array import array
+
+from diskCache import DiskCache, contentKey
+from mazeDistances import UNREACHABLE
+
+GROUP_SIZE = 8
+CACHE_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'patterns')
+# Bump when the tables or their layout change, to retire old entries.
+CACHE_VERSION = 1
+
+
+class PatternDatabase:
+    """
+    goalCells: the goal cell ids; bit i of a mask stands for goalCells[i]
+    groups: (first bit, number of bits, table) for each group of goals
+    """
+    def __init__(self, numCells, goalCells, groups):
+        self.numCells = numCells
+        self.goalCells = goalCells
+        self.groups = groups
+
+    @classmethod
+    def build(cls, distances, goalCells, groupSize=GROUP_SIZE):
+        numCells = distances.graph.numCells()
+        groups = []
+        for first in range(0, len(goalCells), groupSize):
+            cells = goalCells[first:first + groupSize]
+            groups.append((first, len(cells), buildTable(distances.getRows(cells), cells, numCells)))
+        return cls(numCells, goalCells, groups)
+
+    def estimate(self, cell, remaining):
+        "A lower bound on the cost of visiting every goal in the mask remaining from cell."
+        best = 0
+        numCells = self.numCells
+        for first, size, table in self.groups:
+            value = table[((remaining >> first) & ((1 << size) - 1)) * numCells + cell]
+            if value > best:
+                best = value
+        return best
+
+
+def buildTable(rows, cells, numCells):
+    "The table of one group, given the BFS rows of its goal cells."
+    count = len(cells)
+    # walks[mask][i]: the shortest walk that starts on goal i and visits every goal in mask.
+    walks = [[0] * count for _ in range(1 << count)]
+    for mask in range(1, 1 << count):
+        for i in range(count):
+            rest = mask & ~(1 << i)
+            if not mask & (1 << i) or not rest:
+                continue
+            walks[mask][i] = min(rows[i][cells[j]] + walks[rest][j] for j in range(count) if rest & (1 << j))
+    table = array('H', bytes(2 * numCells))
+    for mask in range(1, 1 << count):
+        best = None
+        for i in range(count):
+            if mask & (1 << i):
+                walk = walks[mask][i]
+                costs = [distance + walk for distance in rows[i]]
+                best = costs if best is None else list(map(min, best, costs))
+        table.extend(cost if cost < UNREACHABLE else UNREACHABLE for cost in best)
+    return table
+
+
+def loadPatternDatabase(layoutText, distances, goalCells, groupSize=GROUP_SIZE):
+    "The database for goalCells, read from the disk cache or built and stored there."
+    cache = DiskCache(CACHE_DIRECTORY)
+    key = contentKey('pattern database', CACHE_VERSION, layoutText, tuple(goalCells), groupSize)
+    stored = cache.get(key)
+    if stored is not None:
+        groups = []
+        for first, size, data in stored:
+            table = array('H')
+            table.frombytes(data)
+            groups.append((first, size, table))
+        return PatternDatabase(distances.graph.numCells(), list(goalCells), groups)
+    database = PatternDatabase.build(distances, list(goalCells), groupSize)
+    cache.put(key, [(first, size, table.tobytes()) for first, size, table in database.groups])
+    return database
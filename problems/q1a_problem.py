@@ -27,11 +27,30 @@ class q1a_problem:
 
         gameState: A GameState object (pacman.py)
         costFn: A function from a search state (tuple) to a non-negative number
+        integerCosts: Every step cost is an integer, so solvers may use a bucket queue
+        graph: The layout's walls compiled into a mazeGraph.MazeGraph
         goal: A position in the gameState
+        prunedCells: How many cells getSuccessors never leads into, because
+          they lie in food-free regions (see blockCutTree.py) or are unreachable
         """
         self.startingGameState: GameState = gameState
         self.costFn = 0
+        self.integerCosts = True
+        self.graph = gameState.getMazeGraph()
         self.goal = (0, 0)
+        graph = self.graph
+        relevant = graph.getBlockCutTree().relevantCells(graph.getCellId(gameState.getPacmanPosition()),
+                                                          [graph.getCellId(food) for food in gameState.getFood().asList()])
+        self.prunedCells = len(relevant) - sum(relevant)
+        # Successor lists of the cells that border a pruned region; every other
+        # cell keeps the graph's shared list.
+        self.prunedSuccessors = {}
+        for cell in range(graph.numCells()):
+            if relevant[cell]:
+                successors = graph.getSuccessors(graph.getPosition(cell))
+                kept = [successor for successor in successors if relevant[graph.getCellId(successor[0])]]
+                if len(kept) < len(successors):
+                    self.prunedSuccessors[graph.getPosition(cell)] = kept
 
     @log_function
     def getStartState(self):
@@ -53,20 +72,15 @@ class q1a_problem:
          required to get there, and 'stepCost' is the incremental
          cost of expanding to that successor
         """
-        # ------------------------------------------
-        "*** YOUR CODE HERE ***"
-        successors = []
+        successors = self.prunedSuccessors.get(state)
+        if successors is None:
+            return self.graph.getSuccessors(state)
+        return successors
 
-        if not self.startingGameState.hasWall(state[0] - 1, state[1]):
-            successors.append(((state[0] - 1, state[1]), 'West', 1))
-        
-        if not self.startingGameState.hasWall(state[0] + 1, state[1]):
-            successors.append(((state[0] + 1, state[1]), 'East', 1))
-        
-        if not self.startingGameState.hasWall(state[0], state[1] + 1):
-            successors.append(((state[0], state[1] + 1), 'North', 1))
-        
-        if not self.startingGameState.hasWall(state[0], state[1] - 1):
-            successors.append(((state[0], state[1] - 1), 'South', 1))
-        
-        return successors
\ No newline at end of file
+    def isCanonicalMove(self, state, arrival, action):
+        """
+        Whether a path that reached state with the move arrival may go on with
+        action under the canonical ordering of MazeGraph.isCanonicalMove;
+        pass it as the canonical option of search.search_initialise.
+        """
+        return self.graph.isCanonicalMove(self.graph.getCellId(state), arrival, action)
\ No newline at end of file
@@ -5,6 +5,7 @@ from typing import Tuple
 import util
 from game import Actions, Agent, Directions
 from logs.search_logger import log_function
+from mazeDistances import UNREACHABLE
 from pacman import GameState
 
 
@@ -12,7 +13,8 @@ class q1b_problem:
     """
     This search problem finds paths through all four corners of a layout.
 
-    You must select a suitable state space and successor function
+    A state is (cell, visited): the mazeGraph cell id of Pacman and a bit mask
+    with bit i set once corners[i] has been visited.
     """
     def __str__(self):
         return str(self.__class__.__module__)
@@ -23,21 +25,32 @@ class q1b_problem:
 
         gameState: A GameState object (pacman.py)
         costFn: A function from a search state (tuple) to a non-negative number
-        goal: A position in the gameState
+        integerCosts: Every step cost is an integer, so solvers may use a bucket queue
+        graph: The layout's walls compiled into a mazeGraph.MazeGraph
+        start: The cell id Pacman starts on
+        corners: The positions of the food Pacman can reach, one mask bit each
+        cornerBits: Cell id -> mask bit, for the corner cells
+        allCorners: The mask with every corner visited
         """
         self.startingGameState: GameState = gameState
         self.costFn = 0
-        self.goal = None
+        self.integerCosts = True
+        self.graph = gameState.getMazeGraph()
+        self.start = self.graph.getCellId(gameState.getPacmanPosition())
+        # Food walled off from Pacman can never be eaten, so it is not a corner.
+        startDistances = gameState.getMazeDistances().getRow(self.start)
+        self.corners = [food for food in gameState.getFood().asList()
+                        if startDistances[self.graph.getCellId(food)] != UNREACHABLE]
+        self.cornerBits = {self.graph.getCellId(corner): 1 << i for i, corner in enumerate(self.corners)}
+        self.allCorners = (1 << len(self.corners)) - 1
 
     @log_function
     def getStartState(self):
-        "*** YOUR CODE HERE ***"
-        return self.startingGameState
+        return (self.start, self.cornerBits.get(self.start, 0))
 
     @log_function
     def isGoalState(self, state):
-        "*** YOUR CODE HERE ***"
-        return self.startingGameState.hasFood(state[0], state[1])
+        return state[1] == self.allCorners
 
     @log_function
     def getSuccessors(self, state):
@@ -51,19 +64,7 @@ class q1b_problem:
          required to get there, and 'stepCost' is the incremental
          cost of expanding to that successor
         """
-        "*** YOUR CODE HERE ***"
-        successors = []
-
-        if not self.startingGameState.hasWall(state[0] - 1, state[1]):
-            successors.append(((state[0] - 1, state[1]), 'West', 1))
-        
-        if not self.startingGameState.hasWall(state[0] + 1, state[1]):
-            successors.append(((state[0] + 1, state[1]), 'East', 1))
-        
-        if not self.startingGameState.hasWall(state[0], state[1] + 1):
-            successors.append(((state[0], state[1] + 1), 'North', 1))
-        
-        if not self.startingGameState.hasWall(state[0], state[1] - 1):
-            successors.append(((state[0], state[1] - 1), 'South', 1))
-        
-        return successors
\ No newline at end of file
+        cell, visited = state
+        cornerBits = self.cornerBits
+        return [((neighbor, visited | cornerBits.get(neighbor, 0)), action, stepCost)
+                for neighbor, action, stepCost in self.graph.getCellSuccessors(cell)]
@@ -5,6 +5,7 @@ from typing import Tuple
 import util
 from game import Actions, Agent, Directions
 from logs.search_logger import log_function
+from mazeDistances import UNREACHABLE
 from pacman import GameState
 
 
@@ -12,7 +13,9 @@ class q1c_problem:
     """
     A search problem associated with finding a path that collects all of the
     food (dots) in a Pacman game.
-    Some useful data has been included here for you
+
+    A state is (cell, remaining): the mazeGraph cell id of Pacman and a bit
+    mask with bit i set while food[i] is still uneaten.
     """
     def __str__(self):
         return str(self.__class__.__module__)
@@ -23,10 +26,20 @@ class q1c_problem:
 
         gameState: A GameState object (pacman.py)
         costFn: A function from a search state (tuple) to a non-negative number
-        goals: A position in the gameState
+        integerCosts: Every step cost is an integer, so solvers may use a bucket queue
+        graph: The layout's walls compiled into a mazeGraph.MazeGraph
+        goals: The positions of all the food, for solvers that eat it one dot at a time
+        pos: Pacman's position, for solvers that eat the food one dot at a time
+        start: The cell id Pacman starts on
+        food: The positions of the food Pacman can reach, one mask bit each
+        foodBits: Cell id -> mask bit, for the food cells
+        prunedCells: How many cells getSuccessors never leads into, because
+          they lie in food-free regions (see blockCutTree.py) or are unreachable
         """
         self.startingGameState: GameState = gameState
         self.costFn = 0
+        self.integerCosts = True
+        self.graph = gameState.getMazeGraph()
         self.goals = []
         self.pos = gameState.getPacmanPosition()
         grid = self.startingGameState.getFood()
@@ -34,16 +47,24 @@ class q1c_problem:
             for y, column in enumerate(row):
                 if column:
                     self.goals.append((x, y))
+        self.start = self.graph.getCellId(self.pos)
+        # Food walled off from Pacman can never be eaten, so it is left out of the mask.
+        startDistances = gameState.getMazeDistances().getRow(self.start)
+        self.food = [food for food in self.goals if startDistances[self.graph.getCellId(food)] != UNREACHABLE]
+        self.foodBits = {self.graph.getCellId(food): 1 << i for i, food in enumerate(self.food)}
+        relevant = self.graph.getBlockCutTree().relevantCells(self.start, self.foodBits)
+        self.prunedCells = len(relevant) - sum(relevant)
+        self.cellSuccessors = [[successor for successor in self.graph.getCellSuccessors(cell) if relevant[successor[0]]]
+                               for cell in range(self.graph.numCells())]
 
     @log_function
     def getStartState(self):
-        return self.startingGameState
+        allFood = (1 << len(self.food)) - 1
+        return (self.start, allFood & ~self.foodBits.get(self.start, 0))
 
     @log_function
     def isGoalState(self, state):
-        if state in self.goals:
-            return True
-        return False
+        return state[1] == 0
 
     @log_function
     def getSuccessors(self, state):
@@ -57,19 +78,18 @@ class q1c_problem:
          required to get there, and 'stepCost' is the incremental
          cost of expanding to that successor
         """
-        "*** YOUR CODE HERE ***"
-        successors = []
+        cell, remaining = state
+        foodBits = self.foodBits
+        return [((neighbor, remaining & ~foodBits.get(neighbor, 0)), action, stepCost)
+                for neighbor, action, stepCost in self.cellSuccessors[cell]]
 
-        if not self.startingGameState.hasWall(state[0] - 1, state[1]):
-            successors.append(((state[0] - 1, state[1]), 'West', 1))
-        
-        if not self.startingGameState.hasWall(state[0] + 1, state[1]):
-            successors.append(((state[0] + 1, state[1]), 'East', 1))
-        
-        if not self.startingGameState.hasWall(state[0], state[1] + 1):
-            successors.append(((state[0], state[1] + 1), 'North', 1))
-        
-        if not self.startingGameState.hasWall(state[0], state[1] - 1):
-            successors.append(((state[0], state[1] - 1), 'South', 1))
-        
-        return successors
\ No newline at end of file
+    def isCanonicalMove(self, state, arrival, action):
+        """
+        Whether a path that reached state with the move arrival may go on with
+        action under the canonical ordering of MazeGraph.isCanonicalMove;
+        pass it as the canonical option of search.search_initialise.  Any
+        move is allowed off a food cell, since a path swapped onto another
+        cell would no longer eat that dot.
+        """
+        cell = state[0]
+        return cell in self.foodBits or self.graph.isCanonicalMove(cell, arrival, action)
@@ -0,0 +1,698 @@
+"""
+Best-first search engine shared by the solvers in solvers/.
+
+A search is driven one expansion at a time with search_initialise and
+search_loop_body, which follow the same contract as the solvers'
+astar_initialise / astar_loop_body: every call to the loop body pops one node
+and returns (terminate, actions).
+
+The frontier (heap, bucket, fifo or lifo), heuristic, heuristic weight,
+tie-breaking and goal test are all configurable, so one hot loop serves
+A*, weighted A*, uniform cost search, breadth-first and depth-first search.
+A canonical move ordering can also be given, which skips the many
+permutations of one set of moves that an open room offers between two cells.
+bidirectional_initialise / bidirectional_loop_body run the same kind of
+search from both ends of a point-to-point query at once, and
+ara_initialise / ara_loop_body run it as an anytime search (ARA*).
+Internally every state is given an integer node id on first sight and the
+per-node bookkeeping lives in plain lists indexed by that id.
+
+Problems whose states are already cell ids of a maze can instead be searched
+with cell_search_initialise / cell_search_loop_body in a SearchWorkspace:
+fixed-size lists indexed by cell id that are reset in O(1) between searches,
+so repeated queries on one layout allocate no per-node storage.
+"""
+
+import collections
+
+import util
+from game import Directions
+
+FRONTIERS = ('heap', 'bucket', 'fifo', 'lifo')
+TIE_BREAKS = ('fifo', 'lifo', 'highg')
+
+
+def nullHeuristic(state, problem=None):
+    """
+    A heuristic function estimates the cost from the current state to the nearest
+    goal in the provided SearchProblem.  This heuristic is trivial.
+    """
+    return 0
+
+
+class FifoFrontier:
+    "Breadth-first frontier: priorities are ignored and items pop in insertion order."
+    def __init__(self):
+        self.queue = collections.deque()
+
+    def push(self, item, priority=None):
+        self.queue.append(item)
+
+    update = push
+
+    def pop(self):
+        return self.queue.popleft()
+
+    def isEmpty(self):
+        return len(self.queue) == 0
+
+    def clear(self):
+        self.queue.clear()
+
+
+class LifoFrontier:
+    "Depth-first frontier: priorities are ignored and the newest item pops first."
+    def __init__(self):
+        self.stack = []
+
+    def push(self, item, priority=None):
+        self.stack.append(item)
+
+    update = push
+
+    def pop(self):
+        return self.stack.pop()
+
+    def isEmpty(self):
+        return len(self.stack) == 0
+
+    def clear(self):
+        self.stack.clear()
+
+
+def makeFrontier(frontier='heap', tieBreak='fifo'):
+    """
+    Builds an empty frontier.  tieBreak decides which of two equal-priority
+    nodes pops first: the one queued first ('fifo') or last ('lifo').  With
+    'highg' the searches queue (f, -g) pairs, so that on equal f the node
+    deepest into its path pops first, and queued first among equal g; that
+    needs a heap.
+    """
+    if tieBreak not in TIE_BREAKS: raise ValueError('Unknown tie-breaking rule: %s' % tieBreak)
+    if tieBreak == 'highg' and frontier != 'heap': raise ValueError('highg tie-breaking needs a heap frontier')
+    lifo = tieBreak == 'lifo'
+    if frontier == 'heap': return util.PriorityQueue(lifo)
+    if frontier == 'bucket': return util.BucketQueue(lifo)
+    if frontier == 'fifo': return FifoFrontier()
+    if frontier == 'lifo': return LifoFrontier()
+    raise ValueError('Unknown frontier: %s' % frontier)
+
+
+def defaultFrontier(problem, weight=1, tieBreak='fifo'):
+    "A bucket queue when the problem declares integer step costs and f stays integral, else a heap."
+    if tieBreak == 'highg':
+        return 'heap'
+    if getattr(problem, 'integerCosts', False) and float(weight).is_integer():
+        return 'bucket'
+    return 'heap'
+
+
+class SearchData:
+    """
+    The complete state of one best-first search.
+
+    states, cost, parent, action and closed are parallel lists indexed by
+    node id; ids maps a state back to its node id.
+
+    With a canonical move ordering, arrivals holds for each node the moves
+    it has been reached by at its current cost, and expanded how many of
+    them its expansions have covered so far.
+    """
+    def __init__(self, start, heuristic, weight, frontier, goalTest, startPriority=0, highG=False, canonical=None):
+        self.heuristic = heuristic
+        self.weight = weight
+        self.frontier = frontier
+        self.goalTest = goalTest
+        self.highG = highG
+        self.canonical = canonical
+        if canonical is not None:
+            self.arrivals = [[None]]
+            self.expanded = [0]
+        if highG:
+            startPriority = (startPriority, 0)
+        self.ids = {start: 0}
+        self.states = [start]
+        self.cost = [0]
+        self.parent = [-1]
+        self.action = [None]
+        self.closed = [False]
+        self.goalState = None
+        self.actions = []
+        self.expansions = 0
+        frontier.push(0, startPriority)
+
+
+def search_initialise(problem, start=None, heuristic=nullHeuristic, weight=1, frontier=None, tieBreak='fifo', goalTest=None,
+                      canonical=None):
+    """
+    Starts a search of problem from start (problem.getStartState() by default).
+
+    heuristic: function (state, problem) -> estimated cost to the goal
+    weight: f = g + weight * h; any weight above 1 trades optimality for speed
+    frontier: one of FRONTIERS, by default chosen with defaultFrontier
+    tieBreak: one of TIE_BREAKS
+    goalTest: function state -> bool, problem.isGoalState by default
+    canonical: function (state, arrival, action) -> bool, whether a path that
+      entered state with the move arrival (None at the start) may go on
+      with action, such as the problems' isCanonicalMove.  It must keep at
+      least one optimal path to every goal, and the heuristic must be
+      consistent.
+    """
+    if start is None: start = problem.getStartState()
+    if frontier is None: frontier = defaultFrontier(problem, weight, tieBreak)
+    if goalTest is None: goalTest = problem.isGoalState
+    return SearchData(start, heuristic, weight, makeFrontier(frontier, tieBreak), goalTest,
+                      highG=tieBreak == 'highg', canonical=canonical)
+
+
+def search_loop_body(problem, searchData: SearchData):
+    """
+    Expands one node.  Returns (True, actions) once a goal is popped, where
+    searchData.goalState tells which goal was reached, and (True, []) with
+    goalState None when the frontier runs dry.
+    """
+    if searchData.canonical is not None:
+        return search_canonical_loop_body(problem, searchData)
+    frontier = searchData.frontier
+    if frontier.isEmpty():
+        return (True, [])
+
+    node = frontier.pop()
+    closed = searchData.closed
+    if closed[node]:
+        return (False, searchData.actions)
+
+    states = searchData.states
+    state = states[node]
+    if searchData.goalTest(state):
+        searchData.goalState = state
+        searchData.actions = search_path(searchData, node)
+        return (True, searchData.actions)
+
+    closed[node] = True
+    searchData.expansions += 1
+    ids = searchData.ids
+    cost = searchData.cost
+    parent = searchData.parent
+    action = searchData.action
+    heuristic = searchData.heuristic
+    weight = searchData.weight
+    highG = searchData.highG
+    update = frontier.update
+    base = cost[node]
+
+    for successor, successorAction, stepCost in problem.getSuccessors(state):
+        newCost = base + stepCost
+        child = ids.get(successor)
+        if child is None:
+            child = len(states)
+            ids[successor] = child
+            states.append(successor)
+            cost.append(newCost)
+            parent.append(node)
+            action.append(successorAction)
+            closed.append(False)
+        elif closed[child] or newCost >= cost[child]:
+            continue
+        else:
+            cost[child] = newCost
+            parent[child] = node
+            action[child] = successorAction
+        priority = newCost + weight * heuristic(successor, problem)
+        update(child, (priority, -newCost) if highG else priority)
+
+    return (False, searchData.actions)
+
+
+def search_canonical_loop_body(problem, searchData: SearchData):
+    """
+    search_loop_body for a search with a canonical move ordering: a node
+    only generates the successors its arrivals allow.
+
+    Every move that reaches a node at its best cost so far is kept, as the
+    canonical path may be any of them.  A closed node reached at the same
+    cost by a new move is queued again, and then only generates what the
+    new move allows and the earlier ones did not.
+    """
+    frontier = searchData.frontier
+    if frontier.isEmpty():
+        return (True, [])
+
+    node = frontier.pop()
+    arrivals = searchData.arrivals
+    expanded = searchData.expanded
+    done = expanded[node]
+    nodeArrivals = arrivals[node]
+    if done == len(nodeArrivals):
+        return (False, searchData.actions)
+
+    states = searchData.states
+    state = states[node]
+    if done == 0 and searchData.goalTest(state):
+        searchData.goalState = state
+        searchData.actions = search_path(searchData, node)
+        return (True, searchData.actions)
+
+    searchData.closed[node] = True
+    expanded[node] = len(nodeArrivals)
+    searchData.expansions += 1
+    earlier = nodeArrivals[:done]
+    new = nodeArrivals[done:]
+    canonical = searchData.canonical
+    ids = searchData.ids
+    cost = searchData.cost
+    parent = searchData.parent
+    action = searchData.action
+    closed = searchData.closed
+    heuristic = searchData.heuristic
+    weight = searchData.weight
+    highG = searchData.highG
+    update = frontier.update
+    base = cost[node]
+
+    for successor, successorAction, stepCost in problem.getSuccessors(state):
+        if not any(canonical(state, arrival, successorAction) for arrival in new) or \
+           any(canonical(state, arrival, successorAction) for arrival in earlier):
+            continue
+        newCost = base + stepCost
+        child = ids.get(successor)
+        if child is None:
+            child = len(states)
+            ids[successor] = child
+            states.append(successor)
+            cost.append(newCost)
+            parent.append(node)
+            action.append(successorAction)
+            closed.append(False)
+            arrivals.append([successorAction])
+            expanded.append(0)
+        elif newCost == cost[child]:
+            if successorAction in arrivals[child]:
+                continue
+            arrivals[child].append(successorAction)
+            if not closed[child]:
+                continue
+        elif closed[child] or newCost > cost[child]:
+            continue
+        else:
+            cost[child] = newCost
+            parent[child] = node
+            action[child] = successorAction
+            arrivals[child] = [successorAction]
+        priority = newCost + weight * heuristic(successor, problem)
+        update(child, (priority, -newCost) if highG else priority)
+
+    return (False, searchData.actions)
+
+
+def search_path(searchData: SearchData, node):
+    "The list of actions leading from the start to node."
+    parent = searchData.parent
+    action = searchData.action
+    actions = []
+    while parent[node] != -1:
+        actions.append(action[node])
+        node = parent[node]
+    actions.reverse()
+    return actions
+
+
+def search(problem, start=None, **options):
+    """
+    Runs search_loop_body to completion and returns the finished SearchData.
+    Keyword options are those of search_initialise.
+    """
+    searchData = search_initialise(problem, start, **options)
+    terminate = False
+    while not terminate:
+        terminate, _ = search_loop_body(problem, searchData)
+    return searchData
+
+
+class SearchWorkspace:
+    """
+    Reusable storage for best-first searches over the cell ids of one maze.
+
+    cost, parent and action are indexed by cell id and are only valid for a
+    cell whose seen stamp equals the current generation; closed works the
+    same way.  Starting a new search bumps the generation instead of clearing
+    the arrays, and the frontiers are kept and emptied, so a workspace can
+    serve any number of searches, one at a time.  The tables are plain
+    lists rather than array.array buffers: reading an array element boxes a
+    new int, which made the hot loop slower than the list-per-search engine.
+
+    Get the shared workspace of a layout with MazeGraph.getSearchWorkspace().
+    """
+    def __init__(self, numCells):
+        self.numCells = numCells
+        self.generation = 0
+        self.seen = [0] * numCells
+        self.closed = [0] * numCells
+        self.cost = [0] * numCells
+        self.parent = [0] * numCells
+        self.action = [None] * numCells
+        self.frontiers = {}
+        self.frontier = None
+        self.heuristic = nullHeuristic
+        self.weight = 1
+        self.highG = False
+        self.goalTest = None
+        self.goalState = None
+        self.actions = []
+        self.expansions = 0
+
+    def reset(self):
+        "Forgets the last search in O(1): every stamp now belongs to an old generation."
+        self.generation += 1
+
+
+def cell_search_initialise(problem, workspace: SearchWorkspace, start=None, heuristic=nullHeuristic, weight=1,
+                           frontier=None, tieBreak='fifo', goalTest=None):
+    """
+    Starts a search of problem, whose states must be cell ids below
+    workspace.numCells, in workspace.  Any search already running in the
+    workspace is abandoned.  Returns the workspace, which plays the part of
+    the SearchData; the options are those of search_initialise.
+    """
+    if start is None: start = problem.getStartState()
+    if frontier is None: frontier = defaultFrontier(problem, weight, tieBreak)
+    if goalTest is None: goalTest = problem.isGoalState
+    key = (frontier, tieBreak)
+    queue = workspace.frontiers.get(key)
+    if queue is None:
+        queue = workspace.frontiers[key] = makeFrontier(frontier, tieBreak)
+    else:
+        queue.clear()
+    workspace.reset()
+    workspace.frontier = queue
+    workspace.heuristic = heuristic
+    workspace.weight = weight
+    workspace.highG = tieBreak == 'highg'
+    workspace.goalTest = goalTest
+    workspace.goalState = None
+    workspace.actions = []
+    workspace.expansions = 0
+    workspace.seen[start] = workspace.generation
+    workspace.cost[start] = 0
+    workspace.parent[start] = -1
+    workspace.action[start] = None
+    queue.push(start, (0, 0) if workspace.highG else 0)
+    return workspace
+
+
+def cell_search_loop_body(problem, workspace: SearchWorkspace):
+    """
+    Expands one cell, exactly as search_loop_body expands one node.  Returns
+    (True, actions) once a goal is popped and (True, []) with goalState None
+    when the frontier runs dry.
+    """
+    frontier = workspace.frontier
+    if frontier.isEmpty():
+        return (True, [])
+
+    cell = frontier.pop()
+    generation = workspace.generation
+    closed = workspace.closed
+    if closed[cell] == generation:
+        return (False, workspace.actions)
+
+    if workspace.goalTest(cell):
+        workspace.goalState = cell
+        workspace.actions = search_path(workspace, cell)
+        return (True, workspace.actions)
+
+    closed[cell] = generation
+    workspace.expansions += 1
+    seen = workspace.seen
+    cost = workspace.cost
+    parent = workspace.parent
+    action = workspace.action
+    heuristic = workspace.heuristic
+    weight = workspace.weight
+    highG = workspace.highG
+    update = frontier.update
+    base = cost[cell]
+
+    for successor, successorAction, stepCost in problem.getSuccessors(cell):
+        newCost = base + stepCost
+        if seen[successor] == generation:
+            if closed[successor] == generation or newCost >= cost[successor]:
+                continue
+        else:
+            seen[successor] = generation
+        cost[successor] = newCost
+        parent[successor] = cell
+        action[successor] = successorAction
+        priority = newCost + weight * heuristic(successor, problem)
+        update(successor, (priority, -newCost) if highG else priority)
+
+    return (False, workspace.actions)
+
+
+
+class AraData(SearchData):
+    """
+    The state of an ARA* search: a SearchData whose weight shrinks from one
+    pass to the next.  incons holds the nodes whose cost dropped after they
+    were closed in the current pass; the next pass reopens them.  goalNode
+    is the cheapest goal generated so far.
+    """
+    def __init__(self, start, heuristic, weights, goalTest, onSolution, problem):
+        SearchData.__init__(self, start, heuristic, weights[0], util.PriorityQueue(), goalTest,
+                            weights[0] * heuristic(start, problem))
+        self.weights = list(weights)
+        self.onSolution = onSolution
+        self.incons = set()
+        self.goalNode = 0 if goalTest(start) else None
+        self.solutionCost = float('inf')
+
+
+def ara_initialise(problem, start=None, heuristic=nullHeuristic, weights=(5, 3, 2, 1.5, 1.25, 1), onSolution=None, goalTest=None):
+    """
+    Starts an anytime repairing A* (ARA*) search of problem from start.
+
+    Each pass is a weighted A* with the next of weights, which should end
+    in 1, and stops once no open node can improve on the best path by more
+    than the weight allows.  A pass reuses the costs found by the earlier
+    ones and only expands again the nodes whose cost has dropped since.
+
+    onSolution: function (actions, weight) called whenever a pass ends with
+      a path cheaper than any before
+    """
+    if start is None: start = problem.getStartState()
+    if goalTest is None: goalTest = problem.isGoalState
+    return AraData(start, heuristic, weights, goalTest, onSolution, problem)
+
+
+def ara_loop_body(problem, araData: AraData):
+    """
+    Expands one node of the current pass, or starts the next pass.  Returns
+    (True, actions) with the best path after the pass with the last weight,
+    and (True, []) with goalState None if no goal can be reached.
+    """
+    frontier = araData.frontier
+    cost = araData.cost
+    goalNode = araData.goalNode
+    if frontier.isEmpty() or (goalNode is not None and cost[goalNode] <= frontier.peekPriority()):
+        return ara_next_pass(problem, araData)
+
+    node = frontier.pop()
+    closed = araData.closed
+    closed[node] = True
+    if node == goalNode:
+        return (False, araData.actions)
+    araData.expansions += 1
+    ids = araData.ids
+    states = araData.states
+    parent = araData.parent
+    action = araData.action
+    heuristic = araData.heuristic
+    weight = araData.weight
+    goalTest = araData.goalTest
+    incons = araData.incons
+    update = frontier.update
+    base = cost[node]
+
+    for successor, successorAction, stepCost in problem.getSuccessors(states[node]):
+        newCost = base + stepCost
+        child = ids.get(successor)
+        if child is None:
+            child = len(states)
+            ids[successor] = child
+            states.append(successor)
+            cost.append(newCost)
+            parent.append(node)
+            action.append(successorAction)
+            closed.append(False)
+        elif newCost >= cost[child]:
+            continue
+        else:
+            cost[child] = newCost
+            parent[child] = node
+            action[child] = successorAction
+        if goalTest(successor) and (araData.goalNode is None or newCost < cost[araData.goalNode]):
+            araData.goalNode = child
+        if closed[child]:
+            incons.add(child)
+        else:
+            update(child, newCost + weight * heuristic(successor, problem))
+
+    return (False, araData.actions)
+
+
+def ara_next_pass(problem, araData: AraData):
+    "Publishes the path of the pass that just ended and sets up the next one."
+    goalNode = araData.goalNode
+    if goalNode is not None and araData.cost[goalNode] < araData.solutionCost:
+        araData.solutionCost = araData.cost[goalNode]
+        araData.goalState = araData.states[goalNode]
+        araData.actions = search_path(araData, goalNode)
+        if araData.onSolution is not None:
+            araData.onSolution(araData.actions, araData.weight)
+    if goalNode is None or araData.weight == araData.weights[-1]:
+        return (True, araData.actions)
+
+    araData.weight = araData.weights[araData.weights.index(araData.weight) + 1]
+    # Reopen the open and inconsistent nodes under the new weight.
+    reopen = set(araData.frontier.entries)
+    reopen.update(araData.incons)
+    araData.incons = set()
+    araData.closed = [False] * len(araData.states)
+    araData.frontier = util.PriorityQueue()
+    states = araData.states
+    cost = araData.cost
+    heuristic = araData.heuristic
+    weight = araData.weight
+    for node in reopen:
+        araData.frontier.push(node, cost[node] + weight * heuristic(states[node], problem))
+    return (False, araData.actions)
+
+def reverseMoves(action):
+    "The action that undoes action: a reversed Directions move, or a reversed tuple of moves."
+    if isinstance(action, tuple):
+        return tuple(Directions.REVERSE[move] for move in reversed(action))
+    return Directions.REVERSE[action]
+
+
+class BidirectionalData:
+    """
+    The state of a bidirectional search between start and goal.
+
+    forward and backward are the SearchData of the two halves; their
+    heuristic field holds the potential that is added to twice the path
+    cost to form a node's key.  bestCost is the cheapest start-goal path
+    seen so far and meeting the state where its two halves join.
+    """
+    def __init__(self, start, goal, distanceEstimate, reverseAction):
+        # Average potentials p(v) = (h_goal(v) - h_start(v)) / 2, doubled to
+        # keep integer keys.  They make the two halves consistent with each
+        # other, so a node's forward and backward keys add up to twice the
+        # cost of the best path through it.
+        potential = lambda state: distanceEstimate(state, goal) - distanceEstimate(start, state)
+        startKey = distanceEstimate(start, goal)
+        self.forward = SearchData(start, potential, 1, util.PriorityQueue(), None, startKey)
+        self.backward = SearchData(goal, lambda state: -potential(state), 1, util.PriorityQueue(), None, startKey)
+        self.reverseAction = reverseAction
+        self.bestCost = 0 if start == goal else float('inf')
+        self.meeting = start if start == goal else None
+        self.goalState = None
+        self.actions = []
+        self.expansions = 0
+
+
+def bidirectional_initialise(problem, start, goal, distanceEstimate=None, reverseAction=reverseMoves):
+    """
+    Starts a bidirectional search for the cheapest path from start to goal.
+
+    Both halves walk problem.getSuccessors, so the moves of the problem must
+    be reversible at the same cost, as they are in a maze.
+
+    distanceEstimate: function (a, b) -> admissible, consistent estimate of
+      the cost between two states; zero by default, which makes this a
+      bidirectional uniform cost search
+    reverseAction: function action -> the action that undoes it
+    """
+    if distanceEstimate is None: distanceEstimate = lambda a, b: 0
+    return BidirectionalData(start, goal, distanceEstimate, reverseAction)
+
+
+def bidirectional_loop_body(problem, biData: BidirectionalData):
+    """
+    Expands one node on whichever side has the smaller frontier.  Returns
+    (True, actions) once no unexpanded node can lead to a path cheaper than
+    biData.bestCost, and (True, []) with goalState None if there is no path.
+    """
+    forward, backward = biData.forward, biData.backward
+    if forward.frontier.isEmpty() or backward.frontier.isEmpty() or \
+       forward.frontier.peekPriority() + backward.frontier.peekPriority() >= 2 * biData.bestCost:
+        return bidirectional_finish(biData)
+
+    if len(forward.frontier.heap) <= len(backward.frontier.heap):
+        half, other = forward, backward
+    else:
+        half, other = backward, forward
+
+    node = half.frontier.pop()
+    half.closed[node] = True
+    half.expansions += 1
+    biData.expansions += 1
+    ids = half.ids
+    states = half.states
+    cost = half.cost
+    parent = half.parent
+    action = half.action
+    closed = half.closed
+    potential = half.heuristic
+    update = half.frontier.update
+    otherIds = other.ids
+    otherCost = other.cost
+    base = cost[node]
+
+    for successor, successorAction, stepCost in problem.getSuccessors(states[node]):
+        newCost = base + stepCost
+        child = ids.get(successor)
+        if child is None:
+            child = len(states)
+            ids[successor] = child
+            states.append(successor)
+            cost.append(newCost)
+            parent.append(node)
+            action.append(successorAction)
+            closed.append(False)
+        elif closed[child] or newCost >= cost[child]:
+            continue
+        else:
+            cost[child] = newCost
+            parent[child] = node
+            action[child] = successorAction
+        update(child, 2 * newCost + potential(successor))
+        otherNode = otherIds.get(successor)
+        if otherNode is not None and newCost + otherCost[otherNode] < biData.bestCost:
+            biData.bestCost = newCost + otherCost[otherNode]
+            biData.meeting = successor
+
+    return (False, biData.actions)
+
+
+def bidirectional_finish(biData: BidirectionalData):
+    "Splices the forward path to the meeting state onto the reversed backward path."
+    if biData.meeting is None:
+        return (True, [])
+    forward, backward = biData.forward, biData.backward
+    backwardActions = search_path(backward, backward.ids[biData.meeting])
+    biData.goalState = backward.states[0]
+    biData.actions = search_path(forward, forward.ids[biData.meeting]) + \
+                     [biData.reverseAction(step) for step in reversed(backwardActions)]
+    return (True, biData.actions)
+
+
+def bidirectional_search(problem, start, goal, **options):
+    """
+    Runs bidirectional_loop_body to completion and returns the finished
+    BidirectionalData.  Keyword options are those of bidirectional_initialise.
+    """
+    biData = bidirectional_initialise(problem, start, goal, **options)
+    terminate = False
+    while not terminate:
+        terminate, _ = bidirectional_loop_body(problem, biData)
+    return biData
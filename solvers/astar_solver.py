@@ -0,0 +1,20 @@
+from problems.q1a_problem import q1a_problem
+from solvers.q1a_solver import astar_initialise, astar_loop_body
+
+def astar_solver(problem: q1a_problem, bidirectional='0'):
+    """
+    The q1a corridor A*, with the search strategy chosen per run.  With
+    bidirectional=1 it searches from both ends with a landmark (ALT)
+    potential, which skips the BFS over the whole maze that the exact goal
+    distances cost.  Without it, it runs exactly like q1a_solver.
+
+    Run with: python pacman.py -l q1a_bigMaze -p SearchAgent -a fn=astar_solver,prob=q1a_problem,bidirectional=1
+    """
+    astarData = astar_initialise(problem, bidirectional not in ('0', 'False', 'false'))
+    num_expansions = 0
+    terminate = False
+    while not terminate:
+        num_expansions += 1
+        terminate, result = astar_loop_body(problem, astarData)
+    print(f'Number of node expansions: {num_expansions}')
+    return result
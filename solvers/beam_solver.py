@@ -0,0 +1,36 @@
+import boundedSearch
+from solvers.hda_solver import hda_heuristic
+
+# Nodes kept per depth layer by default; override per run with -a width=N.
+BEAM_WIDTH = 32
+
+def beam_solver(problem, width=BEAM_WIDTH, widen='1'):
+    """
+    Beam search for any of the q1 problems, ranking nodes with the
+    heuristic hda_solver uses for the problem type.  It is meant for the
+    food problem with too much food for an optimal search: a good path in
+    seconds, in memory proportional to width times the path length.  With
+    widen=0 a beam that runs dry fails instead of starting over twice as
+    wide.
+
+    Run with: python pacman.py -l q1c_bigSearch -p SearchAgent -a fn=beam_solver,prob=q1c_problem,width=64
+    """
+    beamData = beam_initialise(problem, int(width), widen not in ('0', 'False', 'false'))
+    num_expansions = 0
+    terminate = False
+    while not terminate:
+        num_expansions += 1
+        terminate, result = beam_loop_body(problem, beamData)
+    print(f'Number of node expansions: {num_expansions}')
+    print(f'Peak nodes in memory: {beamData.peakNodes} at width {beamData.width}')
+    return result
+
+def beam_initialise(problem, width, widen):
+    start = problem.getStartState()
+    if type(problem).__name__ == 'q1a_problem':
+        # Its start state is the GameState; the search runs over positions.
+        start = start.getPacmanPosition()
+    return boundedSearch.beam_initialise(problem, start, hda_heuristic(problem), width=width, widen=widen)
+
+def beam_loop_body(problem, beamData: boundedSearch.BeamData):
+    return boundedSearch.beam_loop_body(problem, beamData)
@@ -0,0 +1,89 @@
+
+import os
+import time
+
+import parallelSearch
+from search import nullHeuristic
+from solvers.q1c_solver import DEADLINE_MARGIN, FOOD_SEARCH_SECONDS, MSTHeuristic, greedy_legs
+
+# Worker processes by default; override per run with -a workers=N.
+HDA_WORKERS = os.cpu_count() or 1
+# Workers order the food search by g + HDA_FOOD_WEIGHT * h, for a first path
+# within the budget; the other problems are solved optimally in well under
+# a second at weight 1.  Override per run with -a weight=W.
+HDA_FOOD_WEIGHT = 3
+
+def hda_solver(problem, workers=HDA_WORKERS, weight=None):
+    """
+    Hash-distributed parallel A* for any of the q1 problems, searching the
+    problem's own states with its usual admissible heuristic.
+
+    It stops at the same budget as q1c_solver, FOOD_SEARCH_SECONDS or
+    (1 - DEADLINE_MARGIN) of the time to the startup deadline, whichever
+    comes first, and then returns the best path found so far; without one,
+    the food problem falls back to q1c_solver's greedy legs.
+
+    Run with: python pacman.py -l q1c_trickySearch -p SearchAgent -a fn=hda_solver,prob=q1c_problem,workers=8
+    """
+    hdaData = hda_initialise(problem, int(workers), weight)
+    try:
+        terminate = False
+        while not terminate:
+            terminate, result = hda_loop_body(problem, hdaData)
+    finally:
+        parallelSearch.hda_close(hdaData)
+    num_expansions = hdaData.expansions
+    if hdaData.goalState is None and not hdaData.complete and type(problem).__name__ == 'q1c_problem':
+        print('[hda] out of time without a path, falling back to greedy legs')
+        result, leg_expansions = greedy_legs(problem)
+        num_expansions += leg_expansions
+    print(f'Number of node expansions: {num_expansions}')
+    print(f'Expansions per worker: {hdaData.workerExpansions}')
+    return result
+
+# At the deadline the path depends on how far the workers got; SearchAgent never caches it.
+hda_solver.timingDependent = True
+
+def hda_initialise(problem, workers, weight=None):
+    start = problem.getStartState()
+    problem_type = type(problem).__name__
+    if problem_type == 'q1a_problem':
+        # Its start state is the GameState; the search runs over positions.
+        start = start.getPacmanPosition()
+    if weight is None:
+        weight = HDA_FOOD_WEIGHT if problem_type == 'q1c_problem' else 1
+    # Whole weights keep f integral, for the bucket queue of the no-fork fallback.
+    weight = float(weight)
+    if weight.is_integer():
+        weight = int(weight)
+    # Corner and food states are (cell, mask): owned by mask, a path only
+    # changes workers where it eats.
+    partition = None if problem_type == 'q1a_problem' else (lambda state: state[1])
+    return parallelSearch.hda_initialise(problem, start, hda_heuristic(problem), workers,
+                                         weight=weight, deadline=hda_deadline(problem), partition=partition)
+
+def hda_loop_body(problem, hdaData: parallelSearch.HDAData):
+    return parallelSearch.hda_loop_body(problem, hdaData)
+
+def hda_deadline(problem):
+    "The time.time() at which the workers stop, by q1c_solver's rule."
+    now = time.time()
+    deadline = getattr(problem, 'deadline', None)
+    if deadline is None:
+        return now + FOOD_SEARCH_SECONDS
+    return min(now + FOOD_SEARCH_SECONDS, now + (1 - DEADLINE_MARGIN) * (deadline - now))
+
+def hda_heuristic(problem):
+    "The admissible heuristic the sequential solver of the problem type uses."
+    problem_type = type(problem).__name__
+    if problem_type == 'q1b_problem':
+        corner_cells = [problem.graph.getCellId(corner) for corner in problem.corners]
+        database = problem.startingGameState.getPatternDatabase(corner_cells)
+        return lambda state, problem: database.estimate(state[0], problem.allCorners & ~state[1])
+    if problem_type == 'q1c_problem':
+        distances = problem.startingGameState.getMazeDistances()
+        return MSTHeuristic(problem, distances.getRows([problem.graph.getCellId(food) for food in problem.food]))
+    if problem_type == 'q1a_problem':
+        goals = problem.getStartState().getFood().asList()
+        return lambda state, problem: min((abs(state[0] - goal[0]) + abs(state[1] - goal[1]) for goal in goals), default=0)
+    return nullHeuristic
@@ -0,0 +1,52 @@
+
+import search
+import util
+from clusterGraph import GOAL, ClusterProblem
+from problems.q1a_problem import q1a_problem
+
+# Side of the square clusters, in cells.
+CLUSTER_SIZE = 10
+
+def hpa_solver(problem: q1a_problem, size=CLUSTER_SIZE):
+    """
+    Hierarchical A* (HPA*) to the nearest food, for very large mazes.  The
+    cluster abstraction is built once per layout and reused by later queries.
+
+    Run with: python pacman.py -l q1a_bigMaze -p SearchAgent -a fn=hpa_solver,prob=q1a_problem,size=10
+    """
+    hpaData = hpa_initialise(problem, int(size))
+    num_expansions = 0
+    terminate = False
+    while not terminate:
+        num_expansions += 1
+        terminate, result = hpa_loop_body(problem, hpaData)
+    print(f'Number of node expansions: {num_expansions}')
+    print(f'Abstract graph: {hpaData.clusters.numEntrances()} entrances in clusters of {hpaData.clusters.clusterSize}')
+    return result
+
+def hpa_initialise(problem: q1a_problem, size):
+    graph = problem.graph
+    clusters = graph.getClusterGraph(size)
+    start = graph.getCellId(problem.getStartState().getPacmanPosition())
+    goals = problem.getStartState().getFood().asList()
+    goal_cells = [graph.getCellId(goal) for goal in goals]
+    abstract = ClusterProblem(clusters, start, goal_cells)
+    landmarks = problem.getStartState().getLandmarks()
+    heuristic = lambda state, abstract: hpa_heuristic(state, graph, goal_cells, landmarks)
+    hpaData = search.search_initialise(abstract, start, heuristic)
+    hpaData.clusters = clusters
+    hpaData.abstract = abstract
+    return hpaData
+
+def hpa_loop_body(problem: q1a_problem, hpaData: search.SearchData):
+    terminate, actions = search.search_loop_body(hpaData.abstract, hpaData)
+    if terminate:
+        return (True, hpaData.abstract.expandActions(actions))
+    return (False, actions)
+
+def hpa_heuristic(state, graph, goals, landmarks):
+    if state == GOAL:
+        return 0
+    position = graph.getPosition(state)
+    return min((max(util.manhattanDistance(position, graph.getPosition(goal)), landmarks.estimate(state, goal))
+                for goal in goals), default=0)
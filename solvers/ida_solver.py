@@ -0,0 +1,65 @@
+import util
+import boundedSearch
+from mazeDistances import UNREACHABLE
+from mazeGraph import CorridorProblem
+from problems.q1a_problem import q1a_problem
+from solvers.hda_solver import hda_heuristic
+
+# Default size of the transposition cache; override per run with -a cache=N.
+IDA_CACHE_SIZE = 100000
+
+def ida_solver(problem, cache=IDA_CACHE_SIZE):
+    """
+    IDA* for mazes too big for A*'s closed set.  Single-goal problems
+    search over corridors; the corner and food problems search their own
+    states with the admissible heuristic hda_solver also uses, the pattern
+    database for corners and the spanning tree for food.
+
+    Run with: python pacman.py -l q1a_bigMaze -p SearchAgent -a fn=ida_solver,prob=q1a_problem,cache=10000
+    """
+    idaData = ida_initialise(problem, int(cache))
+    num_expansions = 0
+    terminate = False
+    while not terminate:
+        num_expansions += 1
+        terminate, result = ida_loop_body(problem, idaData)
+    print(f'Number of node expansions: {num_expansions}')
+    print(f'Peak nodes in memory: {idaData.peakNodes}')
+    return result
+
+def ida_initialise(problem, cache_size):
+    if type(problem).__name__ != 'q1a_problem':
+        idaData = boundedSearch.ida_initialise(problem, heuristic=hda_heuristic(problem), cacheSize=cache_size)
+        idaData.corridors = None
+        return idaData
+    graph = problem.graph
+    start = graph.getCellId(problem.getStartState().getPacmanPosition())
+    # Without a reachable goal the search would never run out of paths to
+    # try; a BFS row costs two bytes per cell, far less than the search.
+    reachable = problem.getStartState().getMazeDistances().getRow(start)
+    goal_positions = [goal for goal in problem.getStartState().getFood().asList()
+                      if reachable[graph.getCellId(goal)] != UNREACHABLE]
+    # Deepen over corridors: one iteration step per junction, not per cell.
+    corridors = CorridorProblem(graph.getCorridorGraph(), start, [graph.getCellId(goal) for goal in goal_positions])
+    # Landmark bounds see the detours walls force; Manhattan distance the open floor.
+    landmarks = problem.getStartState().getLandmarks()
+    goal_cells = [graph.getCellId(goal) for goal in goal_positions]
+    heuristic = lambda state, corridors: ida_heuristic(state, graph, goal_cells, landmarks)
+    idaData = boundedSearch.ida_initialise(corridors, start, heuristic, cache_size)
+    idaData.corridors = corridors
+    return idaData
+
+def ida_loop_body(problem, idaData: boundedSearch.IDAData):
+    if idaData.corridors is None:
+        return boundedSearch.ida_loop_body(problem, idaData)
+    if not idaData.corridors.goals:
+        return (True, [])
+    terminate, actions = boundedSearch.ida_loop_body(idaData.corridors, idaData)
+    if terminate:
+        return (True, idaData.corridors.expandActions(actions))
+    return (False, actions)
+
+def ida_heuristic(current, graph, goals, landmarks):
+    position = graph.getPosition(current)
+    return min((max(util.manhattanDistance(position, graph.getPosition(goal)), landmarks.estimate(current, goal))
+                for goal in goals), default=0)
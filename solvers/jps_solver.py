@@ -0,0 +1,123 @@
+
+import util
+import search
+from game import Actions
+from problems.q1a_problem import q1a_problem
+
+def jps_solver(problem: q1a_problem):
+    """
+    Jump Point Search on the 4-connected grid for single-goal problems.
+
+    Run with: python pacman.py -l q1a_openMaze -p SearchAgent -a fn=jps_solver,prob=q1a_problem
+    """
+    jpsData = jps_initialise(problem)
+    num_expansions = 0
+    terminate = False
+    while not terminate:
+        num_expansions += 1
+        terminate, result = jps_loop_body(problem, jpsData)
+    print(f'Number of node expansions: {num_expansions}')
+    return result
+
+# Jump Point Search expands only jump points: cells where an optimal path may
+# have to turn.  Horizontal moves run on until a perpendicular neighbour is
+# forced open by a wall behind it; vertical moves also stop wherever a
+# horizontal jump from the cell would reach a jump point.  Between two jump
+# points the path is a straight line, so costs are Manhattan distances.
+
+class JPSData:
+    def __init__(self, problem, start, goals):
+        graph = problem.graph
+        width, height, cellIndex = graph.width, graph.height, graph.cellIndex
+        self.is_open = lambda x, y: 0 <= x < width and 0 <= y < height and cellIndex[x * height + y] != -1
+        self.goals = set(goals)
+        self.priority_queue = search.makeFrontier(search.defaultFrontier(problem))
+        self.distance = {start: 0}
+        self.predecessor = {start: None}
+        self.explored = set()
+        self.actions = []
+        self.priority_queue.push(start, 0)
+
+def jps_initialise(problem: q1a_problem):
+    start = problem.getStartState().getPacmanPosition()
+    goals = problem.getStartState().getFood().asList()
+    return JPSData(problem, start, goals)
+
+def jps_loop_body(problem: q1a_problem, jpsData: JPSData):
+    if jpsData.priority_queue.isEmpty():
+        return (True, [])
+
+    current_state = jpsData.priority_queue.pop()
+    if current_state in jpsData.goals:
+        return jps_goal(jpsData, current_state)
+
+    if current_state in jpsData.explored:
+        return (False, jpsData.actions)
+    jpsData.explored.add(current_state)
+
+    for direction in jps_directions(jpsData, current_state):
+        jump_point = jps_jump(jpsData, current_state[0] + direction[0], current_state[1] + direction[1], direction)
+        if jump_point is None or jump_point in jpsData.explored:
+            continue
+        new_cost = jpsData.distance[current_state] + util.manhattanDistance(current_state, jump_point)
+        if new_cost < jpsData.distance.get(jump_point, float('inf')):
+            jpsData.distance[jump_point] = new_cost
+            jpsData.predecessor[jump_point] = current_state
+            jpsData.priority_queue.update(jump_point, new_cost + jps_heuristic(jump_point, jpsData.goals))
+
+    return (False, jpsData.actions)
+
+def jps_directions(jpsData: JPSData, state):
+    """
+    The pruned set of directions to jump in from state, given the direction
+    it was reached in.  The start node tries all four.
+    """
+    x, y = state
+    parent = jpsData.predecessor[state]
+    if parent is None:
+        candidates = [(-1, 0), (1, 0), (0, 1), (0, -1)]
+    else:
+        dx, dy = _sign(x - parent[0]), _sign(y - parent[1])
+        if dx != 0:
+            candidates = [(dx, 0), (0, 1), (0, -1)]
+        else:
+            candidates = [(0, dy), (1, 0), (-1, 0)]
+    return [(dx, dy) for dx, dy in candidates if jpsData.is_open(x + dx, y + dy)]
+
+def jps_jump(jpsData: JPSData, x, y, direction):
+    "Walks from (x, y) in direction and returns the first jump point, or None at a wall."
+    is_open = jpsData.is_open
+    dx, dy = direction
+    while is_open(x, y):
+        if (x, y) in jpsData.goals:
+            return (x, y)
+        if dx != 0:
+            if (is_open(x, y - 1) and not is_open(x - dx, y - 1)) or (is_open(x, y + 1) and not is_open(x - dx, y + 1)):
+                return (x, y)
+        else:
+            if (is_open(x - 1, y) and not is_open(x - 1, y - dy)) or (is_open(x + 1, y) and not is_open(x + 1, y - dy)):
+                return (x, y)
+            if jps_jump(jpsData, x + 1, y, (1, 0)) is not None or jps_jump(jpsData, x - 1, y, (-1, 0)) is not None:
+                return (x, y)
+        x += dx
+        y += dy
+    return None
+
+def jps_heuristic(current, goals):
+    return min((util.manhattanDistance(current, goal) for goal in goals), default=0)
+
+def jps_goal(jpsData: JPSData, state_pos):
+    # Consecutive jump points lie on a straight line; unroll each segment.
+    actions = []
+    parent = jpsData.predecessor[state_pos]
+    while parent is not None:
+        vector = (_sign(state_pos[0] - parent[0]), _sign(state_pos[1] - parent[1]))
+        action = Actions.vectorToDirection(vector)
+        actions.extend([action] * util.manhattanDistance(state_pos, parent))
+        state_pos, parent = parent, jpsData.predecessor[parent]
+    actions.reverse()
+    jpsData.actions = actions
+    return (True, actions)
+
+def _sign(value):
+    return (value > 0) - (value < 0)
@@ -0,0 +1,177 @@
+
+import contextlib
+import io
+import json
+import logging
+import multiprocessing
+import os
+import queue
+import time
+
+import util
+from game import Actions
+from mazeDistances import UNREACHABLE
+
+# Solvers raced by default, per problem type; any other problem type runs
+# its own <problem>_solver alone.  Override per run with -a solvers=a,b,c.
+# The corner solvers are all optimal, so the first path is as good as any.
+# For food, beam search often finds a cheaper tour than the anytime A* of
+# q1c_solver, which in turn may improve on it given the time; hda_solver is
+# left out because a forked solver cannot fork its own workers.
+DEFAULT_PORTFOLIOS = {
+    'q1a_problem': ('q1a_solver', 'jps_solver', 'hpa_solver', 'ida_solver'),
+    'q1b_problem': ('q1b_solver', 'ida_solver', 'sma_solver'),
+    'q1c_problem': ('q1c_solver', 'beam_solver'),
+}
+# The default mode per problem type; 'first' for the others.  The food
+# solvers' paths are not optimal, so the race waits for the cheapest.
+DEFAULT_MODES = {
+    'q1c_problem': 'best',
+}
+# Wall-clock seconds the portfolio may use when SearchAgent gives no startup deadline.
+PORTFOLIO_SECONDS = 10.0
+# Seconds kept back from the startup deadline to collect the result and stop the rest.
+DEADLINE_MARGIN = 0.5
+STATS_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.cache', 'portfolio', 'stats.json')
+
+def portfolio_solver(problem, solvers=None, mode=None, stats='0'):
+    """
+    Races several solvers on the same problem, one process each.
+
+    mode 'first' returns the first valid path and stops the other solvers;
+    'best' waits for all of them, or the deadline, and returns the shortest.
+    By default it is DEFAULT_MODES' choice for the problem type.  With
+    stats=1 each win is tallied per layout family in STATS_FILE, for tuning
+    the default portfolios.
+
+    The solvers are forked, which needs a POSIX system; where multiprocessing
+    has no fork start method (Windows), only the first solver runs, in this
+    process.
+
+    Run with: python pacman.py -l q1a_bigMaze -p SearchAgent -a fn=portfolio_solver,prob=q1a_problem,solvers=q1a_solver+jps_solver,mode=best
+    """
+    if mode is None: mode = DEFAULT_MODES.get(type(problem).__name__, 'first')
+    if mode not in ('first', 'best'): raise ValueError('mode must be first or best')
+    record = stats not in ('0', 'False', 'false')
+    names = portfolio_names(problem, solvers)
+    functions = [util.import_by_name('./solvers', name) for name in names]
+    deadline = getattr(problem, 'deadline', None)
+    deadline = time.time() + PORTFOLIO_SECONDS if deadline is None else deadline - DEADLINE_MARGIN
+
+    # Forked children inherit the problem and the solvers, so nothing but the
+    # results has to be pickled.
+    try:
+        context = multiprocessing.get_context('fork')
+    except ValueError:
+        print(f'[portfolio] no fork on this platform, running {names[0]} alone')
+        return functions[0](problem)
+    results = context.Queue()
+    workers = [context.Process(target=portfolio_worker, args=(name, function, problem, results), daemon=True)
+               for name, function in zip(names, functions)]
+    for worker in workers:
+        worker.start()
+
+    finished = []
+    best = None
+    try:
+        while len(finished) < len(workers):
+            try:
+                result = results.get(timeout=max(0.0, deadline - time.time()))
+            except queue.Empty:
+                break
+            finished.append(result)
+            name, actions, output, seconds, error = result
+            if error is None and portfolio_valid(problem, actions) and (best is None or len(actions) < len(best[1])):
+                best = result
+                if mode == 'first':
+                    break
+    finally:
+        for worker in workers:
+            if worker.is_alive():
+                worker.terminate()
+        for worker in workers:
+            worker.join()
+
+    for name, actions, output, seconds, error in finished:
+        status = 'failed: ' + error if error else ('invalid path' if not portfolio_valid(problem, actions) else 'cost %d' % len(actions))
+        print(f'[portfolio] {name}: {status} in {seconds:.4f} seconds')
+    for name in names:
+        if name not in [result[0] for result in finished]:
+            print(f'[portfolio] {name}: stopped')
+    if best is None:
+        print('Number of node expansions: 0')
+        portfolio_record(problem, names, None, record)
+        return []
+    print(best[2], end='')
+    print(f'[portfolio] winner: {best[0]}')
+    portfolio_record(problem, names, best[0], record)
+    return best[1]
+
+# The winner depends on which solver finishes first; SearchAgent never caches it.
+portfolio_solver.timingDependent = True
+
+def portfolio_names(problem, solvers):
+    if solvers:
+        return solvers.replace('+', ',').split(',')
+    problem_type = type(problem).__name__
+    return list(DEFAULT_PORTFOLIOS.get(problem_type, (problem_type.replace('_problem', '_solver'),)))
+
+def portfolio_worker(name, function, problem, results):
+    output = io.StringIO()
+    start = time.time()
+    try:
+        with contextlib.redirect_stdout(output):
+            actions = list(function(problem))
+        results.put((name, actions, output.getvalue(), time.time() - start, None))
+    except Exception as exception:
+        results.put((name, None, output.getvalue(), time.time() - start, repr(exception)))
+
+def portfolio_valid(problem, actions):
+    "Whether actions is a legal walk that eats every dot Pacman can reach."
+    if actions is None:
+        return False
+    state = problem.startingGameState
+    graph = state.getMazeGraph()
+    position = state.getPacmanPosition()
+    row = state.getMazeDistances().getRow(graph.getCellId(position))
+    remaining = {food for food in state.getFood().asList() if row[graph.getCellId(food)] != UNREACHABLE}
+    remaining.discard(position)
+    for action in actions:
+        dx, dy = Actions.directionToVector(action)
+        position = (position[0] + int(dx), position[1] + int(dy))
+        if graph.getCellId(position) == -1:
+            return False
+        remaining.discard(position)
+    return not remaining
+
+def portfolio_family(problem):
+    "The problem type, open room or maze, and size, which portfolio statistics are kept by."
+    graph = problem.startingGameState.getMazeGraph()
+    open_cells = sum(1 for cell in range(graph.numCells()) if graph.getDegree(cell) == 4)
+    shape = 'open' if 2 * open_cells >= graph.numCells() else 'maze'
+    size = 'large' if graph.numCells() >= 1000 else 'small'
+    return f'{type(problem).__name__}/{shape}/{size}'
+
+def portfolio_record(problem, names, winner, record):
+    "Logs the winner, and with record also tallies it in STATS_FILE."
+    family = portfolio_family(problem)
+    logging.getLogger('root').info(f'portfolio {family}: {winner} won over {",".join(names)}')
+    if not record:
+        return
+    try:
+        with open(STATS_FILE) as file:
+            stats = json.load(file)
+    except (OSError, ValueError):
+        stats = {}
+    tally = stats.setdefault(family, {})
+    for name in names:
+        entry = tally.setdefault(name, {'runs': 0, 'wins': 0})
+        entry['runs'] += 1
+        entry['wins'] += name == winner
+    try:
+        os.makedirs(os.path.dirname(STATS_FILE), exist_ok=True)
+        with open(STATS_FILE + '.tmp', 'w') as file:
+            json.dump(stats, file, indent=1, sort_keys=True)
+        os.replace(STATS_FILE + '.tmp', STATS_FILE)
+    except OSError:
+        pass
@@ -21,67 +21,54 @@ def q1a_solver(problem: q1a_problem):
 # DO NOT MODIFY END #
 #-------------------#
 
-from collections import defaultdict
-
-class AStarData:
-    def __init__(self, x, y, goal_pos):
-        self.x = x
-        self.y = y
-        self.priority_queue = util.PriorityQueue()
-        self.goal_pos = goal_pos
-        self.actions = []
-        self.distance = defaultdict(lambda: float('inf'))  # Default to infinity for new states
-        self.predecessor = {}
-        self.explored = set()
-
-def astar_initialise(problem: q1a_problem):
-    start = problem.getStartState()
-    coords = start.getPacmanPosition()
-    astarData = AStarData(coords[0], coords[1], problem.goal)
-    astar_find_goal(problem, astarData)
-    astarData.distance[coords] = 0
-    astarData.priority_queue.push(coords, 0)
+import search
+import util
+from mazeGraph import CorridorProblem
+
+def astar_initialise(problem: q1a_problem, bidirectional=False):
+    # bidirectional: search from both ends with a landmark (ALT) potential
+    # instead of running A* with the exact maze distances to the goal, which
+    # costs a BFS over the whole maze; astar_solver selects it per run.
+    graph = problem.graph
+    start = graph.getCellId(problem.getStartState().getPacmanPosition())
+    goal = graph.getCellId(astar_find_goal(problem))
+    if bidirectional:
+        # Both ends must be spliced into their corridors.
+        corridors = CorridorProblem(graph.getCorridorGraph(), start, [start, goal])
+        landmarks = problem.getStartState().getLandmarks()
+        estimate = lambda a, b: max(util.manhattanDistance(graph.getPosition(a), graph.getPosition(b)),
+                                    landmarks.estimate(a, b))
+        astarData = search.bidirectional_initialise(corridors, start, goal, estimate)
+        astarData.corridors = corridors
+        astarData.bidirectional = True
+        return astarData
+    # Search junction to junction: every corridor is one weighted edge.
+    corridors = CorridorProblem(graph.getCorridorGraph(), start, [goal])
+    # One BFS from the goal gives the exact remaining distance from every cell.
+    goal_distances = problem.getStartState().getMazeDistances().getRow(goal)
+    heuristic = lambda state, problem: astar_heuristic(state, goal_distances)
+    astarData = search.cell_search_initialise(corridors, graph.getSearchWorkspace(), start, heuristic)
+    astarData.corridors = corridors
+    astarData.bidirectional = False
     return astarData
 
-def astar_loop_body(problem: q1a_problem, astarData: AStarData):
-    current_state = astarData.priority_queue.pop()
-
-    if problem.isGoalState(current_state):
-        return astar_goal(problem, astarData, current_state)
-
-    if current_state in astarData.explored:
-        return (False, astarData.actions)
-
-    astarData.explored.add(current_state)
-    successors = problem.getSuccessors(current_state)
-
-    for successor in successors:     
-        successor_position = successor[0]
-        new_cost = astarData.distance[current_state] + successor[2]
-
-        if new_cost < astarData.distance[successor_position]:
-            astarData.distance[successor_position] = new_cost
-            heuristic_distance = new_cost + astar_heuristic(successor_position, astarData.goal_pos)
-            astarData.priority_queue.update(successor[0], heuristic_distance)
-            astarData.predecessor[successor_position] = (successor[1], current_state)
-
-    return (False, astarData.actions)
-
-def astar_heuristic(current, goal):
-    return abs(current[0] - goal[0]) + abs(current[1] - goal[1])
+def astar_loop_body(problem: q1a_problem, astarData):
+    if astarData.bidirectional:
+        terminate, actions = search.bidirectional_loop_body(astarData.corridors, astarData)
+    else:
+        terminate, actions = search.cell_search_loop_body(astarData.corridors, astarData)
+    if terminate:
+        return (True, astarData.corridors.expandActions(actions))
+    return (False, actions)
 
-def astar_goal(problem: q1a_problem, astarData: AStarData, state_pos):
-    start = problem.getStartState().getPacmanPosition()
-    while state_pos != start:
-        action, state_pos = astarData.predecessor[state_pos]
-        astarData.actions.append(action)
-    astarData.actions.reverse()
-    return (True, astarData.actions)
+def astar_heuristic(current, goal_distances):
+    return goal_distances[current]
 
-def astar_find_goal(problem: q1a_problem, astarData: AStarData):
+def astar_find_goal(problem: q1a_problem):
+    goal_pos = problem.goal
     grid = problem.getStartState().getFood()
     for x, row in enumerate(grid):
         for y, column in enumerate(row):
             if column:
-                astarData.goal_pos = (x, y)
-    
\ No newline at end of file
+                goal_pos = (x, y)
+    return goal_pos
@@ -11,7 +11,48 @@ from problems.q1c_problem import q1c_problem
 # DO NOT MODIFY END #
 #-------------------#
 
+import time
+from collections import OrderedDict
+
+import search
+from mazeGraph import CorridorProblem
+
+# Wall-clock seconds the anytime food search may use at most; the evaluator
+# allows 10 per layout.
+FOOD_SEARCH_SECONDS = 5.0
+# Fraction of the time left before SearchAgent's startup deadline that is kept
+# back to hand the path over in time, so slower machines keep a margin too.
+DEADLINE_MARGIN = 0.25
+# Up to this much food, the heuristic also consults a pattern database over
+# groups of patternDatabase.GROUP_SIZE dots; beyond it the tables cost more
+# to build than they save.
+PATTERN_DATABASE_MAX_FOOD = 24
+# Spanning trees kept for deriving the trees of smaller food masks, about a
+# dozen MB at a hundred dots; the least recently used go first.  Fewer evict
+# trees the later ARA* passes still expand.
+MST_TREE_MEMO = 16384
+
 def q1c_solver(problem: q1c_problem):
+    # Anytime search over (cell, remaining food) states: a quick weighted-A*
+    # path, improved pass by pass until it is optimal or time runs out.
+    foodData = food_initialise(problem)
+    num_expansions = 0
+    terminate = False
+    while not terminate:
+        num_expansions += 1
+        terminate, result = food_loop_body(problem, foodData)
+    if foodData.goalState is None:
+        result, leg_expansions = greedy_legs(problem)
+        num_expansions += leg_expansions
+    print(f'Number of node expansions: {num_expansions}')
+    return result
+
+def greedy_legs(problem: q1c_problem):
+    """
+    Walks to the nearest remaining dot, one A* leg per dot: the fallback when
+    no path over all the food was found in time.  Returns the actions and
+    the node expansions of the legs.
+    """
     result = []
     num_expansions = 0
     while problem.goals:
@@ -22,71 +63,181 @@ def q1c_solver(problem: q1c_problem):
             terminate, partial_result = astar_loop_body(problem, astarData)
             if terminate == True:
                 result.extend(partial_result)  # Append the path for this goal
-    print(f'Number of node expansions: {num_expansions}')
-    return result
-
-from collections import defaultdict
-import math
-
-class AStarData:
-    def __init__(self, x, y):
-        self.x = x
-        self.y = y
-        self.priority_queue = util.PriorityQueue()
-        self.goals = []
-        self.actions = []
-        self.distance = defaultdict(lambda: float('inf'))  # Default to infinity for new states
-        self.predecessor = {}
-        self.explored = set()
+    return result, num_expansions
+
+# The path depends on how far the anytime search gets in time; SearchAgent never caches it.
+q1c_solver.timingDependent = True
+
+class MSTHeuristic:
+    """
+    The maze distance to the nearest uneaten food plus the weight of a
+    minimum spanning tree over all the uneaten food.  Any path that eats the
+    food walks to some first dot and then along a spanning tree of the rest,
+    so the estimate is admissible, and it is consistent.
+
+    For little food it is raised to the pattern database estimate where
+    that is higher: the exact cost of eating each group of dots on its own.
+
+    Weights are memoized per food mask, and the tree of a mask is derived
+    from that of a mask with one more dot where possible.  Only the
+    MST_TREE_MEMO most recently used trees are kept for that, so memory
+    stays bounded however many masks the search sees.  Nearest-food lists
+    are memoized per cell.
+    """
+    def __init__(self, problem: q1c_problem, food_distances):
+        food_cells = [problem.graph.getCellId(food) for food in problem.food]
+        self.database = None
+        if len(food_cells) <= PATTERN_DATABASE_MAX_FOOD:
+            self.database = problem.startingGameState.getPatternDatabase(food_cells)
+        self.food_distances = food_distances
+        self.edges = sorted((food_distances[i][food_cells[j]], i, j)
+                            for i in range(len(food_cells)) for j in range(i + 1, len(food_cells)))
+        self.nearest = [None] * problem.graph.numCells()
+        self.all_food = (1 << len(food_cells)) - 1
+        self.tree_weights = {}
+        self.trees = OrderedDict()
+
+    def __call__(self, state, problem=None):
+        cell, remaining = state
+        if not remaining:
+            return 0
+        nearest = self.nearest[cell]
+        if nearest is None:
+            nearest = self.nearest[cell] = sorted((distances[cell], 1 << i) for i, distances in enumerate(self.food_distances))
+        for distance, bit in nearest:
+            if remaining & bit:
+                estimate = distance + self.tree_weight(remaining)
+                break
+        if self.database is not None:
+            return max(estimate, self.database.estimate(cell, remaining))
+        return estimate
+
+    def tree_weight(self, remaining):
+        weight = self.tree_weights.get(remaining)
+        if weight is None:
+            tree = self.spanning_tree(remaining)
+            weight = self.tree_weights[remaining] = sum(distance for distance, _, _ in tree)
+        return weight
+
+    def spanning_tree(self, remaining):
+        tree = self.trees.get(remaining)
+        if tree is not None:
+            self.trees.move_to_end(remaining)
+            return tree
+        # Eating dot v only splits the tree of remaining | v into the pieces
+        # around v; every other tree edge stays in the new tree, so only the
+        # pieces have to be joined up again.  If those trees are gone from the
+        # memo, rebuild one whose weight was needed before, most likely the
+        # parent being expanded, so that its other children can use it too.
+        eaten = self.all_food & ~remaining
+        parent = None
+        while eaten:
+            bit = eaten & -eaten
+            eaten ^= bit
+            if remaining | bit in self.trees:
+                parent = remaining | bit
+                break
+            if parent is None and remaining | bit in self.tree_weights:
+                parent = remaining | bit
+        if parent is None:
+            tree = self.kruskal(remaining, [], bin(remaining).count('1') - 1)
+        else:
+            parent_tree = self.trees.get(parent)
+            if parent_tree is None:
+                parent_tree = self.kruskal(parent, [], bin(parent).count('1') - 1)
+                self.remember(parent, parent_tree)
+            else:
+                self.trees.move_to_end(parent)
+            v = (parent ^ remaining).bit_length() - 1
+            kept = [edge for edge in parent_tree if edge[1] != v and edge[2] != v]
+            tree = self.kruskal(remaining, kept, len(parent_tree) - len(kept) - 1)
+        self.remember(remaining, tree)
+        return tree
+
+    def remember(self, remaining, tree):
+        self.trees[remaining] = tree
+        if len(self.trees) > MST_TREE_MEMO:
+            self.trees.popitem(last=False)
+
+    def kruskal(self, remaining, tree, needed):
+        "Adds the needed cheapest edges over remaining that join the pieces of the forest tree."
+        # Label each piece once, so joining them only unions a few labels.
+        neighbors = {}
+        for _, i, j in tree:
+            neighbors.setdefault(i, []).append(j)
+            neighbors.setdefault(j, []).append(i)
+        piece = {}
+        for i in neighbors:
+            if i not in piece:
+                piece[i] = i
+                stack = [i]
+                while stack:
+                    for j in neighbors[stack.pop()]:
+                        if j not in piece:
+                            piece[j] = i
+                            stack.append(j)
+        tree = list(tree)
+        root = {}
+        for edge in self.edges:
+            if needed <= 0:
+                break
+            _, i, j = edge
+            if remaining >> i & 1 and remaining >> j & 1:
+                i = piece.get(i, i)
+                j = piece.get(j, j)
+                while i in root: i = root[i]
+                while j in root: j = root[j]
+                if i != j:
+                    root[i] = j
+                    tree.append(edge)
+                    needed -= 1
+        return tree
+
+def food_initialise(problem: q1c_problem):
+    distances = problem.startingGameState.getMazeDistances()
+    food_distances = distances.getRows([problem.graph.getCellId(food) for food in problem.food])
+    foodData = search.ara_initialise(problem, heuristic=MSTHeuristic(problem, food_distances),
+                                     onSolution=getattr(problem, 'onSolution', None))
+    now = time.time()
+    foodData.deadline = now + FOOD_SEARCH_SECONDS
+    deadline = getattr(problem, 'deadline', None)
+    if deadline is not None:
+        foodData.deadline = min(foodData.deadline, now + (1 - DEADLINE_MARGIN) * (deadline - now))
+    return foodData
+
+def food_loop_body(problem: q1c_problem, foodData: search.AraData):
+    if time.time() > foodData.deadline:
+        return (True, foodData.actions)
+    return search.ara_loop_body(problem, foodData)
 
 def astar_initialise(problem: q1c_problem):
-    start = problem.pos 
-    astarData = AStarData(start[0], start[1])
-    astarData.distance[start] = 0
-    astarData.priority_queue.push(start, 0)
+    graph = problem.graph
+    # Search junction to junction, with the remaining food spliced into its corridors.
+    corridors = CorridorProblem(graph.getCorridorGraph(), graph.getCellId(problem.pos),
+                                [graph.getCellId(goal) for goal in problem.goals])
+    goals = problem.goals
+    heuristic = lambda state, corridors: astar_heuristic(graph.getPosition(state), goals)
+    # Every leg reuses the layout's workspace instead of allocating its own tables.
+    astarData = search.cell_search_initialise(corridors, graph.getSearchWorkspace(), corridors.getStartState(), heuristic)
+    astarData.corridors = corridors
     return astarData
 
-def astar_loop_body(problem: q1c_problem, astarData: AStarData):
-    current_state = astarData.priority_queue.pop()
-
-    if problem.isGoalState(current_state):
-        return astar_goal(problem, astarData, current_state)
-
-    if current_state in astarData.explored:
-        return (False, astarData.actions)
-
-    astarData.explored.add(current_state)
-    successors = problem.getSuccessors(current_state)
-
-    for successor in successors:     
-        successor_position = successor[0]
-        new_cost = astarData.distance[current_state] + successor[2]
-
-        if new_cost < astarData.distance[successor_position]:
-            astarData.distance[successor_position] = new_cost
-            heuristic_distance = new_cost + astar_heuristic(successor_position, astarData.goals)
-            astarData.priority_queue.update(successor[0], heuristic_distance)
-            astarData.predecessor[successor_position] = (successor[1], current_state)
-
-    return (False, astarData.actions)
+def astar_loop_body(problem: q1c_problem, astarData: search.SearchWorkspace):
+    terminate, actions = search.cell_search_loop_body(astarData.corridors, astarData)
+    if terminate:
+        astar_goal(problem, astarData)
+        return (True, astarData.corridors.expandActions(actions))
+    return (False, actions)
 
 def astar_heuristic(current, goals):
-    min = math.inf
-    for goal in goals:
-        val = abs(current[0] - goal[0]) + abs(current[1] - goal[1])
-        if val < min:
-            min = val
-    return min
-
-def astar_goal(problem: q1c_problem, astarData: AStarData, state_pos):
-    initial = state_pos
-    start = problem.pos
-    while state_pos != start:
-        action, state_pos = astarData.predecessor[state_pos]
-        astarData.actions.append(action)
+    return min((abs(current[0] - goal[0]) + abs(current[1] - goal[1]) for goal in goals), default=0)
+
+def astar_goal(problem: q1c_problem, astarData: search.SearchWorkspace):
+    if astarData.goalState is None:
+        # The frontier ran dry: none of the remaining food can be reached.
+        problem.goals.clear()
+        return
     # Remove the collected goal from the list
-    problem.goals.remove(initial)
-    problem.pos = initial
-    astarData.actions.reverse()
-    
-    return (True, astarData.actions)
\ No newline at end of file
+    goal = problem.graph.getPosition(astarData.goalState)
+    problem.goals.remove(goal)
+    problem.pos = goal
@@ -0,0 +1,65 @@
+import util
+import boundedSearch
+from mazeDistances import UNREACHABLE
+from mazeGraph import CorridorProblem
+from problems.q1a_problem import q1a_problem
+from solvers.hda_solver import hda_heuristic
+
+# Default cap on the search nodes held in memory; override per run with -a nodes=N.
+SMA_MAX_NODES = 100000
+
+def sma_solver(problem, nodes=SMA_MAX_NODES):
+    """
+    SMA* for mazes too big for A*'s closed set.  Single-goal problems
+    search over corridors; the corner and food problems search their own
+    states with the admissible heuristic hda_solver also uses, the pattern
+    database for corners and the spanning tree for food.
+
+    Run with: python pacman.py -l q1a_bigMaze -p SearchAgent -a fn=sma_solver,prob=q1a_problem,nodes=10000
+    """
+    smaData = sma_initialise(problem, int(nodes))
+    num_expansions = 0
+    terminate = False
+    while not terminate:
+        num_expansions += 1
+        terminate, result = sma_loop_body(problem, smaData)
+    print(f'Number of node expansions: {num_expansions}')
+    print(f'Peak nodes in memory: {smaData.peakNodes}')
+    return result
+
+def sma_initialise(problem, max_nodes):
+    if type(problem).__name__ != 'q1a_problem':
+        smaData = boundedSearch.sma_initialise(problem, heuristic=hda_heuristic(problem), maxNodes=max_nodes)
+        smaData.corridors = None
+        return smaData
+    graph = problem.graph
+    start = graph.getCellId(problem.getStartState().getPacmanPosition())
+    # Without a reachable goal the search would never run out of paths to
+    # try; a BFS row costs two bytes per cell, far less than the search.
+    reachable = problem.getStartState().getMazeDistances().getRow(start)
+    goal_positions = [goal for goal in problem.getStartState().getFood().asList()
+                      if reachable[graph.getCellId(goal)] != UNREACHABLE]
+    # Search over corridors, so a node stands for a junction rather than a cell.
+    corridors = CorridorProblem(graph.getCorridorGraph(), start, [graph.getCellId(goal) for goal in goal_positions])
+    # Landmark bounds see the detours walls force; Manhattan distance the open floor.
+    landmarks = problem.getStartState().getLandmarks()
+    goal_cells = [graph.getCellId(goal) for goal in goal_positions]
+    heuristic = lambda state, corridors: sma_heuristic(state, graph, goal_cells, landmarks)
+    smaData = boundedSearch.sma_initialise(corridors, start, heuristic, max_nodes)
+    smaData.corridors = corridors
+    return smaData
+
+def sma_loop_body(problem, smaData: boundedSearch.SMAData):
+    if smaData.corridors is None:
+        return boundedSearch.sma_loop_body(problem, smaData)
+    if not smaData.corridors.goals:
+        return (True, [])
+    terminate, actions = boundedSearch.sma_loop_body(smaData.corridors, smaData)
+    if terminate:
+        return (True, smaData.corridors.expandActions(actions))
+    return (False, actions)
+
+def sma_heuristic(current, graph, goals, landmarks):
+    position = graph.getPosition(current)
+    return min((max(util.manhattanDistance(position, graph.getPosition(goal)), landmarks.estimate(current, goal))
+                for goal in goals), default=0)
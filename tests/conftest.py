@@ -0,0 +1,8 @@
+import os
+import sys
+
+# The modules of this repository import each other by their top-level names,
+# and import_by_name looks for solvers relative to the working directory.
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
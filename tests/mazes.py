@@ -0,0 +1,80 @@
+"""
+Layouts and reference answers shared by the tests.
+
+Every search in this repository moves one cell per step at cost 1, so a
+plain breadth-first search over the walls is the ground truth that the
+optimal engines have to match.
+"""
+
+from collections import deque
+
+import layout
+from game import Actions
+from pacman import GameState
+
+# Small layouts from layouts/ that every engine solves in well under a second.
+MAZE_LAYOUTS = ['q1a_tinyMaze', 'q1a_smallMaze', 'q1a_mediumMaze', 'q1a_openMaze']
+
+# A corridor from P to the food with two food-free pockets hanging off it:
+# a dead end below the start and, above the corridor, a room with a loop in
+# it behind a one-cell neck.
+POCKET_MAZE = [
+    '%%%%%%%%%%',
+    '%%%  %%%%%',
+    '%%%  %%%%%',
+    '%%%% %%%%%',
+    '%P      .%',
+    '% %%%%%%%%',
+    '% %%%%%%%%',
+    '%%%%%%%%%%',
+]
+
+
+def gameState(name):
+    "A GameState of the layout called name in layouts/, or of a list of layout lines."
+    if isinstance(name, str):
+        board = layout.getLayout(name)
+    else:
+        board = layout.Layout(name)
+    state = GameState()
+    state.initialize(board, 0)
+    return state
+
+
+def bfsDistance(state, start, goals):
+    "The number of steps from start to the nearest of goals, or None if none is reachable."
+    walls = state.getWalls()
+    goals = set(goals)
+    seen = {start}
+    frontier = deque([(start, 0)])
+    while frontier:
+        position, distance = frontier.popleft()
+        if position in goals:
+            return distance
+        x, y = position
+        for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1)):
+            neighbor = (x + dx, y + dy)
+            if not walls[neighbor[0]][neighbor[1]] and neighbor not in seen:
+                seen.add(neighbor)
+                frontier.append((neighbor, distance + 1))
+    return None
+
+
+def walk(state, start, actions):
+    "The positions visited by following actions from start; fails on a move into a wall."
+    walls = state.getWalls()
+    position = start
+    visited = [position]
+    for action in actions:
+        dx, dy = Actions.directionToVector(action)
+        position = (position[0] + int(dx), position[1] + int(dy))
+        assert not walls[position[0]][position[1]], 'walks into a wall at %s' % (position,)
+        visited.append(position)
+    return visited
+
+
+def foodGoal(state):
+    "The single food position of a q1a layout."
+    food = state.getFood().asList()
+    assert len(food) == 1
+    return food[0]
@@ -0,0 +1,49 @@
+import pytest
+
+from mazes import MAZE_LAYOUTS, POCKET_MAZE, bfsDistance, foodGoal, gameState, walk
+from problems.q1a_problem import q1a_problem
+from problems.q1c_problem import q1c_problem
+from solvers.astar_solver import astar_solver
+from solvers.q1a_solver import q1a_solver
+from solvers.q1c_solver import q1c_solver
+
+CORRIDOR = [(x, 3) for x in range(1, 9)]
+POCKETS = [(1, 2), (1, 1), (4, 4), (3, 5), (4, 5), (3, 6), (4, 6)]
+
+
+def relevantPositions(state, goals):
+    graph = state.getMazeGraph()
+    relevant = graph.getBlockCutTree().relevantCells(graph.getCellId(state.getPacmanPosition()),
+                                                     [graph.getCellId(goal) for goal in goals])
+    return {graph.getPosition(cell): flag for cell, flag in enumerate(relevant)}
+
+
+def test_pockets_are_pruned():
+    state = gameState(POCKET_MAZE)
+    relevant = relevantPositions(state, state.getFood().asList())
+    assert all(relevant[position] for position in CORRIDOR)
+    assert not any(relevant[position] for position in POCKETS)
+    assert q1a_problem(state).prunedCells == q1c_problem(state).prunedCells == len(POCKETS)
+
+
+def test_pocket_with_a_goal_is_kept():
+    state = gameState(POCKET_MAZE)
+    relevant = relevantPositions(state, [(8, 3), (3, 6)])
+    assert all(relevant[position] for position in CORRIDOR + [(4, 4), (3, 5), (4, 5), (3, 6), (4, 6)])
+    assert not relevant[(1, 2)] and not relevant[(1, 1)]
+
+
+@pytest.mark.parametrize('name', MAZE_LAYOUTS + [POCKET_MAZE])
+@pytest.mark.parametrize('solve', [q1a_solver, astar_solver])
+def test_pruned_maze_paths_are_shortest(name, solve):
+    state = gameState(name)
+    start = state.getPacmanPosition()
+    actions = solve(q1a_problem(state))
+    assert walk(state, start, actions)[-1] == foodGoal(state)
+    assert len(actions) == bfsDistance(state, start, [foodGoal(state)])
+
+
+def test_pruned_food_tour_is_optimal():
+    state = gameState(POCKET_MAZE)
+    actions = q1c_solver(q1c_problem(state))
+    assert len(actions) == bfsDistance(state, state.getPacmanPosition(), [foodGoal(state)])
@@ -0,0 +1,45 @@
+import pytest
+
+import search
+from mazes import MAZE_LAYOUTS, bfsDistance, foodGoal, gameState, walk
+from problems.q1a_problem import q1a_problem
+from problems.q1b_problem import q1b_problem
+from problems.q1c_problem import q1c_problem
+from solvers.ida_solver import ida_solver
+from solvers.sma_solver import sma_solver
+
+
+@pytest.mark.parametrize('name', MAZE_LAYOUTS)
+@pytest.mark.parametrize('solve', [ida_solver, sma_solver])
+def test_maze_paths_are_shortest(name, solve):
+    state = gameState(name)
+    start = state.getPacmanPosition()
+    actions = solve(q1a_problem(state))
+    assert walk(state, start, actions)[-1] == foodGoal(state)
+    assert len(actions) == bfsDistance(state, start, [foodGoal(state)])
+
+
+@pytest.mark.parametrize('solve, option', [(ida_solver, {'cache': '0'}), (sma_solver, {'nodes': '8'})])
+def test_small_memory_stays_optimal(solve, option):
+    # No transposition cache for IDA*; for SMA* a budget below the 12 nodes
+    # it peaks at with room to spare, so it forgets and regenerates subtrees.
+    state = gameState('q1a_mediumMaze')
+    start = state.getPacmanPosition()
+    actions = solve(q1a_problem(state), **option)
+    assert len(actions) == bfsDistance(state, start, [foodGoal(state)])
+
+
+@pytest.mark.parametrize('name, problemClass', [('q1b_tinyCorners', q1b_problem), ('q1b_smallCorners', q1b_problem),
+                                                ('q1c_tinySearch', q1c_problem), ('q1c_smallSearch', q1c_problem)])
+@pytest.mark.parametrize('solve', [ida_solver, sma_solver])
+def test_corner_and_food_tours_are_optimal(name, problemClass, solve):
+    state = gameState(name)
+    actions = solve(problemClass(state))
+    visited = set(walk(state, state.getPacmanPosition(), actions))
+    if problemClass is q1b_problem:
+        right, top = state.getWalls().width - 2, state.getWalls().height - 2
+        assert {(1, 1), (1, top), (right, 1), (right, top)} <= visited
+    else:
+        assert set(state.getFood().asList()) <= visited
+    # Uniform-cost search over the same problem is the reference.
+    assert len(actions) == len(search.search(problemClass(state)).actions)
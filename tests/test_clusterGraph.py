@@ -0,0 +1,35 @@
+import random
+
+import pytest
+
+import search
+from clusterGraph import ClusterProblem
+from mazes import MAZE_LAYOUTS, bfsDistance, foodGoal, gameState, walk
+from problems.q1a_problem import q1a_problem
+from solvers.hpa_solver import hpa_solver
+
+
+@pytest.mark.parametrize('name', MAZE_LAYOUTS)
+@pytest.mark.parametrize('size', ['3', '10'])
+def test_maze_paths_are_shortest(name, size):
+    state = gameState(name)
+    start = state.getPacmanPosition()
+    actions = hpa_solver(q1a_problem(state), size=size)
+    assert walk(state, start, actions)[-1] == foodGoal(state)
+    assert len(actions) == bfsDistance(state, start, [foodGoal(state)])
+
+
+@pytest.mark.parametrize('name', ['q1a_bigMaze', 'q1a_openMaze'])
+def test_random_queries_to_the_nearest_goal(name):
+    state = gameState(name)
+    graph = state.getMazeGraph()
+    clusters = graph.getClusterGraph(5)
+    cells = [graph.getPosition(cell) for cell in range(graph.numCells())]
+    rng = random.Random(0)
+    for _ in range(30):
+        start = rng.choice(cells)
+        goals = rng.sample(cells, rng.randint(1, 3))
+        abstract = ClusterProblem(clusters, graph.getCellId(start), [graph.getCellId(goal) for goal in goals])
+        actions = abstract.expandActions(search.search(abstract).actions)
+        assert walk(state, start, actions)[-1] in goals
+        assert len(actions) == bfsDistance(state, start, goals)
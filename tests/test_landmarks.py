@@ -0,0 +1,30 @@
+import random
+
+import pytest
+
+from mazes import MAZE_LAYOUTS, bfsDistance, foodGoal, gameState, walk
+from problems.q1a_problem import q1a_problem
+from solvers.astar_solver import astar_solver
+
+
+@pytest.mark.parametrize('name', ['q1a_mediumMaze', 'q1a_bigMaze', 'q1a_openMaze'])
+def test_estimates_are_admissible(name):
+    state = gameState(name)
+    graph = state.getMazeGraph()
+    landmarks = state.getLandmarks()
+    rng = random.Random(0)
+    for _ in range(40):
+        a, b = rng.randrange(graph.numCells()), rng.randrange(graph.numCells())
+        distance = bfsDistance(state, graph.getPosition(a), [graph.getPosition(b)])
+        assert landmarks.estimate(a, b) <= distance
+        assert landmarks.estimateToNearest(a, [b, a]) == 0
+
+
+@pytest.mark.parametrize('name', MAZE_LAYOUTS)
+@pytest.mark.parametrize('bidirectional', ['0', '1'])
+def test_maze_paths_are_shortest(name, bidirectional):
+    state = gameState(name)
+    start = state.getPacmanPosition()
+    actions = astar_solver(q1a_problem(state), bidirectional=bidirectional)
+    assert walk(state, start, actions)[-1] == foodGoal(state)
+    assert len(actions) == bfsDistance(state, start, [foodGoal(state)])
@@ -0,0 +1,49 @@
+import multiprocessing
+
+import pytest
+
+import parallelSearch
+import search
+from mazes import MAZE_LAYOUTS, bfsDistance, foodGoal, gameState, walk
+from problems.q1a_problem import q1a_problem
+from problems.q1b_problem import q1b_problem
+from problems.q1c_problem import q1c_problem
+from solvers.hda_solver import hda_solver
+
+
+@pytest.mark.parametrize('name', MAZE_LAYOUTS)
+@pytest.mark.parametrize('workers', ['1', '2'])
+def test_maze_paths_are_shortest(name, workers):
+    state = gameState(name)
+    start = state.getPacmanPosition()
+    actions = hda_solver(q1a_problem(state), workers=workers)
+    assert walk(state, start, actions)[-1] == foodGoal(state)
+    assert len(actions) == bfsDistance(state, start, [foodGoal(state)])
+
+
+@pytest.mark.parametrize('name, problemClass', [('q1b_tinyCorners', q1b_problem), ('q1b_smallCorners', q1b_problem),
+                                                ('q1c_tinySearch', q1c_problem), ('q1c_smallSearch', q1c_problem)])
+@pytest.mark.parametrize('workers', ['1', '2'])
+def test_corner_and_food_tours_are_optimal(name, problemClass, workers):
+    # The food search is weighted by default; with time to spare it goes on
+    # until the incumbent is proven optimal.
+    state = gameState(name)
+    actions = hda_solver(problemClass(state), workers=workers)
+    assert len(actions) == len(search.search(problemClass(state)).actions)
+
+
+def test_search_reports_every_worker():
+    state = gameState('q1a_mediumMaze')
+    hdaData = parallelSearch.hda_search(q1a_problem(state), state.getPacmanPosition(), workers=3)
+    assert hdaData.complete
+    assert len(hdaData.workerExpansions) == 3
+    assert hdaData.incumbent == len(hdaData.actions) == bfsDistance(state, state.getPacmanPosition(), [foodGoal(state)])
+
+
+def test_without_fork_searches_sequentially(monkeypatch):
+    def get_context(method=None):
+        raise ValueError('cannot find context for %r' % method)
+    monkeypatch.setattr(multiprocessing, 'get_context', get_context)
+    state = gameState('q1c_tinySearch')
+    actions = hda_solver(q1c_problem(state), workers='2')
+    assert len(actions) == len(search.search(q1c_problem(state)).actions)
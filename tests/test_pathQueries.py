@@ -0,0 +1,51 @@
+import random
+
+import pytest
+
+import layout
+from mazes import bfsDistance, gameState, walk
+from pathQueries import batchPaths
+
+# The room on the right is walled off from the rest of the maze.
+SEALED_MAZE = [
+    '%%%%%%%%%',
+    '%P  %%  %',
+    '% %.%%  %',
+    '%%%%%%%%%',
+]
+
+
+def randomPairs(state, count, seed=0):
+    walls = state.getWalls()
+    cells = [(x, y) for x in range(walls.width) for y in range(walls.height) if not walls[x][y]]
+    rng = random.Random(seed)
+    # A few shared starts, so that queries are grouped as well as answered alone.
+    starts = rng.sample(cells, 4)
+    return [(rng.choice(starts), rng.choice(cells)) for _ in range(count)]
+
+
+@pytest.mark.parametrize('name', ['q1a_mediumMaze', 'q1a_openMaze'])
+def test_paths_are_shortest(name):
+    state = gameState(name)
+    pairs = randomPairs(state, 40)
+    for (start, goal), (actions, cost) in zip(pairs, batchPaths(layout.getLayout(name), pairs)):
+        assert walk(state, start, actions)[-1] == goal
+        assert cost == len(actions) == bfsDistance(state, start, [goal])
+
+
+def test_unreachable_goal():
+    board = layout.Layout(SEALED_MAZE)
+    results = batchPaths(board, [((1, 2), (6, 2)), ((1, 2), (3, 1))])
+    assert results[0] == (None, float('inf'))
+    assert results[1][1] == 3
+
+
+def test_wall_position_is_rejected():
+    with pytest.raises(ValueError):
+        batchPaths(layout.Layout(SEALED_MAZE), [((1, 2), (0, 0))])
+
+
+def test_processes_give_the_same_answers():
+    board = layout.getLayout('q1a_mediumMaze')
+    pairs = randomPairs(gameState('q1a_mediumMaze'), 40, seed=1)
+    assert batchPaths(board, pairs, processes=2) == batchPaths(board, pairs)
@@ -0,0 +1,58 @@
+from functools import lru_cache
+
+import pytest
+
+import search
+from mazes import gameState
+from patternDatabase import PatternDatabase
+from problems.q1b_problem import q1b_problem
+
+
+def exactTours(distances, goals):
+    """
+    tour(cell, mask): the cheapest walk from cell through every goal whose
+    bit is set in mask, by Held-Karp over the goals' distance rows.
+    """
+    rows = [distances.getRow(goal) for goal in goals]
+
+    @lru_cache(maxsize=None)
+    def fromGoal(i, mask):
+        rest = mask & ~(1 << i)
+        return min((rows[i][goals[j]] + fromGoal(j, rest) for j in range(len(goals)) if rest & (1 << j)), default=0)
+
+    def tour(cell, mask):
+        return min((rows[i][cell] + fromGoal(i, mask) for i in range(len(goals)) if mask & (1 << i)), default=0)
+    return tour
+
+
+def goalCells(state):
+    graph = state.getMazeGraph()
+    return [graph.getCellId(food) for food in state.getFood().asList()]
+
+
+@pytest.mark.parametrize('name', ['q1b_tinyCorners', 'q1b_smallCorners'])
+def test_single_group_is_exact(name):
+    state = gameState(name)
+    goals = goalCells(state)
+    database = state.getPatternDatabase(goals)
+    tour = exactTours(state.getMazeDistances(), goals)
+    for cell in range(state.getMazeGraph().numCells()):
+        for mask in range(1 << len(goals)):
+            assert database.estimate(cell, mask) == tour(cell, mask)
+    # Uniform cost search over (cell, visited) is the ground truth for the whole tour.
+    problem = q1b_problem(state)
+    start = problem.graph.getCellId(state.getPacmanPosition())
+    assert database.estimate(start, problem.allCorners) == len(search.search(problem).actions)
+
+
+@pytest.mark.parametrize('groupSize', [1, 2, 3])
+def test_groups_are_admissible(groupSize):
+    state = gameState('q1c_tinySearch')
+    goals = goalCells(state)
+    distances = state.getMazeDistances()
+    database = PatternDatabase.build(distances, goals, groupSize)
+    assert len(database.groups) == -(-len(goals) // groupSize)
+    tour = exactTours(distances, goals)
+    for cell in range(state.getMazeGraph().numCells()):
+        for mask in range(0, 1 << len(goals), 5):
+            assert database.estimate(cell, mask) <= tour(cell, mask)
@@ -0,0 +1,47 @@
+from agents.q2Agent import FOOD_MOVE_ORDER, Q2_Agent
+from game import Actions
+from mazes import bfsDistance, gameState
+
+# Pacman two moves from the food either way round the corner.
+CORNER_MAZE = [
+    '%%%%%',
+    '%  .%',
+    '%P  %',
+    '%%%%%',
+]
+
+
+def bfsFirstMove(state):
+    "The move the breadth-first food search Q2_Agent used to run would make."
+    x, y = state.getPacmanPosition()
+    food = state.getFood().asList()
+    distance = bfsDistance(state, (x, y), food)
+    for action in FOOD_MOVE_ORDER:
+        dx, dy = Actions.directionToVector(action)
+        neighbor = (x + int(dx), y + int(dy))
+        if not state.hasWall(*neighbor) and bfsDistance(state, neighbor, food) == distance - 1:
+            return action
+
+
+def test_food_ties_go_the_way_bfs_went():
+    state = gameState(CORNER_MAZE)
+    assert Q2_Agent().collectFood(state) == bfsFirstMove(state)
+
+
+def test_replanning_follows_bfs():
+    # Walk Pacman alone through the maze, so the planner is repaired after
+    # every move and every dot eaten.
+    agent = Q2_Agent()
+    state = gameState('q2_mediumClassic')
+    for _ in range(60):
+        action = agent.collectFood(state)
+        assert action == bfsFirstMove(state)
+        state = state.generateSuccessor(0, action)
+
+
+def test_search_moves_when_every_move_revisits():
+    agent = Q2_Agent(depth='1')
+    state = gameState('q2_smallClassic')
+    legal = state.getLegalActions(0)
+    agent.last_positions = [(state.generateSuccessor(0, action).getPacmanPosition(), action) for action in legal]
+    assert agent.alpha_beta_search(state) in legal
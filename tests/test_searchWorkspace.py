@@ -0,0 +1,85 @@
+import random
+
+import pytest
+
+import search
+from mazeGraph import ACTIONS, CorridorProblem
+from mazes import bfsDistance, gameState, walk
+
+
+class CellProblem:
+    "Nearest-goal search over the cells of a MazeGraph, one step per move."
+    def __init__(self, graph, start, goals):
+        self.graph = graph
+        self.start = start
+        self.goals = set(goals)
+        self.integerCosts = True
+
+    def getStartState(self):
+        return self.start
+
+    def isGoalState(self, state):
+        return state in self.goals
+
+    def getSuccessors(self, state):
+        graph = self.graph
+        return [(graph.targets[edge], ACTIONS[graph.edgeActions[edge]], 1)
+                for edge in range(graph.offsets[state], graph.offsets[state + 1])]
+
+
+def solve(problem, workspace, **options):
+    workspace = search.cell_search_initialise(problem, workspace, **options)
+    terminate = False
+    while not terminate:
+        terminate, actions = search.cell_search_loop_body(problem, workspace)
+    return workspace, actions
+
+
+def queries(graph, count, seed=0):
+    rng = random.Random(seed)
+    return [(rng.randrange(graph.numCells()), rng.sample(range(graph.numCells()), rng.randint(1, 3)))
+            for _ in range(count)]
+
+
+@pytest.mark.parametrize('frontier, tieBreak', [('heap', 'fifo'), ('heap', 'lifo'), ('heap', 'highg'),
+                                                ('bucket', 'fifo'), ('bucket', 'lifo')])
+def test_reused_workspace_finds_shortest_paths(frontier, tieBreak):
+    state = gameState('q1a_bigMaze')
+    graph = state.getMazeGraph()
+    workspace = graph.getSearchWorkspace()
+    corridors = graph.getCorridorGraph()
+    for start, goals in queries(graph, 30):
+        problem = CorridorProblem(corridors, start, goals)
+        _, actions = solve(problem, workspace, frontier=frontier, tieBreak=tieBreak)
+        actions = problem.expandActions(actions)
+        positions = [graph.getPosition(goal) for goal in goals]
+        assert walk(state, graph.getPosition(start), actions)[-1] in positions
+        assert len(actions) == bfsDistance(state, graph.getPosition(start), positions)
+
+
+def test_frontiers_share_one_workspace():
+    # Interleave breadth-first, depth-first and best-first searches in the
+    # same workspace: none may see the stamps another one left behind.
+    state = gameState('q1a_openMaze')
+    graph = state.getMazeGraph()
+    workspace = graph.getSearchWorkspace()
+    for index, (start, goals) in enumerate(queries(graph, 30, seed=1)):
+        frontier = ('fifo', 'lifo', 'heap')[index % 3]
+        positions = [graph.getPosition(goal) for goal in goals]
+        workspace, actions = solve(CellProblem(graph, start, goals), workspace, frontier=frontier)
+        assert workspace.goalState in goals
+        assert walk(state, graph.getPosition(start), actions)[-1] == graph.getPosition(workspace.goalState)
+        if frontier != 'lifo':
+            assert len(actions) == bfsDistance(state, graph.getPosition(start), positions)
+    assert workspace is graph.getSearchWorkspace()
+
+
+def test_unreachable_goal_leaves_workspace_usable():
+    state = gameState('q1a_mediumMaze')
+    graph = state.getMazeGraph()
+    workspace = graph.getSearchWorkspace()
+    workspace, actions = solve(CellProblem(graph, 0, []), workspace)
+    assert workspace.goalState is None and actions == []
+    start, goals = queries(graph, 1, seed=2)[0]
+    _, actions = solve(CellProblem(graph, start, goals), workspace)
+    assert len(actions) == bfsDistance(state, graph.getPosition(start), [graph.getPosition(goal) for goal in goals])
@@ -26,8 +26,8 @@
 # Pieter Abbeel (pabbeel@cs.berkeley.edu).
 
 
+import collections
 import glob
-import heapq
 import importlib.util
 import inspect
 import random
@@ -177,38 +177,174 @@ class PriorityQueue:
       has a priority associated with it and the client is usually interested
       in quick retrieval of the lowest-priority item in the queue. This
       data structure allows O(1) access to the lowest-priority item.
+
+      The heap is indexed: every entry is a list [priority, count, item, slot]
+      that remembers its own position in self.heap, and self.entries maps each
+      queued item to its live entry.  This lets update() perform a real
+      decrease-key in O(log n) instead of scanning the whole heap.
+
+      Ties pop in insertion order, or newest first when lifo is set.
     """
-    def  __init__(self):
+    def  __init__(self, lifo=False):
         self.heap = []
+        self.entries = {}
         self.count = 0
+        self.step = -1 if lifo else 1
 
     def push(self, item, priority):
-        entry = (priority, self.count, item)
-        heapq.heappush(self.heap, entry)
-        self.count += 1
+        heap = self.heap
+        entry = [priority, self.count, item, len(heap)]
+        heap.append(entry)
+        self.entries[item] = entry
+        self.count += self.step
+        self._siftUp(entry[3])
 
     def pop(self):
-        (_, _, item) = heapq.heappop(self.heap)
+        heap = self.heap
+        entry = heap[0]
+        last = heap.pop()
+        if heap:
+            heap[0] = last
+            last[3] = 0
+            self._siftDown(0)
+        item = entry[2]
+        if self.entries.get(item) is entry:
+            del self.entries[item]
         return item
 
     def isEmpty(self):
         return len(self.heap) == 0
 
+    def peekPriority(self):
+        "The priority of the item pop() would return next."
+        return self.heap[0][0]
+
     def update(self, item, priority):
-        # If item already in priority queue with higher priority, update its priority and rebuild the heap.
+        # If item already in priority queue with higher priority, update its priority and sift it up.
         # If item already in priority queue with equal or lower priority, do nothing.
         # If item not in priority queue, do the same thing as self.push.
-        for index, (p, c, i) in enumerate(self.heap):
-            if i == item:
-                if p <= priority:
-                    break
-                del self.heap[index]
-                self.heap.append((priority, c, item))
-                heapq.heapify(self.heap)
+        entry = self.entries.get(item)
+        if entry is None:
+            self.push(item, priority)
+        elif priority < entry[0]:
+            entry[0] = priority
+            self._siftUp(entry[3])
+
+    def remove(self, item):
+        "Takes item out of the queue, wherever it is in the heap."
+        entry = self.entries.pop(item)
+        heap = self.heap
+        last = heap.pop()
+        if last is not entry:
+            slot = entry[3]
+            heap[slot] = last
+            last[3] = slot
+            self._siftUp(slot)
+            self._siftDown(last[3])
+
+    def __contains__(self, item):
+        return item in self.entries
+
+    def clear(self):
+        "Empties the queue, keeping its storage for the next search."
+        self.heap.clear()
+        self.entries.clear()
+
+    def _siftUp(self, slot):
+        # Entries compare on [priority, count]; counts are unique, so the
+        # comparison never reaches the item itself.
+        heap = self.heap
+        entry = heap[slot]
+        while slot > 0:
+            parentSlot = (slot - 1) >> 1
+            parent = heap[parentSlot]
+            if not entry < parent:
                 break
-        else:
+            heap[slot] = parent
+            parent[3] = slot
+            slot = parentSlot
+        heap[slot] = entry
+        entry[3] = slot
+
+    def _siftDown(self, slot):
+        heap = self.heap
+        size = len(heap)
+        entry = heap[slot]
+        child = 2 * slot + 1
+        while child < size:
+            right = child + 1
+            if right < size and heap[right] < heap[child]:
+                child = right
+            smallest = heap[child]
+            if not smallest < entry:
+                break
+            heap[slot] = smallest
+            smallest[3] = slot
+            slot = child
+            child = 2 * slot + 1
+        heap[slot] = entry
+        entry[3] = slot
+
+class BucketQueue:
+    """
+      A priority queue for small non-negative integer priorities (Dial's
+      algorithm).  Items live in one bucket per priority value and a cursor
+      remembers the lowest bucket that may be non-empty, so push is O(1) and
+      pop is amortized O(1) when priorities grow monotonically, as they do
+      for A* with unit step costs and a consistent integer heuristic.
+
+      Items are popped first-in-first-out within a bucket, or
+      last-in-first-out when lifo is set.  Each item is queued at most once:
+      update() leaves the stale copy in its old bucket and pop() skips it.
+    """
+    def  __init__(self, lifo=False):
+        self.buckets = []
+        self.priorities = {}
+        self.minimum = 0
+        self.lifo = lifo
+
+    def push(self, item, priority):
+        if priority < 0: raise ValueError('BucketQueue priorities must be non-negative integers')
+        buckets = self.buckets
+        while priority >= len(buckets):
+            buckets.append(collections.deque())
+        buckets[priority].append(item)
+        self.priorities[item] = priority
+        if priority < self.minimum:
+            self.minimum = priority
+
+    def pop(self):
+        priorities = self.priorities
+        if not priorities: raise IndexError('pop from an empty BucketQueue')
+        buckets = self.buckets
+        take = collections.deque.pop if self.lifo else collections.deque.popleft
+        index = self.minimum
+        while True:
+            bucket = buckets[index]
+            while bucket:
+                item = take(bucket)
+                if priorities.get(item) == index:
+                    del priorities[item]
+                    self.minimum = index
+                    return item
+            index += 1
+
+    def isEmpty(self):
+        return len(self.priorities) == 0
+
+    def update(self, item, priority):
+        # Same contract as PriorityQueue.update: only ever lowers a priority.
+        current = self.priorities.get(item)
+        if current is None or priority < current:
             self.push(item, priority)
 
+    def clear(self):
+        "Empties the queue, keeping its buckets for the next search."
+        for bucket in self.buckets:
+            bucket.clear()
+        self.priorities.clear()
+        self.minimum = 0
+
 class PriorityQueueWithFunction(PriorityQueue):
     """
     Implements a priority queue with the same push/pop signature of the
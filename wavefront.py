@@ -0,0 +1,129 @@
+"""
+Breadth-first distance fields over a wall grid, one whole frontier at a time.
+
+wavefront() grows the frontier of a breadth-first search with shifted-array
+operations on a boolean NumPy grid: each iteration moves every frontier cell
+one step in all four directions at once, masks out walls and visited cells,
+and stamps the iteration number into the distance grid.  Sources may be
+many; a target mask stops the sweep as soon as every target is reached.
+wavefronts() runs one such sweep per source side by side in a 3-D array,
+which is how MazeDistances fills its all-pairs table on open layouts.
+
+The work per iteration is proportional to the grid area, so this beats a
+Python queue when the grid is open (few iterations, wide frontiers) and
+loses in long winding corridors.  NumPy is optional: without it both
+functions fall back to a plain breadth-first search with the same results.
+
+Distances are int32 grids indexed [x][y]; walls and unreachable cells are
+UNREACHABLE.
+"""
+
+import collections
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+UNREACHABLE = -1
+# Sources swept together by wavefronts(); bounds its memory to a few grids per source.
+BATCH_SIZE = 256
+
+
+def openGrid(walls):
+    "The open cells of a game.Grid of walls as a boolean NumPy array indexed [x][y]."
+    return ~numpy.array(walls.data, dtype=bool)
+
+
+def wavefront(walls, sources, targets=None):
+    """
+    The breadth-first distance from the nearest of sources to every cell.
+
+    walls: a game.Grid, or a boolean NumPy array that is True on walls
+    sources: (x, y) positions
+    targets: optional (x, y) positions; the sweep stops once all are reached,
+      and cells further away may be left UNREACHABLE
+    """
+    if numpy is None:
+        return _breadthFirst(walls, sources, targets)
+    isOpen = ~walls if isinstance(walls, numpy.ndarray) else openGrid(walls)
+    distance = numpy.full(isOpen.shape, UNREACHABLE, dtype=numpy.int32)
+    frontier = numpy.zeros(isOpen.shape, dtype=bool)
+    for x, y in sources:
+        frontier[x, y] = isOpen[x, y]
+    targetMask = None
+    if targets is not None:
+        targetMask = numpy.zeros(isOpen.shape, dtype=bool)
+        for x, y in targets:
+            targetMask[x, y] = isOpen[x, y]
+    reached = frontier.copy()
+    step = 0
+    while frontier.any():
+        distance[frontier] = step
+        if targetMask is not None and not (targetMask & ~reached).any():
+            break
+        step += 1
+        frontier = _expand(frontier, isOpen, reached)
+    return distance
+
+
+def wavefronts(walls, sources):
+    """
+    One distance field per source, as an int32 array indexed
+    [source][x][y].  Sources are swept BATCH_SIZE at a time.
+    """
+    if numpy is None:
+        return [_breadthFirst(walls, [source]) for source in sources]
+    isOpen = ~walls if isinstance(walls, numpy.ndarray) else openGrid(walls)
+    distance = numpy.full((len(sources),) + isOpen.shape, UNREACHABLE, dtype=numpy.int32)
+    for first in range(0, len(sources), BATCH_SIZE):
+        batch = sources[first:first + BATCH_SIZE]
+        frontier = numpy.zeros((len(batch),) + isOpen.shape, dtype=bool)
+        frontier[numpy.arange(len(batch)), [x for x, _ in batch], [y for _, y in batch]] = True
+        frontier &= isOpen
+        reached = frontier.copy()
+        fields = distance[first:first + len(batch)]
+        step = 0
+        while frontier.any():
+            fields[frontier] = step
+            step += 1
+            frontier = _expand(frontier, isOpen, reached)
+    return distance
+
+
+def _expand(frontier, isOpen, reached):
+    "The unvisited open cells next to frontier, which are then marked reached."
+    grown = numpy.zeros_like(frontier)
+    grown[..., 1:, :] |= frontier[..., :-1, :]
+    grown[..., :-1, :] |= frontier[..., 1:, :]
+    grown[..., :, 1:] |= frontier[..., :, :-1]
+    grown[..., :, :-1] |= frontier[..., :, 1:]
+    grown &= isOpen
+    grown &= ~reached
+    reached |= grown
+    return grown
+
+
+def _breadthFirst(walls, sources, targets=None):
+    "The fallback without NumPy: the same distances as lists indexed [x][y]."
+    width, height = walls.width, walls.height
+    distance = [[UNREACHABLE] * height for _ in range(width)]
+    queue = collections.deque()
+    for x, y in sources:
+        if not walls[x][y] and distance[x][y] == UNREACHABLE:
+            distance[x][y] = 0
+            queue.append((x, y))
+    remaining = None if targets is None else {target for target in targets if not walls[target[0]][target[1]]}
+    while queue:
+        x, y = queue.popleft()
+        if remaining is not None:
+            remaining.discard((x, y))
+            if not remaining:
+                break
+        step = distance[x][y] + 1
+        for nextX, nextY in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+            if 0 <= nextX < width and 0 <= nextY < height and not walls[nextX][nextY] \
+               and distance[nextX][nextY] == UNREACHABLE:
+                distance[nextX][nextY] = step
+                queue.append((nextX, nextY))
+    return distance